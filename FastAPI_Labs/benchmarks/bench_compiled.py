@@ -0,0 +1,72 @@
+"""
+Compare SVC.predict against the compiled NumPy inference path.
+
+Run from FastAPI_Labs/:
+    python benchmarks/bench_compiled.py --repeats 20
+"""
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+import joblib
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from compiled import CompiledSVC  # noqa: E402
+from data import load_data, split_data  # noqa: E402
+
+MODEL_DIR = Path(__file__).resolve().parents[1] / "model"
+
+
+def time_predict(predict, X, repeats):
+    """
+    Return the best wall time (seconds) of `repeats` calls to predict(X).
+    """
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        predict(X)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--model", default=str(MODEL_DIR / "digits_model.pkl"))
+    parser.add_argument("--repeats", type=int, default=20)
+    parser.add_argument("--batch-sizes", default="1,32,256,full")
+    parser.add_argument("--out", help="Optional path for JSON results")
+    args = parser.parse_args()
+
+    model = joblib.load(args.model)
+    compiled = CompiledSVC.from_sklearn(model)
+
+    X, y = load_data()
+    _, X_test, _, _ = split_data(X, y)
+
+    mismatches = int((compiled.predict(X_test) != model.predict(X_test)).sum())
+    print(f"Label mismatches on test split: {mismatches} / {len(X_test)}")
+
+    results = {"mismatches": mismatches, "n_support_vectors": int(len(compiled.support_vectors)), "runs": []}
+    print(f"{'batch':>6} {'sklearn ms':>11} {'compiled ms':>12} {'speedup':>8}")
+    for size in args.batch_sizes.split(","):
+        n = len(X_test) if size == "full" else int(size)
+        X_batch = X_test[:n]
+        t_sk = time_predict(model.predict, X_batch, args.repeats)
+        t_np = time_predict(compiled.predict, X_batch, args.repeats)
+        print(f"{n:>6} {t_sk * 1e3:>11.3f} {t_np * 1e3:>12.3f} {t_sk / t_np:>7.1f}x")
+        results["runs"].append(
+            {"batch_size": n, "sklearn_ms": t_sk * 1e3, "compiled_ms": t_np * 1e3, "speedup": t_sk / t_np}
+        )
+
+    if args.out:
+        Path(args.out).write_text(json.dumps(results, indent=2))
+
+    if mismatches:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""
+Measure the hot-path cost of recording request metrics.
+
+Run from FastAPI_Labs/:
+    python benchmarks/bench_metrics.py --n 200000
+"""
+import argparse
+import asyncio
+import json
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from metrics import Registry, MetricsMiddleware, StageTimer  # noqa: E402
+
+
+def per_call_ns(fn, n):
+    start = time.perf_counter_ns()
+    for _ in range(n):
+        fn()
+    return (time.perf_counter_ns() - start) / n
+
+
+async def bare_app(scope, receive, send):
+    await send({"type": "http.response.start", "status": 200, "headers": []})
+    await send({"type": "http.response.body", "body": b"{}"})
+
+
+async def drive(app, n):
+    """
+    Call an ASGI app n times with a canned request and return ns per call.
+    """
+    class Route:
+        path = "/predict"
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        pass
+
+    start = time.perf_counter_ns()
+    for _ in range(n):
+        scope = {"type": "http", "method": "POST", "path": "/predict", "route": Route}
+        await app(scope, receive, send)
+    return (time.perf_counter_ns() - start) / n
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--n", type=int, default=200000)
+    parser.add_argument("--out", help="Optional path for JSON results")
+    args = parser.parse_args()
+
+    registry = Registry()
+    counter = registry.counter("bench_total", "bench", ("method", "route", "status"))
+    histogram = registry.histogram("bench_seconds", "bench", ("method", "route"))
+    gauge = registry.gauge("bench_in_flight", "bench")
+    stages = registry.histogram("bench_stage_seconds", "bench", ("stage",))
+
+    def timed_block():
+        with StageTimer(stages, "inference"):
+            pass
+
+    results = {
+        "counter_inc_ns": per_call_ns(lambda: counter.inc("POST", "/predict", 200), args.n),
+        "histogram_observe_ns": per_call_ns(lambda: histogram.observe(0.0012, "POST", "/predict"), args.n),
+        "stage_timer_ns": per_call_ns(timed_block, args.n),
+    }
+
+    wrapped = MetricsMiddleware(bare_app, counter, histogram, gauge)
+    bare_ns = asyncio.run(drive(bare_app, args.n))
+    wrapped_ns = asyncio.run(drive(wrapped, args.n))
+    results["asgi_bare_ns"] = bare_ns
+    results["asgi_with_metrics_ns"] = wrapped_ns
+    results["middleware_overhead_ns"] = wrapped_ns - bare_ns
+
+    start = time.perf_counter()
+    registry.render()
+    results["render_ms"] = (time.perf_counter() - start) * 1e3
+
+    for name, value in results.items():
+        print(f"{name:>24}: {value:10.1f}")
+
+    if args.out:
+        Path(args.out).write_text(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,316 @@
+"""
+Load-test the digits API and report throughput and latency percentiles.
+
+Runs either in-process over the ASGI transport (no network) or against a
+local uvicorn server started for the run. Run from FastAPI_Labs/:
+
+    python benchmarks/load_test.py --mode inprocess --concurrency 32 --requests 5000
+    python benchmarks/load_test.py --mode uvicorn --mix predict-json=8,batch-npy=2 --out run.json
+    python benchmarks/load_test.py --mode inprocess --out new.json --baseline run.json
+"""
+import argparse
+import asyncio
+import io
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+import httpx
+import numpy as np
+
+ROOT = Path(__file__).resolve().parents[1]
+SRC = ROOT / "src"
+sys.path.insert(0, str(SRC))
+
+from data import load_data  # noqa: E402
+
+SCENARIOS = ("predict-json", "predict-raw", "batch-json", "batch-npy", "batch-raw")
+
+
+def parse_mix(spec):
+    """
+    Parse "predict-json=8,batch-npy=2" into {scenario: weight}.
+    """
+    mix = {}
+    for part in spec.split(","):
+        name, _, weight = part.partition("=")
+        name = name.strip()
+        if name not in SCENARIOS:
+            raise SystemExit(f"unknown scenario {name!r}; choose from {', '.join(SCENARIOS)}")
+        mix[name] = float(weight or 1)
+    return mix
+
+
+def build_request(scenario, X, batch_size, rng):
+    """
+    Return (path, kwargs for httpx.post, rows in the request) for one scenario.
+    """
+    if scenario.startswith("predict"):
+        rows = X[rng.randrange(len(X))][None, :]
+        path = "/predict"
+    else:
+        start = rng.randrange(max(1, len(X) - batch_size))
+        rows = X[start:start + batch_size]
+        path = "/predict/batch"
+
+    fmt = scenario.split("-", 1)[1]
+    if fmt == "json":
+        body = {"features": rows[0].tolist()} if path == "/predict" else {"rows": rows.tolist()}
+        return path, {"json": body}, len(rows)
+    if fmt == "raw":
+        return path, {
+            "content": rows.astype("<f4").tobytes(),
+            "headers": {"content-type": "application/octet-stream", "x-feature-dtype": "float32"},
+        }, len(rows)
+    buf = io.BytesIO()
+    np.save(buf, rows)
+    return path, {
+        "content": buf.getvalue(),
+        "headers": {"content-type": "application/x-npy"},
+    }, len(rows)
+
+
+def percentiles(latencies):
+    if not latencies:
+        return {"p50_ms": None, "p95_ms": None, "p99_ms": None, "mean_ms": None}
+    arr = np.asarray(latencies) * 1000.0
+    p50, p95, p99 = np.percentile(arr, [50, 95, 99]).tolist()
+    return {"p50_ms": p50, "p95_ms": p95, "p99_ms": p99, "mean_ms": float(arr.mean())}
+
+
+async def run_load(client, args, X, mix):
+    """
+    Fire `args.requests` requests from `args.concurrency` workers.
+    Returns:
+        dict: Per-scenario latencies, row counts and status codes, plus wall time.
+    """
+    rng = random.Random(args.seed)
+    names, weights = zip(*mix.items())
+    plan = rng.choices(names, weights=weights, k=args.requests)
+    # Pre-build payloads so encoding cost isn't measured as server latency
+    payloads = [build_request(name, X, args.batch_size, rng) for name in plan]
+
+    records = {name: {"latencies": [], "rows": 0, "status": {}} for name in names}
+    next_idx = 0
+
+    async def worker():
+        nonlocal next_idx
+        while next_idx < len(plan):
+            i = next_idx
+            next_idx += 1
+            name = plan[i]
+            path, kwargs, n_rows = payloads[i]
+            start = time.perf_counter()
+            try:
+                response = await client.post(path, **kwargs)
+                code = str(response.status_code)
+            except httpx.HTTPError as e:
+                code = type(e).__name__
+            elapsed = time.perf_counter() - start
+            rec = records[name]
+            rec["status"][code] = rec["status"].get(code, 0) + 1
+            if code == "200":
+                rec["latencies"].append(elapsed)
+                rec["rows"] += n_rows
+
+    # Warm up the connection pool and the model before timing
+    for _ in range(min(args.warmup, len(payloads))):
+        path, kwargs, _ = payloads[0]
+        await client.post(path, **kwargs)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(args.concurrency)))
+    return records, time.perf_counter() - start
+
+
+def summarize(records, wall):
+    all_latencies = [lat for rec in records.values() for lat in rec["latencies"]]
+    n_requests = sum(sum(rec["status"].values()) for rec in records.values())
+    ok = len(all_latencies)
+    rows = sum(rec["rows"] for rec in records.values())
+    scenarios = {}
+    for name, rec in records.items():
+        done = len(rec["latencies"])
+        scenarios[name] = {
+            "requests": sum(rec["status"].values()),
+            "ok": done,
+            "status": rec["status"],
+            "rps": done / wall if wall else None,
+            "rows_per_sec": rec["rows"] / wall if wall else None,
+            **percentiles(rec["latencies"]),
+        }
+    return {
+        "requests": n_requests,
+        "ok": ok,
+        "errors": n_requests - ok,
+        "wall_seconds": wall,
+        "rps": ok / wall if wall else None,
+        "rows_per_sec": rows / wall if wall else None,
+        **percentiles(all_latencies),
+        "scenarios": scenarios,
+    }
+
+
+def proc_cpu_seconds(pid):
+    """
+    CPU time (user + system) used so far by a process, read from /proc on
+    Linux or via psutil when it is installed. Returns None if unavailable.
+    """
+    stat = Path(f"/proc/{pid}/stat")
+    if stat.exists():
+        fields = stat.read_text().rsplit(")", 1)[1].split()
+        return (int(fields[11]) + int(fields[12])) / os.sysconf("SC_CLK_TCK")
+    try:
+        import psutil
+    except ImportError:
+        return None
+    times = psutil.Process(pid).cpu_times()
+    return times.user + times.system
+
+
+async def run_inprocess(args, X, mix):
+    import main
+
+    async with main.app.router.lifespan_context(main.app):
+        transport = httpx.ASGITransport(app=main.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            cpu_start = time.process_time()
+            records, wall = await run_load(client, args, X, mix)
+            cpu = time.process_time() - cpu_start
+    summary = summarize(records, wall)
+    # Client and server share this process, so this includes client-side work
+    summary["cpu_seconds"] = cpu
+    return summary
+
+
+async def wait_for_server(url, timeout):
+    deadline = time.monotonic() + timeout
+    async with httpx.AsyncClient() as client:
+        while time.monotonic() < deadline:
+            try:
+                if (await client.get(url + "/")).status_code == 200:
+                    return
+            except httpx.HTTPError:
+                pass
+            await asyncio.sleep(0.1)
+    raise SystemExit(f"server at {url} did not become healthy within {timeout}s")
+
+
+async def run_uvicorn(args, X, mix):
+    url = f"http://127.0.0.1:{args.port}"
+    cmd = [
+        sys.executable, "-m", "uvicorn", "main:app",
+        "--host", "127.0.0.1", "--port", str(args.port),
+        "--log-level", "warning", "--workers", str(args.workers),
+    ]
+    server = subprocess.Popen(cmd, cwd=SRC)
+    try:
+        await wait_for_server(url, timeout=30)
+        limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+        async with httpx.AsyncClient(base_url=url, limits=limits, timeout=60) as client:
+            cpu_start = proc_cpu_seconds(server.pid)
+            records, wall = await run_load(client, args, X, mix)
+            cpu_end = proc_cpu_seconds(server.pid)
+    finally:
+        server.terminate()
+        server.wait(timeout=10)
+    summary = summarize(records, wall)
+    # Only the server process is measured; with --workers > 1 the worker
+    # children aren't included, so the value is left out
+    if cpu_start is not None and cpu_end is not None and args.workers == 1:
+        summary["cpu_seconds"] = cpu_end - cpu_start
+    else:
+        summary["cpu_seconds"] = None
+    return summary
+
+
+def git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"], cwd=ROOT, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def print_summary(summary):
+    print(f"requests={summary['requests']} ok={summary['ok']} errors={summary['errors']} "
+          f"wall={summary['wall_seconds']:.2f}s")
+    print(f"rps={summary['rps']:.1f} rows/s={summary['rows_per_sec']:.1f}")
+    if summary["p50_ms"] is not None:
+        print(f"latency ms: p50={summary['p50_ms']:.2f} p95={summary['p95_ms']:.2f} p99={summary['p99_ms']:.2f}")
+    if summary.get("cpu_ms_per_request") is not None:
+        print(f"cpu per request: {summary['cpu_ms_per_request']:.3f} ms")
+    print(f"\n{'scenario':<14} {'ok':>6} {'rps':>9} {'p50':>8} {'p95':>8} {'p99':>8}  status")
+    for name, sc in summary["scenarios"].items():
+        if sc["p50_ms"] is None:
+            print(f"{name:<14} {sc['ok']:>6} {'-':>9} {'-':>8} {'-':>8} {'-':>8}  {sc['status']}")
+            continue
+        print(f"{name:<14} {sc['ok']:>6} {sc['rps']:>9.1f} {sc['p50_ms']:>8.2f} "
+              f"{sc['p95_ms']:>8.2f} {sc['p99_ms']:>8.2f}  {sc['status']}")
+
+
+def print_comparison(current, baseline):
+    """
+    Print relative change of the headline numbers against a previous run.
+    """
+    print(f"\nChange vs baseline ({(baseline.get('commit') or '?')[:10]}):")
+    for key in ("rps", "rows_per_sec", "p50_ms", "p95_ms", "p99_ms", "cpu_ms_per_request"):
+        old = baseline["summary"].get(key)
+        new = current["summary"].get(key)
+        if old and new is not None:
+            print(f"  {key:<20} {old:>10.2f} -> {new:>10.2f}  ({(new - old) / old * 100:+.1f}%)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--mode", choices=("inprocess", "uvicorn"), default="inprocess")
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--mix", default="predict-json=1",
+                        help=f"weighted scenarios, e.g. predict-json=8,batch-npy=2 ({', '.join(SCENARIOS)})")
+    parser.add_argument("--batch-size", type=int, default=64)
+    parser.add_argument("--warmup", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--workers", type=int, default=1, help="uvicorn worker processes")
+    parser.add_argument("--out", help="Write JSON results to this path")
+    parser.add_argument("--baseline", help="Previous JSON results to compare against")
+    args = parser.parse_args()
+
+    mix = parse_mix(args.mix)
+    X, _ = load_data()
+
+    runner = run_inprocess if args.mode == "inprocess" else run_uvicorn
+    summary = asyncio.run(runner(args, X, mix))
+    cpu = summary.get("cpu_seconds")
+    summary["cpu_ms_per_request"] = cpu / summary["ok"] * 1000.0 if cpu is not None and summary["ok"] else None
+
+    result = {
+        "commit": git_commit(),
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "host": {"python": platform.python_version(), "machine": platform.machine(), "cpus": os.cpu_count()},
+        "config": {**vars(args), "mix": mix},
+        # Server settings that change throughput, as seen by this process
+        "env": {k: v for k, v in os.environ.items() if k.startswith(
+            ("MODEL_", "MICROBATCH_", "INFERENCE_", "PREDICTION_CACHE_", "MAX_BATCH", "METRICS_")
+        )},
+        "summary": summary,
+    }
+
+    print_summary(summary)
+    if args.baseline:
+        print_comparison(result, json.loads(Path(args.baseline).read_text()))
+    if args.out:
+        Path(args.out).write_text(json.dumps(result, indent=2))
+        print(f"\nResults written to: {args.out}")
+
+
+if __name__ == "__main__":
+    main()
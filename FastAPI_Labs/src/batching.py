@@ -0,0 +1,187 @@
+import asyncio
+import time
+from collections import deque
+
+import numpy as np
+
+
+class BatcherFull(Exception):
+    """
+    Raised when `max_queue` rows are already waiting to be batched.
+    """
+
+
+class MicroBatcher:
+    """
+    Collects concurrent single-row predictions into small batches.
+
+    Each `submit` call enqueues one feature vector and waits for its label. A
+    background task groups whatever arrives within `max_wait` seconds (or until
+    `max_batch_size` rows are queued), awaits one `predict_fn` call on the
+    stacked rows, and resolves every waiting request with its own row.
+    `predict_fn` is an async callable returning `(labels, model_version)`,
+    e.g. `InferenceExecutor.run`; up to
+    `max_in_flight` batches are predicted concurrently.
+    """
+
+    def __init__(
+        self,
+        predict_fn,
+        max_batch_size=64,
+        max_wait=0.002,
+        max_queue=1024,
+        max_in_flight=1,
+        stats_window=10000,
+    ):
+        self.predict_fn = predict_fn
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait
+        self.max_queue = max_queue
+        self.max_in_flight = max_in_flight
+        self._queue = None
+        self._task = None
+        self._slots = None
+        self._in_flight = set()
+
+        # Rolling window of per-request latencies (seconds) and batch size counts
+        self._latencies = deque(maxlen=stats_window)
+        self._batch_sizes = {}
+        self._n_batches = 0
+        self._n_requests = 0
+
+    async def start(self):
+        """
+        Start the background batching loop on the running event loop.
+        """
+        self._queue = asyncio.Queue(maxsize=self.max_queue)
+        self._slots = asyncio.Semaphore(self.max_in_flight)
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        """
+        Stop the batching loop and fail any requests still waiting in the queue.
+        """
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        for task in list(self._in_flight):
+            task.cancel()
+        while self._queue is not None and not self._queue.empty():
+            _, future, _ = self._queue.get_nowait()
+            if not future.done():
+                future.set_exception(RuntimeError("batcher stopped"))
+
+    async def submit(self, features):
+        """
+        Queue one feature vector and wait for its predicted label.
+        Args:
+            features (list[float] | numpy.ndarray): A single 64-length pixel vector.
+        Returns:
+            label (int): Predicted class label.
+            version (str): Version of the model that predicted it.
+        Raises:
+            BatcherFull: If the queue already holds `max_queue` rows.
+        """
+        future = asyncio.get_running_loop().create_future()
+        started = time.perf_counter()
+        try:
+            self._queue.put_nowait((np.asarray(features, dtype=float), future, started))
+        except asyncio.QueueFull:
+            raise BatcherFull(f"micro-batch queue is full ({self.max_queue} rows waiting)")
+        return await future
+
+    async def _collect(self):
+        """
+        Wait for the first queued row, then gather more until the batch is full
+        or `max_wait` has elapsed.
+        """
+        loop = asyncio.get_running_loop()
+        batch = [await self._queue.get()]
+        deadline = loop.time() + self.max_wait
+        while len(batch) < self.max_batch_size:
+            if not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+                continue
+            timeout = deadline - loop.time()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+    async def _run(self):
+        while True:
+            # Wait for a free slot first so rows keep accumulating meanwhile
+            await self._slots.acquire()
+            try:
+                batch = await self._collect()
+            except BaseException:
+                self._slots.release()
+                raise
+            task = asyncio.create_task(self._dispatch(batch))
+            self._in_flight.add(task)
+            task.add_done_callback(self._in_flight.discard)
+
+    async def _dispatch(self, batch):
+        try:
+            X = np.vstack([row for row, _, _ in batch])
+            try:
+                preds, version = await self.predict_fn(X)
+            except asyncio.CancelledError:
+                for _, future, _ in batch:
+                    if not future.done():
+                        future.set_exception(RuntimeError("batcher stopped"))
+                raise
+            except Exception as e:
+                for _, future, _ in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                return
+        finally:
+            self._slots.release()
+
+        finished = time.perf_counter()
+        for (_, future, started), pred in zip(batch, preds.tolist()):
+            if not future.done():
+                future.set_result((int(pred), version))
+            self._latencies.append(finished - started)
+        self._record_batch(len(batch))
+
+    def _record_batch(self, size):
+        # Histogram buckets are powers of two: 1, 2, 4, ..., max_batch_size
+        bucket = 1
+        while bucket < size:
+            bucket *= 2
+        self._batch_sizes[bucket] = self._batch_sizes.get(bucket, 0) + 1
+        self._n_batches += 1
+        self._n_requests += size
+
+    def stats(self):
+        """
+        Summarize recent latencies and the batch size distribution.
+        """
+        latencies_ms = np.asarray(self._latencies, dtype=float) * 1000.0
+        if latencies_ms.size:
+            p50, p95, p99 = np.percentile(latencies_ms, [50, 95, 99]).tolist()
+        else:
+            p50 = p95 = p99 = None
+        return {
+            "max_batch_size": self.max_batch_size,
+            "max_wait_ms": self.max_wait * 1000.0,
+            "max_queue": self.max_queue,
+            "queue_depth": self._queue.qsize() if self._queue is not None else 0,
+            "batches_in_flight": len(self._in_flight),
+            "requests": self._n_requests,
+            "batches": self._n_batches,
+            "mean_batch_size": self._n_requests / self._n_batches if self._n_batches else None,
+            "latency_ms": {"p50": p50, "p95": p95, "p99": p99, "window": int(latencies_ms.size)},
+            "batch_size_histogram": {
+                f"le_{bucket}": count for bucket, count in sorted(self._batch_sizes.items())
+            },
+        }
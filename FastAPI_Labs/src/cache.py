@@ -0,0 +1,110 @@
+import hashlib
+import time
+from collections import OrderedDict
+
+import numpy as np
+
+
+class PredictionCache:
+    """
+    Bounded LRU cache of predicted labels keyed by a hash of the feature row.
+
+    Rows are quantized (`round(x * scale)`) before hashing so that tiny float
+    noise maps to the same key. Entries expire after `ttl` seconds (0 keeps
+    them until evicted), and the whole cache is dropped when the model version
+    changes. The cache is only used from the event loop thread, so it does
+    no locking of its own.
+    """
+
+    def __init__(self, max_entries=10000, ttl=0.0, scale=1000):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.scale = scale
+        self._entries = OrderedDict()
+        self._version = None
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+
+    def keys_for(self, X):
+        """
+        Compute one cache key per row of a feature matrix.
+        Args:
+            X (numpy.ndarray): Feature matrix of shape (n_samples, 64).
+        Returns:
+            list[bytes]: 16-byte BLAKE2b digests of the quantized rows.
+        """
+        Q = np.ascontiguousarray(np.rint(np.asarray(X, dtype=float) * self.scale), dtype=np.int64)
+        return [hashlib.blake2b(row.tobytes(), digest_size=16).digest() for row in Q]
+
+    def _check_version(self, version):
+        if version != self._version:
+            if self._entries:
+                self.invalidations += 1
+            self._entries.clear()
+            self._version = version
+
+    def get_many(self, keys, version):
+        """
+        Look up many keys at once.
+        Args:
+            keys (list[bytes]): Keys from `keys_for`.
+            version (str): Version of the model that will answer the misses.
+        Returns:
+            results (list[int | None]): Cached label per key, None on a miss.
+            miss_idx (list[int]): Positions of the keys that missed.
+        """
+        self._check_version(version)
+        now = time.monotonic()
+        results, miss_idx = [], []
+        for i, key in enumerate(keys):
+            entry = self._entries.get(key)
+            if entry is not None and self.ttl and entry[1] <= now:
+                del self._entries[key]
+                self.expirations += 1
+                entry = None
+            if entry is None:
+                self.misses += 1
+                results.append(None)
+                miss_idx.append(i)
+            else:
+                self.hits += 1
+                self._entries.move_to_end(key)
+                results.append(entry[0])
+        return results, miss_idx
+
+    def put_many(self, keys, labels, version):
+        """
+        Store labels predicted by model `version`, evicting the least recently
+        used entries beyond `max_entries`.
+        """
+        if version != self._version:
+            # The model changed while these were being predicted; don't cache them
+            return
+        expires = time.monotonic() + self.ttl if self.ttl else 0.0
+        for key, label in zip(keys, labels):
+            self._entries[key] = (int(label), expires)
+            self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def stats(self):
+        """
+        Report cache size and hit/miss/eviction counters.
+        """
+        lookups = self.hits + self.misses
+        return {
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl,
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else None,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "invalidations": self.invalidations,
+        }
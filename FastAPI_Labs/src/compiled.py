@@ -0,0 +1,147 @@
+import os
+from pathlib import Path
+
+import numpy as np
+
+
+class CompiledSVC:
+    """
+    NumPy-only inference for a fitted RBF `sklearn.svm.SVC`.
+
+    Support vectors, dual coefficients and intercepts are stored as
+    contiguous float32 arrays. `predict` evaluates the RBF kernel against all
+    support vectors with one matrix product and reproduces libsvm's
+    one-vs-one voting, so it returns the same labels as `SVC.predict`.
+
+    The per-pair dual coefficients are laid out as one (n_SV, n_pairs)
+    matrix, so all one-vs-one decision values come from a single product
+    with the kernel matrix.
+    """
+
+    def __init__(self, support_vectors, dual_coef, intercept, n_support, classes, gamma):
+        self.support_vectors = np.ascontiguousarray(support_vectors, dtype=np.float32)
+        self.dual_coef = np.ascontiguousarray(dual_coef, dtype=np.float32)
+        self.intercept = np.ascontiguousarray(intercept, dtype=np.float32)
+        self.n_support = np.asarray(n_support, dtype=np.int64)
+        self.classes = np.asarray(classes)
+        self.gamma = float(gamma)
+
+        # Squared norms of the support vectors are reused by every predict call
+        self._sv_sq_norms = np.einsum("ij,ij->i", self.support_vectors, self.support_vectors)
+        starts = np.concatenate(([0], np.cumsum(self.n_support)))
+        n_classes = len(self.classes)
+        self._pairs = [(i, j) for i in range(n_classes) for j in range(i + 1, n_classes)]
+
+        # Column p holds pair (i, j)'s coefficients: class i's SVs use row j-1,
+        # class j's SVs use row i, and every other SV contributes zero
+        self._pair_coef = np.zeros((len(self.support_vectors), len(self._pairs)), dtype=np.float32)
+        # One-hot matrices mapping a pair's win/loss to the class that gets the vote
+        self._vote_i = np.zeros((len(self._pairs), n_classes), dtype=np.float32)
+        self._vote_j = np.zeros((len(self._pairs), n_classes), dtype=np.float32)
+        for p, (i, j) in enumerate(self._pairs):
+            self._pair_coef[starts[i]:starts[i + 1], p] = self.dual_coef[j - 1, starts[i]:starts[i + 1]]
+            self._pair_coef[starts[j]:starts[j + 1], p] = self.dual_coef[i, starts[j]:starts[j + 1]]
+            self._vote_i[p, i] = 1.0
+            self._vote_j[p, j] = 1.0
+
+    @classmethod
+    def from_sklearn(cls, model):
+        """
+        Build a compiled model from a fitted RBF `SVC`.
+        """
+        if model.kernel != "rbf":
+            raise ValueError(f"only RBF kernels can be compiled, got {model.kernel!r}")
+        if getattr(model, "break_ties", False):
+            raise ValueError("break_ties=True uses decision-function argmax, not one-vs-one votes")
+        return cls(
+            support_vectors=model.support_vectors_,
+            # sklearn flips the signs for binary problems; the private copies keep libsvm's
+            dual_coef=model._dual_coef_,
+            intercept=model._intercept_,
+            n_support=model._n_support,
+            classes=model.classes_,
+            gamma=model._gamma,
+        )
+
+    def kernel(self, X):
+        """
+        RBF kernel between the rows of X and every support vector.
+        """
+        X = np.asarray(X, dtype=np.float32)
+        x_sq = np.einsum("ij,ij->i", X, X)
+        sq_dist = x_sq[:, None] + self._sv_sq_norms[None, :] - 2.0 * (X @ self.support_vectors.T)
+        np.maximum(sq_dist, 0.0, out=sq_dist)
+        return np.exp(-self.gamma * sq_dist)
+
+    def decision_function(self, X):
+        """
+        One-vs-one decision values, one column per class pair (i, j), i < j.
+        """
+        return self.kernel(X) @ self._pair_coef + self.intercept
+
+    def predict(self, X):
+        """
+        Predict class labels with libsvm's one-vs-one vote.
+        Args:
+            X (numpy.ndarray): Feature matrix of shape (n_samples, n_features).
+        Returns:
+            y_pred (numpy.ndarray): Predicted class labels.
+        """
+        positive = self.decision_function(np.atleast_2d(X)) > 0
+        votes = positive @ self._vote_i + (~positive) @ self._vote_j
+        # argmax returns the first maximum, which matches libsvm's tie-breaking
+        return self.classes[np.argmax(votes, axis=1)]
+
+    def save(self, path):
+        """
+        Write the compiled arrays to an .npz file (atomically).
+        """
+        path = Path(path)
+        tmp = path.with_name(path.name + ".tmp")
+        with open(tmp, "wb") as f:
+            np.savez(
+                f,
+                support_vectors=self.support_vectors,
+                dual_coef=self.dual_coef,
+                intercept=self.intercept,
+                n_support=self.n_support,
+                classes=self.classes,
+                gamma=np.float64(self.gamma),
+            )
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path):
+        """
+        Load a model written by `save`.
+        """
+        with np.load(path, allow_pickle=False) as data:
+            return cls(
+                support_vectors=data["support_vectors"],
+                dual_coef=data["dual_coef"],
+                intercept=data["intercept"],
+                n_support=data["n_support"],
+                classes=data["classes"],
+                gamma=float(data["gamma"]),
+            )
+
+
+def export_compiled(model, path, X_check=None):
+    """
+    Compile a fitted SVC, optionally check it against `model.predict`, and save it.
+    Args:
+        model (sklearn.svm.SVC): Fitted RBF classifier.
+        path (str | Path): Destination .npz file.
+        X_check (numpy.ndarray): Rows on which both paths must agree, e.g. the test split.
+    Returns:
+        CompiledSVC: The compiled model that was written.
+    """
+    compiled = CompiledSVC.from_sklearn(model)
+    if X_check is not None:
+        mismatches = int((compiled.predict(X_check) != model.predict(X_check)).sum())
+        if mismatches:
+            raise ValueError(
+                f"compiled model disagrees with SVC.predict on {mismatches} of {len(X_check)} rows"
+            )
+    compiled.save(path)
+    return compiled
@@ -0,0 +1,34 @@
+import os
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+
+# Location of the serialized model that the API serves
+MODEL_PATH = Path(os.getenv("MODEL_PATH", ROOT / "model" / "digits_model.pkl"))
+
+# How often (seconds) the app checks the model file for changes; 0 disables the watcher
+MODEL_RELOAD_INTERVAL = float(os.getenv("MODEL_RELOAD_INTERVAL", "5"))
+
+# Largest number of rows accepted by /predict/batch in a single request
+MAX_BATCH_SIZE = int(os.getenv("MAX_BATCH_SIZE", "4096"))
+
+# Micro-batching of concurrent /predict calls
+MICROBATCH_ENABLED = os.getenv("MICROBATCH_ENABLED", "1") == "1"
+MICROBATCH_MAX_SIZE = int(os.getenv("MICROBATCH_MAX_SIZE", "64"))
+MICROBATCH_MAX_WAIT_MS = float(os.getenv("MICROBATCH_MAX_WAIT_MS", "2"))
+MICROBATCH_MAX_QUEUE = int(os.getenv("MICROBATCH_MAX_QUEUE", "1024"))
+
+# Executor that runs sklearn inference off the event loop: "thread" or "process"
+INFERENCE_EXECUTOR = os.getenv("INFERENCE_EXECUTOR", "thread")
+INFERENCE_WORKERS = int(os.getenv("INFERENCE_WORKERS", str(min(4, os.cpu_count() or 1))))
+# Pending inference jobs allowed before requests are rejected with 503
+INFERENCE_MAX_QUEUE = int(os.getenv("INFERENCE_MAX_QUEUE", "64"))
+
+# Prediction cache: max entries (0 disables), entry TTL in seconds (0 = no expiry),
+# and the scale features are multiplied by before rounding into the cache key
+PREDICTION_CACHE_SIZE = int(os.getenv("PREDICTION_CACHE_SIZE", "0"))
+PREDICTION_CACHE_TTL = float(os.getenv("PREDICTION_CACHE_TTL", "0"))
+PREDICTION_CACHE_SCALE = float(os.getenv("PREDICTION_CACHE_SCALE", "1000"))
+
+# Request metrics middleware, stage timers and the /metrics endpoint
+METRICS_ENABLED = os.getenv("METRICS_ENABLED", "1") == "1"
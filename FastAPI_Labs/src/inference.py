@@ -0,0 +1,206 @@
+import asyncio
+import logging
+import multiprocessing
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+import numpy as np
+
+from predict import ModelHolder, model_holder
+
+logger = logging.getLogger("uvicorn.error")
+
+
+class ExecutorSaturated(Exception):
+    """
+    Raised when the inference executor already has `max_queue` jobs pending.
+    """
+
+
+# Per-process state for the process pool; each worker owns its own model
+_worker_holder = None
+_worker_reload_interval = 0.0
+_worker_last_check = 0.0
+
+
+def _init_worker(model_path, reload_interval):
+    global _worker_holder, _worker_reload_interval, _worker_last_check
+    _worker_holder = ModelHolder(model_path)
+    _worker_holder.load()
+    _worker_reload_interval = reload_interval
+    _worker_last_check = time.monotonic()
+
+
+def _thread_predict(X):
+    """
+    Predict with the app's current model, returning the labels and the
+    version of the snapshot that produced them.
+    """
+    snapshot = model_holder.current
+    return snapshot.model.predict(np.asarray(X, dtype=float)), snapshot.version
+
+
+def _process_predict(X):
+    """
+    Predict inside a pool process, picking up a new model file at most once
+    per reload interval so workers follow the same hot swaps as the app.
+    Returns the labels and the version of the worker's model, which can lag
+    behind the app's after a swap or when the worker fails to reload.
+    """
+    global _worker_last_check
+    if _worker_reload_interval > 0:
+        now = time.monotonic()
+        if now - _worker_last_check >= _worker_reload_interval:
+            _worker_last_check = now
+            try:
+                _worker_holder.reload_if_changed()
+            except Exception:
+                # Keep serving the loaded model; its version in the result
+                # shows the app that this worker is behind
+                logger.exception(
+                    "Worker model reload failed; keeping version %s",
+                    _worker_holder.current.version[:12],
+                )
+    snapshot = _worker_holder.current
+    return snapshot.model.predict(np.asarray(X, dtype=float)), snapshot.version
+
+
+class InferenceExecutor:
+    """
+    Runs blocking sklearn inference off the event loop.
+
+    `kind="thread"` shares the app's model across a thread pool;
+    `kind="process"` starts worker processes that each load their own copy of
+    the model. At most `max_queue` jobs may be pending (running or waiting)
+    at once; further calls fail fast with `ExecutorSaturated`.
+
+    If a process worker dies (OOM kill, signal) the pool is broken for
+    good, so it is replaced by a fresh one: the jobs that were on the
+    broken pool fail, later jobs run normally.
+    """
+
+    def __init__(self, kind="thread", workers=4, max_queue=64, model_path=None, reload_interval=0.0):
+        if kind not in ("thread", "process"):
+            raise ValueError(f"unknown executor kind: {kind!r}")
+        self.kind = kind
+        self.workers = workers
+        self.max_queue = max_queue
+        self.model_path = model_path
+        self.reload_interval = reload_interval
+        self._executor = None
+        self._fn = None
+        # Only touched from the event loop thread, so no lock is needed
+        self._pending = 0
+        self._rejected = 0
+        self._completed = 0
+        self._failed = 0
+        self._restarts = 0
+        # Results from a model other than the app's current one
+        self._stale = 0
+
+    def start(self):
+        """
+        Create the underlying pool.
+        """
+        if self.kind == "thread":
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.workers, thread_name_prefix="inference"
+            )
+            self._fn = _thread_predict
+        else:
+            self._executor = self._new_process_pool()
+            self._fn = _process_predict
+
+    def _new_process_pool(self):
+        return ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+            initargs=(str(self.model_path), self.reload_interval),
+        )
+
+    def pool_healthy(self):
+        """
+        Whether the pool exists and none of its workers has died.
+        """
+        # ProcessPoolExecutor has no public flag; `_broken` is set as soon
+        # as a worker exits unexpectedly, even between jobs
+        return self._executor is not None and not getattr(self._executor, "_broken", False)
+
+    def _pool(self, broken=None):
+        """
+        The current pool, replaced first if it is broken (or is `broken`,
+        a pool a job just failed on).
+        """
+        executor = self._executor
+        if executor is None or (executor is not broken and self.pool_healthy()):
+            return executor
+        executor.shutdown(wait=False, cancel_futures=True)
+        self._executor = self._new_process_pool()
+        self._restarts += 1
+        logger.warning("Inference worker pool replaced (restart %d)", self._restarts)
+        return self._executor
+
+    def shutdown(self):
+        """
+        Shut the pool down, cancelling jobs that have not started.
+        """
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    async def run(self, X):
+        """
+        Predict labels for a feature matrix on the pool.
+        Args:
+            X (numpy.ndarray): Feature matrix of shape (n_samples, 64).
+        Returns:
+            y_pred (numpy.ndarray): Predicted class labels.
+            version (str): Version of the model that predicted them.
+        Raises:
+            ExecutorSaturated: If `max_queue` jobs are already pending.
+        """
+        if self._pending >= self.max_queue:
+            self._rejected += 1
+            raise ExecutorSaturated(
+                f"inference queue is full ({self._pending} pending jobs)"
+            )
+        self._pending += 1
+        try:
+            loop = asyncio.get_running_loop()
+            executor = self._pool()
+            try:
+                y_pred, version = await loop.run_in_executor(executor, self._fn, X)
+            except BrokenProcessPool:
+                # A worker died under this or another job; rebuild now so
+                # the next job doesn't find the pool broken
+                self._pool(broken=executor)
+                raise
+        except BaseException:
+            self._failed += 1
+            raise
+        finally:
+            self._pending -= 1
+        self._completed += 1
+        if version != model_holder.current.version:
+            self._stale += 1
+        return y_pred, version
+
+    def stats(self):
+        """
+        Report pool configuration and current load.
+        """
+        return {
+            "kind": self.kind,
+            "workers": self.workers,
+            "max_queue": self.max_queue,
+            "pending": self._pending,
+            "queue_depth": max(0, self._pending - self.workers),
+            "completed": self._completed,
+            "failed": self._failed,
+            "rejected": self._rejected,
+            "stale_results": self._stale,
+            "pool_healthy": self.kind == "thread" or self.pool_healthy(),
+            "pool_restarts": self._restarts,
+        }
@@ -1,8 +1,143 @@
-from fastapi import FastAPI, status, HTTPException
-from pydantic import BaseModel, conlist
-from predict import predict_data
+import asyncio
+import logging
+from contextlib import asynccontextmanager, nullcontext
+from typing import Any, List, Optional
 
-app = FastAPI(title="Digits Classifier API")
+import numpy as np
+from fastapi import FastAPI, Request, status, HTTPException
+from fastapi.exceptions import RequestValidationError
+from fastapi.responses import JSONResponse, PlainTextResponse
+from pydantic import BaseModel, ValidationError, conlist
+from predict import model_holder
+from batching import MicroBatcher, BatcherFull
+from inference import InferenceExecutor, ExecutorSaturated
+from cache import PredictionCache
+from metrics import Registry, MetricsMiddleware, StageTimer
+from wire import BINARY_TYPES, WireFormatError, decode_body, media_type
+from config import (
+    MODEL_PATH,
+    MODEL_RELOAD_INTERVAL,
+    MAX_BATCH_SIZE,
+    MICROBATCH_ENABLED,
+    MICROBATCH_MAX_SIZE,
+    MICROBATCH_MAX_WAIT_MS,
+    MICROBATCH_MAX_QUEUE,
+    INFERENCE_EXECUTOR,
+    INFERENCE_WORKERS,
+    INFERENCE_MAX_QUEUE,
+    PREDICTION_CACHE_SIZE,
+    PREDICTION_CACHE_TTL,
+    PREDICTION_CACHE_SCALE,
+    METRICS_ENABLED,
+)
+
+N_FEATURES = 64
+
+logger = logging.getLogger("uvicorn.error")
+
+executor = InferenceExecutor(
+    kind=INFERENCE_EXECUTOR,
+    workers=INFERENCE_WORKERS,
+    max_queue=INFERENCE_MAX_QUEUE,
+    model_path=MODEL_PATH,
+    reload_interval=MODEL_RELOAD_INTERVAL,
+)
+
+batcher = MicroBatcher(
+    executor.run,
+    max_batch_size=MICROBATCH_MAX_SIZE,
+    max_wait=MICROBATCH_MAX_WAIT_MS / 1000.0,
+    max_queue=MICROBATCH_MAX_QUEUE,
+    max_in_flight=INFERENCE_WORKERS,
+)
+
+cache = None
+if PREDICTION_CACHE_SIZE > 0:
+    cache = PredictionCache(
+        max_entries=PREDICTION_CACHE_SIZE,
+        ttl=PREDICTION_CACHE_TTL,
+        scale=PREDICTION_CACHE_SCALE,
+    )
+
+OVERLOADED = (ExecutorSaturated, BatcherFull)
+
+registry = Registry()
+requests_total = registry.counter(
+    "digits_http_requests_total", "HTTP requests handled", ("method", "route", "status")
+)
+request_seconds = registry.histogram(
+    "digits_http_request_duration_seconds", "End-to-end request latency", ("method", "route")
+)
+requests_in_flight = registry.gauge("digits_http_requests_in_flight", "Requests currently being handled")
+stage_seconds = registry.histogram(
+    "digits_stage_duration_seconds", "Time spent per request stage", ("stage",)
+)
+registry.gauge(
+    "digits_model_load_seconds", "Time taken to load the current model",
+    callback=lambda: {(): model_holder.current.load_seconds},
+)
+registry.gauge(
+    "digits_model_loaded_timestamp_seconds", "Unix time the current model was loaded",
+    callback=lambda: {(): model_holder.current.loaded_at.timestamp()},
+)
+registry.gauge(
+    "digits_inference_pending_jobs", "Inference jobs running or waiting on the executor",
+    callback=lambda: {(): executor.stats()["pending"]},
+)
+registry.gauge(
+    "digits_microbatch_queue_depth", "Rows waiting in the micro-batcher",
+    callback=lambda: {(): batcher.stats()["queue_depth"]},
+)
+
+
+def stage(name):
+    """
+    Time a block of request handling under `digits_stage_duration_seconds`.
+    """
+    if not METRICS_ENABLED:
+        return nullcontext()
+    return StageTimer(stage_seconds, name)
+
+
+async def watch_model(holder, interval):
+    """
+    Periodically check the model file and hot-swap it when it changes.
+    """
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            if await asyncio.to_thread(holder.reload_if_changed):
+                logger.info("Reloaded model version %s", holder.current.version[:12])
+        except Exception:
+            # Keep serving the previous model if the new file is unreadable
+            logger.exception("Model reload failed; keeping the current model")
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    await asyncio.to_thread(model_holder.load)
+    executor.start()
+    watcher = None
+    if MODEL_RELOAD_INTERVAL > 0:
+        watcher = asyncio.create_task(watch_model(model_holder, MODEL_RELOAD_INTERVAL))
+    if MICROBATCH_ENABLED:
+        await batcher.start()
+    yield
+    if MICROBATCH_ENABLED:
+        await batcher.stop()
+    if watcher is not None:
+        watcher.cancel()
+    executor.shutdown()
+
+
+app = FastAPI(title="Digits Classifier API", lifespan=lifespan)
+if METRICS_ENABLED:
+    app.add_middleware(
+        MetricsMiddleware,
+        requests_total=requests_total,
+        request_seconds=request_seconds,
+        in_flight=requests_in_flight,
+    )
 
 class DigitData(BaseModel):
     features: conlist(float, min_length=64, max_length=64)
@@ -10,14 +145,230 @@ class DigitData(BaseModel):
 class DigitResponse(BaseModel):
     prediction: int
 
+class BatchData(BaseModel):
+    # Rows are validated one by one so a bad row doesn't reject the whole batch
+    rows: List[Any]
+
+class RowError(BaseModel):
+    index: int
+    detail: str
+
+class BatchResponse(BaseModel):
+    predictions: List[Optional[int]]
+    errors: List[RowError]
+
+class ModelInfo(BaseModel):
+    path: str
+    version: str
+    loaded_at: str
+    mtime: str
+    load_seconds: float
+
+def validate_rows(rows):
+    """
+    Convert request rows into a feature matrix, collecting per-row errors.
+    Args:
+        rows (list): Candidate feature rows from the request body.
+    Returns:
+        X (numpy.ndarray): Valid rows stacked into shape (n_valid, 64).
+        valid_idx (list[int]): Position of each valid row in the request.
+        errors (list[RowError]): One entry per rejected row.
+    """
+    # Fast path: a well-formed batch converts in one shot
+    try:
+        X = np.asarray(rows, dtype=float)
+        if X.ndim == 2 and X.shape[1] == N_FEATURES:
+            finite = np.isfinite(X).all(axis=1)
+            if finite.all():
+                return X, list(range(len(X))), []
+            errors = [
+                RowError(index=int(i), detail="row contains NaN or infinite values")
+                for i in np.flatnonzero(~finite)
+            ]
+            return X[finite], np.flatnonzero(finite).tolist(), errors
+    except (TypeError, ValueError):
+        pass
+
+    valid, valid_idx, errors = [], [], []
+    for i, row in enumerate(rows):
+        try:
+            vec = np.asarray(row, dtype=float)
+        except (TypeError, ValueError):
+            errors.append(RowError(index=i, detail="row must be a list of numbers"))
+            continue
+        if vec.shape != (N_FEATURES,):
+            errors.append(RowError(index=i, detail=f"row must have exactly {N_FEATURES} features"))
+            continue
+        if not np.isfinite(vec).all():
+            errors.append(RowError(index=i, detail="row contains NaN or infinite values"))
+            continue
+        valid.append(vec)
+        valid_idx.append(i)
+
+    X = np.vstack(valid) if valid else np.empty((0, N_FEATURES))
+    return X, valid_idx, errors
+
+def binary_body_schema(description):
+    return {"schema": {"type": "string", "format": "binary"}, "description": description}
+
+def request_body_docs(model):
+    """
+    OpenAPI request body listing the JSON model plus the binary formats.
+    """
+    return {
+        "requestBody": {
+            "required": True,
+            "content": {
+                "application/json": {"schema": model.model_json_schema()},
+                "application/octet-stream": binary_body_schema(
+                    "Raw little-endian rows of 64 values; element type from the "
+                    "X-Feature-Dtype header (float32, float64 or uint8, default float32)."
+                ),
+                "application/x-npy": binary_body_schema(
+                    "A numpy .npy file holding a (64,) or (n, 64) array."
+                ),
+            },
+        }
+    }
+
+async def read_payload(request, model):
+    """
+    Parse the request body as either a binary feature matrix or JSON `model`.
+    Returns:
+        numpy.ndarray | BaseModel: Decoded rows for binary bodies, otherwise
+        the validated pydantic model.
+    """
+    body = await request.body()
+    content_type = request.headers.get("content-type")
+    if media_type(content_type) in BINARY_TYPES:
+        try:
+            return decode_body(body, content_type, request.headers.get("x-feature-dtype"))
+        except WireFormatError as e:
+            raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=str(e))
+    try:
+        return model.model_validate_json(body)
+    except ValidationError as e:
+        # Same error locations FastAPI reports for a declared body parameter
+        raise RequestValidationError(
+            [{**err, "loc": ("body", *err["loc"])} for err in e.errors(include_url=False)]
+        )
+
 @app.get("/", status_code=status.HTTP_200_OK)
 async def health_ping():
     return {"status": "healthy"}
 
-@app.post("/predict", response_model=DigitResponse)
-async def predict_digit(payload: DigitData):
+@app.get("/model", response_model=ModelInfo)
+async def model_info():
+    return ModelInfo(**model_holder.info())
+
+@app.get("/metrics", response_class=PlainTextResponse)
+async def metrics():
+    return PlainTextResponse(registry.render(), media_type="text/plain; version=0.0.4")
+
+@app.get("/stats/batcher")
+async def batcher_stats():
+    return {"enabled": MICROBATCH_ENABLED, **batcher.stats()}
+
+@app.get("/stats/executor")
+async def executor_stats():
+    return executor.stats()
+
+@app.get("/stats/cache")
+async def cache_stats():
+    if cache is None:
+        return {"enabled": False}
+    return {"enabled": True, **cache.stats()}
+
+@app.post("/predict", response_model=DigitResponse, openapi_extra=request_body_docs(DigitData))
+async def predict_digit(request: Request):
+    with stage("parse"):
+        payload = await read_payload(request, DigitData)
+    if isinstance(payload, np.ndarray):
+        if payload.shape[0] != 1:
+            raise HTTPException(
+                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                detail=f"/predict takes exactly one row, got {payload.shape[0]}; use /predict/batch",
+            )
+        row = payload[0]
+    else:
+        row = payload.features
+    X = np.asarray(row, dtype=float).reshape(1, -1)
+    if not np.isfinite(X).all():
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail="row contains NaN or infinite values",
+        )
+
+    if cache is not None:
+        with stage("cache"):
+            version = model_holder.current.version
+            keys = cache.keys_for(X)
+            cached, _ = cache.get_many(keys, version)
+        if cached[0] is not None:
+            with stage("serialize"):
+                return JSONResponse({"prediction": cached[0]})
+
     try:
-        pred = predict_data(payload.features)
-        return DigitResponse(prediction=int(pred[0]))
+        with stage("inference"):
+            if MICROBATCH_ENABLED:
+                label, model_version = await batcher.submit(X[0])
+            else:
+                preds, model_version = await executor.run(X)
+                label = int(preds[0])
+    except OVERLOADED as e:
+        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
+
+    if cache is not None:
+        # Keyed by the model that answered; a process worker that has not
+        # swapped yet must not fill the cache for the new version
+        cache.put_many(keys, [label], model_version)
+    with stage("serialize"):
+        return JSONResponse({"prediction": label})
+
+@app.post("/predict/batch", response_model=BatchResponse, openapi_extra=request_body_docs(BatchData))
+async def predict_digits_batch(request: Request):
+    with stage("parse"):
+        payload = await read_payload(request, BatchData)
+    rows = payload if isinstance(payload, np.ndarray) else payload.rows
+    if len(rows) > MAX_BATCH_SIZE:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"batch has {len(rows)} rows; the limit is {MAX_BATCH_SIZE}",
+        )
+
+    with stage("validate"):
+        X, valid_idx, errors = validate_rows(rows)
+    predictions = [None] * len(rows)
+
+    # Only rows the cache can't answer go to the model
+    labels = [None] * len(valid_idx)
+    miss_idx = list(range(len(valid_idx)))
+    if cache is not None and valid_idx:
+        with stage("cache"):
+            version = model_holder.current.version
+            keys = cache.keys_for(X)
+            labels, miss_idx = cache.get_many(keys, version)
+
+    if miss_idx:
+        try:
+            with stage("inference"):
+                preds, model_version = await executor.run(X if len(miss_idx) == len(X) else X[miss_idx])
+        except ExecutorSaturated as e:
+            raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail=str(e))
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=str(e))
+        preds = preds.tolist()
+        for j, pred in zip(miss_idx, preds):
+            labels[j] = int(pred)
+        if cache is not None:
+            cache.put_many([keys[j] for j in miss_idx], preds, model_version)
+
+    for i, label in zip(valid_idx, labels):
+        predictions[i] = label
+
+    with stage("serialize"):
+        return JSONResponse(
+            {"predictions": predictions, "errors": [error.model_dump() for error in errors]}
+        )
@@ -1,14 +1,165 @@
+import hashlib
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+
 import joblib
 import numpy as np
 
+from compiled import CompiledSVC
+from config import MODEL_PATH
+
+
+@dataclass(frozen=True)
+class LoadedModel:
+    """
+    Immutable snapshot of a loaded model and where it came from.
+    """
+    model: object
+    version: str
+    mtime: float
+    loaded_at: datetime
+    load_seconds: float = 0.0
+
+
+def _file_hash(path):
+    """
+    Compute the SHA-256 digest of a file, reading it in chunks.
+    """
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def load_model(path):
+    """
+    Load a model file: `.npz` files hold a compiled SVC, anything else is a joblib pickle.
+    """
+    if Path(path).suffix == ".npz":
+        return CompiledSVC.load(path)
+    return joblib.load(path)
+
+
+class ModelHolder:
+    """
+    Holds the currently served model and swaps it when the file on disk changes.
+
+    Readers grab `current` once per request and keep using that snapshot, so a
+    reload never pulls the model out from under an in-flight prediction.
+    """
+
+    def __init__(self, path=MODEL_PATH):
+        self.path = Path(path)
+        self._current = None
+        self._lock = threading.Lock()
+
+    @property
+    def current(self):
+        """
+        Return the loaded model snapshot, loading it on first use.
+        """
+        snapshot = self._current
+        if snapshot is None:
+            snapshot = self.load()
+        return snapshot
+
+    def load(self):
+        """
+        Unconditionally (re)load the model from disk and publish it.
+        """
+        with self._lock:
+            start = time.perf_counter()
+            mtime = self.path.stat().st_mtime
+            version = _file_hash(self.path)
+            model = load_model(self.path)
+            self._current = LoadedModel(
+                model=model,
+                version=version,
+                mtime=mtime,
+                loaded_at=datetime.now(timezone.utc),
+                load_seconds=time.perf_counter() - start,
+            )
+            return self._current
+
+    def reload_if_changed(self):
+        """
+        Reload the model if the file's mtime and content hash have changed.
+        Returns:
+            bool: True if a new model was swapped in.
+        """
+        snapshot = self._current
+        if snapshot is None:
+            self.load()
+            return True
+
+        mtime = self.path.stat().st_mtime
+        if mtime == snapshot.mtime:
+            return False
+
+        with self._lock:
+            start = time.perf_counter()
+            version = _file_hash(self.path)
+            if version == self._current.version:
+                # Touched but not rewritten: remember the mtime and keep serving
+                self._current = LoadedModel(
+                    model=self._current.model,
+                    version=version,
+                    mtime=mtime,
+                    loaded_at=self._current.loaded_at,
+                    load_seconds=self._current.load_seconds,
+                )
+                return False
+            model = load_model(self.path)
+            self._current = LoadedModel(
+                model=model,
+                version=version,
+                mtime=mtime,
+                loaded_at=datetime.now(timezone.utc),
+                load_seconds=time.perf_counter() - start,
+            )
+            return True
+
+    def info(self):
+        """
+        Describe the loaded model for the /model endpoint.
+        """
+        snapshot = self.current
+        return {
+            "path": str(self.path),
+            "version": snapshot.version,
+            "loaded_at": snapshot.loaded_at.isoformat(),
+            "mtime": datetime.fromtimestamp(snapshot.mtime, tz=timezone.utc).isoformat(),
+            "load_seconds": snapshot.load_seconds,
+        }
+
+
+model_holder = ModelHolder()
+
+
 def predict_data(features):
     """
     Predict class labels for the input data.
     Args:
-        X (numpy.ndarray): Input data for which predictions are to be made.
+        features (list[float]): A single 64-length pixel vector.
     Returns:
         y_pred (numpy.ndarray): Predicted class labels.
     """
-    model = joblib.load("../model/digits_model.pkl")
+    model = model_holder.current.model
     X = np.asarray(features, dtype=float).reshape(1, -1)
     return model.predict(X)
+
+
+def predict_batch(X):
+    """
+    Predict class labels for many rows with a single vectorized call.
+    Args:
+        X (numpy.ndarray): Feature matrix of shape (n_samples, 64).
+    Returns:
+        y_pred (numpy.ndarray): Predicted class labels, in row order.
+    """
+    model = model_holder.current.model
+    return model.predict(np.asarray(X, dtype=float))
@@ -1,9 +1,62 @@
+import argparse
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import numpy as np
 from sklearn.svm import SVC
+from sklearn.linear_model import LogisticRegression
+from sklearn.neighbors import KNeighborsClassifier
 from sklearn.metrics import accuracy_score, classification_report
+from sklearn.model_selection import StratifiedKFold, ParameterGrid
 import joblib
 from data import load_data, split_data
+from compiled import export_compiled
+
+MODEL_PATH = "../model/digits_model.pkl"
+COMPILED_PATH = "../model/digits_model.npz"
+SEARCH_RESULTS_PATH = "../model/search_results.json"
+
+# Search spaces per estimator; random search samples gamma and C log-uniformly
+SEARCH_GRIDS = {
+    "svc": {"gamma": [0.0002, 0.0005, 0.001, 0.002, 0.005], "C": [1, 3, 10, 30, 100]},
+    "knn": {"n_neighbors": [1, 3, 5, 7, 9], "weights": ["uniform", "distance"]},
+    "logreg": {"C": [0.01, 0.1, 1, 10]},
+}
+SEARCH_RANGES = {
+    "svc": {"gamma": (1e-4, 1e-2), "C": (0.5, 200.0)},
+    "knn": {"n_neighbors": (1, 15)},
+    "logreg": {"C": (1e-3, 100.0)},
+}
+
 
-def fit_model(X_train, y_train, X_test, y_test):
+def save_model(model, path):
+    """
+    Dump a model with joblib via a temp file and an atomic rename, so the
+    API's file watcher never sees a half-written pickle.
+    """
+    path = Path(path)
+    tmp = path.with_name(path.name + ".tmp")
+    joblib.dump(model, tmp)
+    os.replace(tmp, path)
+
+
+def make_estimator(name, params):
+    """
+    Build an unfitted classifier for a search candidate.
+    """
+    if name == "svc":
+        return SVC(kernel="rbf", **params)
+    if name == "knn":
+        return KNeighborsClassifier(**params)
+    if name == "logreg":
+        return LogisticRegression(max_iter=2000, **params)
+    raise ValueError(f"unknown estimator: {name!r}")
+
+
+def fit_model(X_train, y_train, X_test, y_test, model=None):
     """
     Train SVM classifier on the Digits dataset and save the model to a pkl file.
     Args:
@@ -11,8 +64,11 @@ def fit_model(X_train, y_train, X_test, y_test):
         y_train (numpy.ndarray): Training labels (n_samples,).
         X_test  (numpy.ndarray): Test features.
         y_test  (numpy.ndarray): Test labels.
+        model: Unfitted classifier to train instead of the default SVC.
+    Returns:
+        float: Test accuracy of the saved model.
     """
-    svm_classifier = SVC(kernel="rbf", gamma=0.001, C=10)
+    svm_classifier = model if model is not None else SVC(kernel="rbf", gamma=0.001, C=10)
     svm_classifier.fit(X_train, y_train)
 
     # Evaluate the model
@@ -24,9 +80,205 @@ def fit_model(X_train, y_train, X_test, y_test):
     print(classification_report(y_test, y_pred, digits=3))
     print("=" * 50)
 
-    joblib.dump(svm_classifier, "../model/digits_model.pkl")
+    save_model(svm_classifier, MODEL_PATH)
+
+    if isinstance(svm_classifier, SVC) and svm_classifier.kernel == "rbf":
+        # Export the NumPy inference version; fails if its labels differ on the test split
+        try:
+            export_compiled(svm_classifier, COMPILED_PATH, X_check=X_test)
+        except Exception:
+            remove_stale_compiled()
+            raise
+        print(f"Compiled model written to {COMPILED_PATH}")
+    else:
+        remove_stale_compiled()
+        print("Skipped compiled export: only RBF SVCs can be compiled")
+    return acc
+
+
+def remove_stale_compiled():
+    """
+    Delete a compiled model left by an earlier run, so an API serving the
+    .npz fails to reload instead of quietly keeping the previous SVC.
+    """
+    path = Path(COMPILED_PATH)
+    if path.exists():
+        path.unlink()
+        print(f"Removed stale compiled model {path}; serve {MODEL_PATH} instead")
+
+
+def sample_candidates(estimators, space, n_iter, seed):
+    """
+    List (estimator name, params) candidates from a grid or random space.
+    """
+    candidates = []
+    if space == "grid":
+        for name in estimators:
+            candidates += [(name, params) for params in ParameterGrid(SEARCH_GRIDS[name])]
+        return candidates
+
+    rng = np.random.default_rng(seed)
+    for name in estimators:
+        for _ in range(n_iter):
+            params = {}
+            for key, (low, high) in SEARCH_RANGES[name].items():
+                if key == "n_neighbors":
+                    params[key] = int(rng.integers(low, high + 1))
+                else:
+                    params[key] = float(np.exp(rng.uniform(np.log(low), np.log(high))))
+            candidates.append((name, params))
+    return candidates
+
+
+# Per-process fold data, set once by the pool initializer instead of being
+# pickled with every task
+_folds = None
+
+
+def _init_search_worker(folds):
+    global _folds
+    _folds = folds
+
+
+def squared_distances(A, B):
+    """
+    Pairwise squared Euclidean distances between the rows of A and B.
+    """
+    sq = (A * A).sum(axis=1)[:, None] + (B * B).sum(axis=1)[None, :] - 2.0 * A @ B.T
+    return np.maximum(sq, 0.0)
+
+
+def build_folds(X, y, cv, seed):
+    """
+    Split the training data into CV folds and precompute the squared
+    distances the RBF kernel needs. Every SVC candidate reuses these, so
+    each fold only computes exp(-gamma * D) instead of the full kernel.
+    """
+    folds = []
+    splitter = StratifiedKFold(n_splits=cv, shuffle=True, random_state=seed)
+    for train_idx, val_idx in splitter.split(X, y):
+        X_tr, X_val = X[train_idx], X[val_idx]
+        folds.append({
+            "X_train": X_tr,
+            "y_train": y[train_idx],
+            "X_val": X_val,
+            "y_val": y[val_idx],
+            "D_train": squared_distances(X_tr, X_tr),
+            "D_val": squared_distances(X_val, X_tr),
+        })
+    return folds
+
+
+def evaluate_candidate(name, params):
+    """
+    Cross-validate one candidate on the worker's folds.
+    Returns:
+        dict: Mean/std accuracy, per-fold scores and fit/score timings.
+    """
+    scores, fit_seconds, score_seconds = [], [], []
+    for fold in _folds:
+        start = time.perf_counter()
+        if name == "svc":
+            model = SVC(kernel="precomputed", C=params["C"])
+            model.fit(np.exp(-params["gamma"] * fold["D_train"]), fold["y_train"])
+            fitted = time.perf_counter()
+            y_pred = model.predict(np.exp(-params["gamma"] * fold["D_val"]))
+        else:
+            model = make_estimator(name, params)
+            model.fit(fold["X_train"], fold["y_train"])
+            fitted = time.perf_counter()
+            y_pred = model.predict(fold["X_val"])
+        done = time.perf_counter()
+        scores.append(float(accuracy_score(fold["y_val"], y_pred)))
+        fit_seconds.append(fitted - start)
+        score_seconds.append(done - fitted)
+    return {
+        "estimator": name,
+        "params": params,
+        "mean_score": float(np.mean(scores)),
+        "std_score": float(np.std(scores)),
+        "fold_scores": scores,
+        "fit_seconds": float(np.sum(fit_seconds)),
+        "score_seconds": float(np.sum(score_seconds)),
+    }
+
+
+def search_models(X_train, y_train, X_test, y_test, estimators=("svc",), space="grid",
+                  n_iter=20, cv=5, jobs=None, seed=12):
+    """
+    Search classifier hyperparameters in parallel, then train and export the best one.
+    Args:
+        X_train, y_train: The `split_data` training split, used for CV.
+        X_test, y_test: The held-out split, used only to report the final model.
+        estimators (tuple[str]): Any of "svc", "knn", "logreg".
+        space (str): "grid" or "random".
+        n_iter (int): Candidates per estimator for random search.
+        cv (int): Number of stratified folds.
+        jobs (int): Worker processes (default: all cores).
+        seed (int): Seed for folds and random sampling.
+    Returns:
+        dict: The search record written to search_results.json.
+    """
+    started = time.perf_counter()
+    candidates = sample_candidates(estimators, space, n_iter, seed)
+    folds = build_folds(X_train, y_train, cv, seed)
+    prepared = time.perf_counter()
+    jobs = jobs or os.cpu_count() or 1
+    print(f"Evaluating {len(candidates)} candidates x {cv} folds on {jobs} processes")
+
+    with ProcessPoolExecutor(max_workers=jobs, initializer=_init_search_worker, initargs=(folds,)) as pool:
+        futures = [pool.submit(evaluate_candidate, name, params) for name, params in candidates]
+        results = [f.result() for f in futures]
+    searched = time.perf_counter()
+
+    results.sort(key=lambda r: r["mean_score"], reverse=True)
+    best = results[0]
+    print(f"Best: {best['estimator']} {best['params']} cv_accuracy={best['mean_score']:.4f}")
+
+    test_acc = fit_model(X_train, y_train, X_test, y_test,
+                         model=make_estimator(best["estimator"], best["params"]))
+
+    record = {
+        "space": space,
+        "cv": cv,
+        "jobs": jobs,
+        "seed": seed,
+        "best": {**best, "test_accuracy": float(test_acc)},
+        "timings": {
+            "prepare_seconds": prepared - started,
+            "search_seconds": searched - prepared,
+            "refit_export_seconds": time.perf_counter() - searched,
+        },
+        "candidates": results,
+    }
+    Path(SEARCH_RESULTS_PATH).write_text(json.dumps(record, indent=2))
+    print(f"Search results written to {SEARCH_RESULTS_PATH}")
+    return record
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Train the digits classifier")
+    parser.add_argument("--search", choices=("grid", "random"),
+                        help="Search hyperparameters instead of training the default SVC")
+    parser.add_argument("--estimators", default="svc",
+                        help="Comma-separated estimators to search: svc, knn, logreg")
+    parser.add_argument("--n-iter", type=int, default=20, help="Candidates per estimator (random search)")
+    parser.add_argument("--cv", type=int, default=5)
+    parser.add_argument("--jobs", type=int, default=None, help="Worker processes (default: all cores)")
+    parser.add_argument("--seed", type=int, default=12)
+    return parser.parse_args()
+
 
 if __name__ == "__main__":
+    args = parse_args()
     X, y = load_data()
     X_train, X_test, y_train, y_test = split_data(X, y)
-    fit_model(X_train, y_train, X_test, y_test)
+    if args.search:
+        estimators = tuple(e.strip() for e in args.estimators.split(",") if e.strip())
+        for name in estimators:
+            if name not in SEARCH_GRIDS:
+                raise SystemExit(f"unknown estimator {name!r}; choose from {', '.join(SEARCH_GRIDS)}")
+        search_models(X_train, y_train, X_test, y_test, estimators=estimators, space=args.search,
+                      n_iter=args.n_iter, cv=args.cv, jobs=args.jobs, seed=args.seed)
+    else:
+        fit_model(X_train, y_train, X_test, y_test)
@@ -0,0 +1,112 @@
+import ast
+
+import numpy as np
+
+N_FEATURES = 64
+
+OCTET_STREAM = "application/octet-stream"
+NPY = "application/x-npy"
+BINARY_TYPES = (OCTET_STREAM, NPY)
+
+# Raw buffers are always little-endian; the client names the element type
+RAW_DTYPES = {
+    "float32": np.dtype("<f4"),
+    "float64": np.dtype("<f8"),
+    "uint8": np.dtype("u1"),
+}
+DEFAULT_RAW_DTYPE = "float32"
+
+NPY_MAGIC = b"\x93NUMPY"
+
+
+class WireFormatError(ValueError):
+    """
+    Raised when a binary request body cannot be decoded into feature rows.
+    """
+
+
+def media_type(content_type):
+    """
+    Strip parameters (e.g. charset) from a Content-Type header value.
+    """
+    return (content_type or "").split(";", 1)[0].strip().lower()
+
+
+def decode_raw(body, dtype_name=None):
+    """
+    View a raw little-endian buffer as an (n_rows, 64) array without copying.
+    Args:
+        body (bytes): Request body.
+        dtype_name (str): One of "float32", "float64" or "uint8".
+    Returns:
+        numpy.ndarray: Read-only feature matrix backed by `body`.
+    """
+    name = (dtype_name or DEFAULT_RAW_DTYPE).lower()
+    if name not in RAW_DTYPES:
+        raise WireFormatError(
+            f"unsupported dtype {name!r}; expected one of {sorted(RAW_DTYPES)}"
+        )
+    dtype = RAW_DTYPES[name]
+    row_bytes = N_FEATURES * dtype.itemsize
+    if not body or len(body) % row_bytes:
+        raise WireFormatError(
+            f"body of {len(body)} bytes is not a whole number of {N_FEATURES}-feature "
+            f"{name} rows ({row_bytes} bytes each)"
+        )
+    return np.frombuffer(body, dtype=dtype).reshape(-1, N_FEATURES)
+
+
+def decode_npy(body):
+    """
+    Decode a .npy payload by parsing its header and viewing the data in place.
+    Args:
+        body (bytes): Contents of a file written by `numpy.save`.
+    Returns:
+        numpy.ndarray: Feature matrix of shape (n_rows, 64).
+    """
+    if not body.startswith(NPY_MAGIC) or len(body) < 10:
+        raise WireFormatError("body is not a .npy payload")
+
+    major = body[6]
+    if major == 1:
+        header_len = int.from_bytes(body[8:10], "little")
+        offset = 10
+    elif major in (2, 3):
+        header_len = int.from_bytes(body[8:12], "little")
+        offset = 12
+    else:
+        raise WireFormatError(f"unsupported .npy format version {major}")
+
+    try:
+        header = ast.literal_eval(body[offset:offset + header_len].decode("latin1"))
+        dtype = np.dtype(header["descr"])
+        shape = tuple(header["shape"])
+        fortran_order = bool(header["fortran_order"])
+    except Exception:
+        raise WireFormatError("malformed .npy header")
+
+    if dtype.kind not in "fiu":
+        raise WireFormatError(f"unsupported .npy dtype {dtype.str}")
+    if len(shape) not in (1, 2) or shape[-1] != N_FEATURES:
+        raise WireFormatError(f".npy array must have shape (64,) or (n, 64), got {shape}")
+
+    data_start = offset + header_len
+    count = int(np.prod(shape))
+    if len(body) - data_start != count * dtype.itemsize:
+        raise WireFormatError(".npy data length does not match its header")
+
+    X = np.frombuffer(body, dtype=dtype, count=count, offset=data_start)
+    X = X.reshape(shape, order="F" if fortran_order else "C")
+    return X.reshape(-1, N_FEATURES)
+
+
+def decode_body(body, content_type, dtype_name=None):
+    """
+    Decode a binary request body according to its media type.
+    """
+    kind = media_type(content_type)
+    if kind == NPY:
+        return decode_npy(body)
+    if kind == OCTET_STREAM:
+        return decode_raw(body, dtype_name)
+    raise WireFormatError(f"unsupported content type {kind!r}")
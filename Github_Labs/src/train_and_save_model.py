@@ -4,6 +4,7 @@ from datetime import datetime
 from statistics import mean, median
 
 from dotenv import load_dotenv
+import numpy as np
 import pandas as pd
 from google.cloud import storage
 
@@ -106,6 +107,91 @@ def score_password(pw: str) -> float:
     raw = length_pts + diversity_pts + repeat_penalty + uniq_bonus
     return float(max(0.0, min(100.0, raw)))
 
+# Batch scoring: same rules as score_password, computed with numpy over the
+# concatenated bytes of each chunk of ASCII passwords. Rows with non-ASCII
+# characters (rare) go through score_password so Unicode \d, lower() etc.
+# behave exactly as there.
+SCORE_CHUNK_ROWS = 1 << 14
+_ASCII = np.arange(128, dtype=np.uint8)
+# Bit per character class (LOWER, UPPER, DIGIT, SYMB) of each ASCII byte
+_CLASS_BITS = np.select(
+    [(_ASCII >= 97) & (_ASCII <= 122), (_ASCII >= 65) & (_ASCII <= 90), (_ASCII >= 48) & (_ASCII <= 57)],
+    [1, 2, 4], default=8,
+).astype(np.uint8)
+_DIVERSITY = np.array([bin(bits).count("1") for bits in range(16)])
+_LOWER_BYTES = np.where((_ASCII >= 65) & (_ASCII <= 90), _ASCII + 32, _ASCII).astype(np.uint8)
+_DIVERSITY_PTS = np.array([0.0, 10.0, 20.0, 32.0, 40.0])
+# COMMON as one (words, length) byte matrix per word length
+_COMMON_BYTES = {
+    length: np.array([list(w.encode("ascii")) for w in sorted(COMMON) if len(w) == length], dtype=np.uint8)
+    for length in {len(w) for w in COMMON}
+}
+
+def _score_ascii_chunk(values: np.ndarray) -> np.ndarray:
+    n = len(values)
+    lens = np.fromiter(map(len, values), dtype=np.int64, count=n)
+    data = np.frombuffer("".join(values).encode("ascii"), dtype=np.uint8)
+    starts = np.zeros(n, dtype=np.int64)
+    np.cumsum(lens[:-1], out=starts[1:])
+    rows = np.repeat(np.arange(n), lens)
+    pos = np.arange(len(data)) - starts[rows]  # index of each byte within its password
+
+    # char_classes: OR of the class bits of each password's bytes
+    nonempty = lens > 0
+    class_bits = np.zeros(n, dtype=np.uint8)
+    if nonempty.any():
+        class_bits[nonempty] = np.bitwise_or.reduceat(_CLASS_BITS[data], starts[nonempty])
+    diversity = _DIVERSITY[class_bits]
+
+    # len(set(pw)) from a per-row table of the characters present
+    present = np.zeros((n, 128), dtype=bool)
+    present[rows, data] = True
+    uniq = np.count_nonzero(present, axis=1)
+
+    # has_repeated_sequences: three equal characters in a row, or
+    # s[:2] * (len//2) in s, i.e. s[i] == s[i-2] for 2 <= i < 2 * (len//2)
+    run3 = np.zeros(n, dtype=bool)
+    run3[rows[2:][(data[2:] == data[1:-1]) & (data[1:-1] == data[:-2]) & (pos[2:] >= 2)]] = True
+    not_periodic = np.zeros(n, dtype=bool)
+    checked = (pos[2:] >= 2) & (pos[2:] < 2 * (lens[rows[2:]] // 2))
+    not_periodic[rows[2:][checked & (data[2:] != data[:-2])]] = True
+    repeated = (lens >= 3) & (run3 | ~not_periodic)
+
+    common = lens == 0
+    lowered = _LOWER_BYTES[data]
+    for length, words in _COMMON_BYTES.items():
+        candidates = np.flatnonzero(lens == length)
+        window = lowered[starts[candidates, None] + np.arange(length)]
+        common[candidates[(window[:, None, :] == words).all(axis=2).any(axis=1)]] = True
+
+    length_pts = np.minimum(40.0, lens * 3.5)
+    repeat_penalty = np.where(repeated, -12.0, 0.0)
+    uniq_bonus = np.minimum(10.0, np.maximum(0.0, (uniq - 5) * 1.2))
+    raw = length_pts + _DIVERSITY_PTS[diversity] + repeat_penalty + uniq_bonus
+    return np.where(common, 5.0, np.maximum(0.0, np.minimum(100.0, raw)))
+
+def score_passwords(passwords) -> np.ndarray:
+    """Vectorized score_password over a list or pandas/Arrow string column.
+
+    Returns a float64 array whose values are identical to
+    [score_password(pw) for pw in passwords]. Missing values are not allowed.
+    """
+    if isinstance(passwords, pd.Series):
+        values = passwords.to_numpy(dtype=object)
+    else:
+        values = np.asarray(list(passwords), dtype=object)
+    scores = np.empty(len(values), dtype=np.float64)
+    for start in range(0, len(values), SCORE_CHUNK_ROWS):
+        chunk = values[start:start + SCORE_CHUNK_ROWS]
+        ascii_rows = np.fromiter(map(str.isascii, chunk), dtype=bool, count=len(chunk))
+        out = scores[start:start + len(chunk)]
+        if ascii_rows.all():
+            out[:] = _score_ascii_chunk(chunk)
+            continue
+        out[ascii_rows] = _score_ascii_chunk(chunk[ascii_rows])
+        out[~ascii_rows] = [score_password(pw) for pw in chunk[~ascii_rows]]
+    return scores
+
 def load_passwords(csv_path: Path, col: str) -> list[str]:
     if not csv_path.exists():
         raise SystemExit(f"No input CSV found at {csv_path}")
@@ -163,7 +249,7 @@ def main():
     new_version = current_version + 1
 
     passwords = load_passwords(PASSWORDS_CSV, PASSWORDS_COL)
-    scores = [score_password(pw) for pw in passwords]
+    scores = score_passwords(passwords).tolist()
     metrics, metrics_path, weak_path, sample_path, ts = save_artifacts(passwords, scores, OUT_DIR)
 
     MIN_AVG = float(os.getenv("MIN_AVG_SCORE", "0.0"))
@@ -4,7 +4,7 @@ from pathlib import Path
 from unittest.mock import MagicMock, patch
 
 from src.train_and_save_model import (
-    score_password, compute_batch_metrics, load_passwords,
+    score_password, score_passwords, compute_batch_metrics, load_passwords,
     ensure_folder_exists, get_model_version, update_model_version,
 )
 
@@ -13,6 +13,20 @@ def test_score_password_basics():
     assert score_password("A_very_Str0ng!") >= 70
     assert score_password("aaaaaa") < score_password("aaaAAA11!!")
 
+def test_score_passwords_matches_score_password(monkeypatch):
+    import random, string
+    import src.train_and_save_model as m
+    random.seed(0)
+    pws = ["", "a", "aaa", "aba", "abb", "ababx", "PassWord", "MONKEY", "a\nb\nc",
+           "١٢٣abc", "Straße123!", "pässwörd"]
+    pws += ["".join(random.choices(random.choice(["ab", "aA1!", string.printable]), k=random.randint(0, 16)))
+            for _ in range(2000)]
+    monkeypatch.setattr(m, "SCORE_CHUNK_ROWS", 500)
+    expected = [score_password(pw) for pw in pws]
+    assert score_passwords(pws).tolist() == expected
+    assert score_passwords(pd.Series(pws, dtype="string")).tolist() == expected
+    assert score_passwords([]).tolist() == []
+
 def test_compute_batch_metrics():
     scores = [10, 20, 80, 90]
     m = compute_batch_metrics(scores)
@@ -0,0 +1,42 @@
+import argparse, json, time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from tools.create_csv import make_passwords
+from src.train_and_save_model import score_password, score_passwords
+
+def best_time(fn, repeats):
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser(description="Passwords/second of score_password vs score_passwords")
+    ap.add_argument("--n", type=int, default=1_000_000)
+    ap.add_argument("--repeats", type=int, default=3)
+    ap.add_argument("--seed", type=int, default=42)
+    ap.add_argument("--out", help="Optional path for JSON results")
+    args = ap.parse_args()
+
+    passwords = make_passwords(args.n, seed=args.seed)
+    inputs = {
+        "list": passwords,
+        "series[object]": pd.Series(passwords, dtype=object),
+        "series[string]": pd.Series(passwords, dtype="string"),
+    }
+    loop_s, expected = best_time(lambda: [score_password(pw) for pw in passwords], args.repeats)
+    results = {"n": args.n, "per_row_loop": args.n / loop_s}
+    print(f"{'score_password loop':<32} {args.n / loop_s:>14,.0f} pw/s")
+    for label, values in inputs.items():
+        seconds, scores = best_time(lambda: score_passwords(values), args.repeats)
+        assert np.array_equal(scores, np.array(expected)), f"mismatch for {label}"
+        results[label] = args.n / seconds
+        print(f"{'score_passwords(' + label + ')':<32} {args.n / seconds:>14,.0f} pw/s  ({loop_s / seconds:.1f}x)")
+
+    if args.out:
+        Path(args.out).write_text(json.dumps(results, indent=2))
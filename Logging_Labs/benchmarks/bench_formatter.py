@@ -0,0 +1,96 @@
+"""
+Compare JsonFormatter and FastJsonFormatter throughput (records/second).
+
+Run from Logging_Labs/:
+    python benchmarks/bench_formatter.py --records 100000
+"""
+import argparse
+import json
+import logging
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from src.log_setup import FastJsonFormatter, JsonFormatter  # noqa: E402
+
+
+def make_records(n):
+    """
+    Build n records like the per-column warnings of data_quality, spread
+    over a few seconds so the timestamp cache sees second boundaries.
+    """
+    logger = logging.getLogger("dq_logger")
+    start = time.time()
+    records = []
+    for i in range(n):
+        record = logger.makeRecord(
+            logger.name,
+            logging.WARNING,
+            __file__,
+            0,
+            "Missing values detected",
+            None,
+            None,
+            extra={"event": "missing_values", "column": f"col_{i}", "missing_count": i % 97},
+        )
+        record.created = start + i * 5e-5
+        records.append(record)
+    return records
+
+
+def records_per_second(formatter, records, repeats):
+    """
+    Return the best records/second of `repeats` passes over records.
+    """
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        for record in records:
+            formatter.format(record)
+        best = min(best, time.perf_counter() - start)
+    return len(records) / best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--records", type=int, default=100_000)
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--out", help="Optional path for JSON results")
+    args = parser.parse_args()
+
+    records = make_records(args.records)
+    formatters = {
+        "JsonFormatter": JsonFormatter(),
+        "FastJsonFormatter (json)": FastJsonFormatter(use_orjson=False),
+    }
+    try:
+        formatters["FastJsonFormatter (orjson)"] = FastJsonFormatter(use_orjson=True)
+    except ImportError:
+        print("orjson not installed; skipping the orjson encoder")
+
+    # Same schema and values everywhere; byte-identical with the stdlib encoder
+    standard = [formatters["JsonFormatter"].format(r) for r in records]
+    for name, formatter in formatters.items():
+        lines = [formatter.format(r) for r in records]
+        if name.endswith("(json)"):
+            assert lines == standard, f"{name} output differs"
+        else:
+            assert [json.loads(line) for line in lines] == [json.loads(line) for line in standard]
+
+    results = {}
+    baseline = None
+    print(f"{'formatter':<28} {'records/s':>12} {'speedup':>8}")
+    for name, formatter in formatters.items():
+        rate = records_per_second(formatter, records, args.repeats)
+        baseline = baseline or rate
+        results[name] = rate
+        print(f"{name:<28} {rate:>12,.0f} {rate / baseline:>7.2f}x")
+
+    if args.out:
+        Path(args.out).write_text(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""
+Measure CLI startup: import time of src.cli and wall time of short runs.
+
+Run from Logging_Labs/:
+    python benchmarks/bench_startup.py --repeats 5
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+LAB_DIR = Path(__file__).resolve().parents[1]
+SAMPLE = LAB_DIR / "examples" / "sample_dataset.csv"
+
+
+def import_times(module, env):
+    """
+    Return {module: cumulative import microseconds} from `python -X importtime`.
+    """
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    times = {}
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        times[name.strip()] = int(cumulative)
+    return times
+
+
+def best_wall_time(cmd, env, cwd, repeats):
+    """
+    Return the best wall time (seconds) of `repeats` runs of cmd.
+    """
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        subprocess.run(cmd, env=env, cwd=cwd, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--top", type=int, default=8, help="Slowest imports to list")
+    parser.add_argument("--out", help="Optional path for JSON results")
+    args = parser.parse_args()
+
+    env = {**os.environ, "PYTHONPATH": str(LAB_DIR)}
+    results = {"imports_ms": {}, "runs_ms": {}}
+
+    for module in ("src.cli", "src.data_quality", "pandas"):
+        times = import_times(module, env)
+        results["imports_ms"][module] = times[module] / 1e3
+        print(f"import {module:<18} {times[module] / 1e3:>8.1f} ms")
+    cli_times = import_times("src.cli", env)
+    slowest = sorted(cli_times.items(), key=lambda item: -item[1])[: args.top]
+    print(f"\nSlowest imports under src.cli (cumulative):")
+    for name, micros in slowest:
+        print(f"  {name:<30} {micros / 1e3:>8.1f} ms")
+
+    # Run in a scratch directory so logs/ and summaries don't land in the repo
+    with tempfile.TemporaryDirectory() as tmp:
+        runs = {
+            "python -c pass": [sys.executable, "-c", "pass"],
+            "cli --help": [sys.executable, "-m", "src.cli", "--help"],
+            "cli missing file": [sys.executable, "-m", "src.cli", "missing.csv"],
+            "cli sample dataset": [
+                sys.executable, "-m", "src.cli", str(SAMPLE), "--out", "summary.json",
+            ],
+            "cli sample dataset --workers 4": [
+                sys.executable, "-m", "src.cli", str(SAMPLE), "--out", "summary.json",
+                "--workers", "4",
+            ],
+        }
+        print(f"\n{'command':<32} {'best ms':>9}")
+        for label, cmd in runs.items():
+            seconds = best_wall_time(cmd, env, tmp, args.repeats)
+            results["runs_ms"][label] = seconds * 1e3
+            print(f"{label:<32} {seconds * 1e3:>9.1f}")
+
+    if args.out:
+        Path(args.out).write_text(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
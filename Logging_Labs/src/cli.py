@@ -1,11 +1,41 @@
 from __future__ import annotations
 
 import argparse
+import glob
 import json
+import os
 from pathlib import Path
+from typing import TYPE_CHECKING, Any, Dict, List, NoReturn
 
 from .log_setup import configure_logging
-from .data_quality import run_quality_checks
+
+# pandas/numpy (and everything that uses them) are imported inside the
+# functions that need them, so --help, argument errors and missing files
+# return without paying for those imports.
+if TYPE_CHECKING:
+    from .rules import RuleSet
+
+
+def _positive_int(value: str) -> int:
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, got {number}")
+    return number
+
+
+def _non_negative_int(value: str) -> int:
+    number = int(value)
+    if number < 0:
+        raise argparse.ArgumentTypeError(f"must not be negative, got {number}")
+    return number
+
+
+def _hll_precision(value: str) -> int:
+    number = int(value)
+    # sketch.MIN_PRECISION / MAX_PRECISION, without importing numpy
+    if not 4 <= number <= 18:
+        raise argparse.ArgumentTypeError(f"must be between 4 and 18, got {number}")
+    return number
 
 
 def parse_args() -> argparse.Namespace:
@@ -17,50 +47,148 @@ def parse_args() -> argparse.Namespace:
     )
 
     parser.add_argument(
-        "csv_path",
-        help="Path to the input CSV file",
+        "csv_paths",
+        nargs="+",
+        metavar="csv_path",
+        help=(
+            "Path to the input CSV, Parquet, Feather or Arrow file; "
+            "several files, directories (all CSV, Parquet, Feather and "
+            "Arrow files inside) or glob patterns check each file plus "
+            "an aggregate"
+        ),
     )
     parser.add_argument(
         "--out",
         dest="out_path",
         help=(
             "Optional path for the JSON summary file "
-            "(default: <csv_path>.quality_summary.json)"
+            "(default: <csv_path>.quality_summary.json). With several "
+            "input files this is the aggregate summary "
+            "(default: <common dir>/aggregate.quality_summary.json)"
+        ),
+    )
+    parser.add_argument(
+        "--chunksize",
+        type=_positive_int,
+        default=None,
+        help=(
+            "Stream the CSV in chunks of this many rows instead of "
+            "loading it whole (for files larger than memory)"
+        ),
+    )
+    parser.add_argument(
+        "--distinct",
+        choices=("exact", "hll", "none"),
+        default="exact",
+        help=(
+            "How to count unique values: exact sets, HyperLogLog "
+            "sketches with fixed memory per column, or not at all "
+            "(skips constant/high-cardinality checks)"
+        ),
+    )
+    parser.add_argument(
+        "--hll-precision",
+        type=_hll_precision,
+        default=14,
+        help=(
+            "HyperLogLog precision p (4-18): 2**p registers, "
+            "relative error about 1.04/sqrt(2**p)"
+        ),
+    )
+    parser.add_argument(
+        "--columns",
+        type=lambda value: [col.strip() for col in value.split(",") if col.strip()],
+        default=None,
+        help=(
+            "Comma-separated columns to check (columns with a rule are "
+            "always included); the others are never read"
+        ),
+    )
+    parser.add_argument(
+        "--workers",
+        type=_positive_int,
+        default=1,
+        help=(
+            "Worker processes: shards of one file, or one file per "
+            "worker when checking several files"
+        ),
+    )
+    parser.add_argument(
+        "--shard-by",
+        choices=("rows", "columns"),
+        default="rows",
+        help=(
+            "How to split a single file between workers: byte ranges "
+            "of rows, or groups of columns"
+        ),
+    )
+    parser.add_argument(
+        "--rules",
+        dest="rules_path",
+        default=None,
+        help=(
+            "YAML or JSON rules file (range, regex, in_set, not_null, "
+            "unique and expression rules) replacing the default "
+            "age range rule"
+        ),
+    )
+    parser.add_argument(
+        "--sample",
+        dest="sample_size",
+        type=_non_negative_int,
+        default=0,
+        help=(
+            "Keep a random sample of up to this many offending rows per "
+            "rule (row number and values), written next to the summary "
+            "as <summary>.samples.json"
+        ),
+    )
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help=(
+            "Treat CSV inputs as append-only: keep the profile next to the "
+            "summary (<summary>.state.json) and only parse new rows on the "
+            "next run, recomputing fully if earlier rows changed"
         ),
     )
 
     return parser.parse_args()
 
 
-def main() -> None:
+def expand_inputs(patterns: List[str]) -> List[Path]:
     """
-    Entry point for the CLI.
+    Resolve CLI inputs to data files: directories expand to the files
+    with a supported suffix (.csv and those in `data_quality.FORMATS`)
+    and glob patterns to their matches. Plain paths are kept as given,
+    even if they don't exist, so they can be reported.
     """
+    paths: List[Path] = []
+    for pattern in patterns:
+        if os.path.isdir(pattern):
+            # Only directory inputs pay for importing pandas this early
+            from .data_quality import FORMATS
 
-    # Set up logging
-    logger = configure_logging()
-
-    # Read CLI arguments
-    args = parse_args()
-    csv_path = Path(args.csv_path)
-
-    # Log the start of the run
-    logger.info(
-        "Starting dataset quality checker",
-        extra={"event": "start", "path": str(csv_path)},
-    )
+            suffixes = {".csv", *FORMATS}
+            paths.extend(
+                sorted(
+                    path
+                    for path in Path(pattern).iterdir()
+                    if path.is_file() and path.suffix.lower() in suffixes
+                )
+            )
+        elif glob.has_magic(pattern):
+            paths.extend(Path(p) for p in sorted(glob.glob(pattern)))
+        else:
+            paths.append(Path(pattern))
+    # Drop duplicates while keeping the order
+    return list(dict.fromkeys(paths))
 
-    # Basic validation
-    if not csv_path.exists():
-        logger.error(
-            "Input CSV file does not exist",
-            extra={"event": "cli_error", "path": str(csv_path)},
-        )
-        print(f"ERROR: CSV file not found: {csv_path}")
-        raise SystemExit(1)
 
-    # Run all checks on the dataset
-    summary = run_quality_checks(csv_path)
+def print_summary(summary: Dict[str, Any]) -> None:
+    """
+    Print a summary dict as the human-readable console report.
+    """
     print("\n=== Dataset Quality Summary ===")
     print(f"Path: {summary['path']}")
     print(f"Rows: {summary['n_rows']}, Columns: {summary['n_cols']}")
@@ -95,6 +223,14 @@ def main() -> None:
     else:
         print("  (none)")
 
+    if "distinct_counting" in summary:
+        info = summary["distinct_counting"]
+        print(
+            f"\nUnique counts are HyperLogLog estimates "
+            f"(precision={info['precision']}, "
+            f"relative error ~{info['relative_error']:.2%})"
+        )
+
     # Out-of-range values section
     print("\nRange issues (columns checked against rules):")
     if summary["range_issues"]:
@@ -109,12 +245,31 @@ def main() -> None:
     else:
         print("  (none)")
 
-    out_path = (
-        Path(args.out_path)
-        if args.out_path
-        else csv_path.with_suffix(".quality_summary.json")
-    )
+    if "rule_results" in summary:
+        print("\nRule results (violations / rows checked):")
+        for name, result in summary["rule_results"].items():
+            if result["checked"] is None:
+                outcome = "not evaluated (columns missing)"
+            else:
+                outcome = f"{result['violations']} / {result['checked']}"
+            print(
+                f"  - {name} ({result['type']}: {', '.join(result['columns'])}): "
+                f"{outcome}, {result['seconds'] * 1000:.1f} ms"
+            )
+
 
+def samples_path_for(summary_path: Path) -> Path:
+    """
+    Side file for offending row samples:
+    `data.quality_summary.json` -> `data.quality_summary.samples.json`.
+    """
+    return summary_path.with_suffix(".samples.json")
+
+
+def write_summary(summary: Dict[str, Any], out_path: Path, logger: Any) -> None:
+    """
+    Write a summary dict as pretty JSON and log where it went.
+    """
     # Make sure the output directory exists
     out_path.parent.mkdir(parents=True, exist_ok=True)
 
@@ -130,7 +285,194 @@ def main() -> None:
         },
     )
 
+
+def check_many(
+    csv_paths: List[Path], args: argparse.Namespace, rule_set: RuleSet, logger: Any
+) -> None:
+    """
+    Check several files, write one summary next to each, then write an
+    aggregate summary of all rows of all files.
+    """
+    from .data_quality import (
+        TINY_FILE_BYTES,
+        profile_dataset,
+        summarize_profile,
+        write_offending_samples,
+    )
+    from .incremental import state_path_for
+    from .parallel import profile_files
+    from .profiler import DatasetProfile
+
+    options = {
+        "rule_set": rule_set,
+        "distinct": args.distinct,
+        "hll_precision": args.hll_precision,
+        "sample_size": args.sample_size,
+    }
+    state_paths = [
+        state_path_for(path.with_suffix(".quality_summary.json"))
+        if args.incremental
+        else None
+        for path in csv_paths
+    ]
+    # A pool of fresh interpreters costs more than it saves on tiny batches
+    total_bytes = sum(path.stat().st_size for path in csv_paths)
+    if args.workers > 1 and total_bytes >= TINY_FILE_BYTES:
+        profiles = profile_files(
+            csv_paths,
+            args.workers,
+            chunksize=args.chunksize,
+            columns=args.columns,
+            state_paths=state_paths,
+            **options,
+        )
+    else:
+        profiles = [
+            profile_dataset(
+                path,
+                chunksize=args.chunksize,
+                columns=args.columns,
+                state_path=state_path,
+                **options,
+            )
+            for path, state_path in zip(csv_paths, state_paths)
+        ]
+
+    print("\n=== Per-file results ===")
+    files = []
+    for path, profile in zip(csv_paths, profiles):
+        summary = summarize_profile(profile, path)
+        out_path = path.with_suffix(".quality_summary.json")
+        write_summary(summary, out_path, logger)
+        if args.sample_size:
+            write_offending_samples(profile, samples_path_for(out_path))
+        issues = sum(
+            1 for info in summary["range_issues"].values() if info["out_of_range_count"]
+        )
+        print(
+            f"  - {path}: rows={summary['n_rows']}, "
+            f"missing={sum(summary['missing_values'].values())}, "
+            f"constant={len(summary['constant_columns'])}, "
+            f"range_issues={issues} -> {out_path}"
+        )
+        files.append(
+            {"path": str(path), "n_rows": summary["n_rows"], "summary_path": str(out_path)}
+        )
+
+    # Per-file summaries are done, so the profiles can be merged in place
+    aggregate = DatasetProfile(**options)
+    for profile in profiles:
+        aggregate.merge(profile)
+
+    common_dir = Path(os.path.commonpath([str(p.resolve().parent) for p in csv_paths]))
+    summary = summarize_profile(aggregate, common_dir)
+    summary["files"] = files
+    print_summary(summary)
+
+    out_path = (
+        Path(args.out_path)
+        if args.out_path
+        else common_dir / "aggregate.quality_summary.json"
+    )
+    write_summary(summary, out_path, logger)
+    print(f"\nAggregate summary written to: {out_path}")
+
+
+def rule_failed(error: Exception, args: argparse.Namespace, logger: Any) -> NoReturn:
+    """
+    Report a rule that could not be evaluated on the data and exit.
+    """
+    logger.error(
+        "Rule evaluation failed",
+        extra={"event": "cli_error", "path": str(args.rules_path), "error": str(error)},
+    )
+    print(f"ERROR: {error}")
+    raise SystemExit(1)
+
+
+def main() -> None:
+    """
+    Entry point for the CLI.
+    """
+
+    # Read CLI arguments first, so --help and usage errors stay instant
+    args = parse_args()
+
+    # Set up logging
+    logger = configure_logging()
+
+    csv_paths = expand_inputs(args.csv_paths)
+    multi = len(csv_paths) != 1 or csv_paths[0] != Path(args.csv_paths[0])
+
+    # Log the start of the run
+    logger.info(
+        "Starting dataset quality checker",
+        extra={"event": "start", "path": ", ".join(str(p) for p in csv_paths)},
+    )
+
+    # Basic validation
+    missing = [p for p in csv_paths if not p.exists()]
+    if missing or not csv_paths:
+        for csv_path in missing or args.csv_paths:
+            logger.error(
+                "Input CSV file does not exist",
+                extra={"event": "cli_error", "path": str(csv_path)},
+            )
+            print(f"ERROR: CSV file not found: {csv_path}")
+        raise SystemExit(1)
+
+    from .rules import RuleError, RuleSet, default_rule_set
+
+    try:
+        rule_set = RuleSet.from_file(args.rules_path) if args.rules_path else default_rule_set()
+    except (OSError, ImportError, RuleError) as e:
+        logger.error(
+            "Invalid rules file",
+            extra={"event": "cli_error", "path": str(args.rules_path), "error": str(e)},
+        )
+        print(f"ERROR: invalid rules file {args.rules_path}: {e}")
+        raise SystemExit(1)
+
+    if multi:
+        try:
+            check_many(csv_paths, args, rule_set, logger)
+        except RuleError as e:
+            rule_failed(e, args, logger)
+        return
+
+    from .data_quality import run_quality_checks
+    from .incremental import state_path_for
+
+    # Run all checks on the dataset
+    csv_path = csv_paths[0]
+    out_path = (
+        Path(args.out_path)
+        if args.out_path
+        else csv_path.with_suffix(".quality_summary.json")
+    )
+    try:
+        summary = run_quality_checks(
+            csv_path,
+            chunksize=args.chunksize,
+            distinct=args.distinct,
+            hll_precision=args.hll_precision,
+            workers=args.workers,
+            shard_by=args.shard_by,
+            columns=args.columns,
+            state_path=state_path_for(out_path) if args.incremental else None,
+            rule_set=rule_set,
+            sample_size=args.sample_size,
+            samples_path=samples_path_for(out_path),
+        )
+    except RuleError as e:
+        rule_failed(e, args, logger)
+    print_summary(summary)
+
+    write_summary(summary, out_path, logger)
+
     print(f"\nSummary written to: {out_path}")
+    if args.sample_size:
+        print(f"Offending row samples written to: {samples_path_for(out_path)}")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,161 @@
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import urllib.error
+import urllib.parse
+import urllib.request
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+DEFAULT_SERVER = "http://127.0.0.1:8765"
+
+
+def _request(url: str, data: Optional[bytes] = None, content_type: str = "application/json") -> Dict[str, Any]:
+    request = urllib.request.Request(url, data=data)
+    if data is not None:
+        request.add_header("Content-Type", content_type)
+    try:
+        with urllib.request.urlopen(request) as response:
+            return json.loads(response.read())
+    except urllib.error.HTTPError as e:
+        # The server answers errors with {"error": ...}
+        try:
+            message = json.loads(e.read())["error"]
+        except (ValueError, KeyError):
+            message = e.reason
+        raise RuntimeError(f"server returned {e.code}: {message}") from e
+
+
+def load_rules(path: str | Path) -> Dict[str, Any]:
+    """
+    Read a rules file as plain data; the server validates it. Parsing here
+    keeps the client free of pandas (YAML needs PyYAML).
+    """
+    path = Path(path)
+    text = path.read_text(encoding="utf-8")
+    if path.suffix.lower() in (".yaml", ".yml"):
+        import yaml
+
+        return yaml.safe_load(text)
+    return json.loads(text)
+
+
+def submit(
+    path: str | Path,
+    server: str = DEFAULT_SERVER,
+    upload: bool = False,
+    rules_path: Optional[str | Path] = None,
+    **options: Any,
+) -> Dict[str, Any]:
+    """
+    Check a file on a running quality server (`python -m src.server`).
+
+    By default the server reads `path` itself, so it must be visible to
+    the server; `upload=True` sends the file's bytes instead. `options`
+    are job options (chunksize, distinct, hll_precision, columns,
+    sample_size). A rules file is read here and sent with the job.
+    Returns the server's response: job id, timings and summary.
+    """
+    options = {key: value for key, value in options.items() if value is not None}
+    if rules_path is not None:
+        options["rules"] = load_rules(rules_path)
+    if not upload:
+        body = json.dumps({"path": str(Path(path).resolve()), **options}).encode("utf-8")
+        return _request(f"{server}/check", body)
+
+    query = {"filename": Path(path).name}
+    for key, value in options.items():
+        if key == "rules":
+            query[key] = json.dumps(value)
+        elif isinstance(value, list):
+            query[key] = ",".join(value)
+        else:
+            query[key] = str(value)
+    url = f"{server}/check?{urllib.parse.urlencode(query)}"
+    return _request(url, Path(path).read_bytes(), content_type="application/octet-stream")
+
+
+def status(server: str = DEFAULT_SERVER) -> Dict[str, Any]:
+    """
+    Queue depth, counters and recent job timings of a quality server.
+    """
+    return _request(f"{server}/status")
+
+
+def parse_args() -> argparse.Namespace:
+    """
+    Define and parse command-line arguments.
+    """
+    parser = argparse.ArgumentParser(
+        description="Submit dataset quality checks to a running quality server"
+    )
+    parser.add_argument("csv_path", nargs="?", help="File to check (omit with --status)")
+    parser.add_argument("--server", default=DEFAULT_SERVER, help=f"Server URL (default: {DEFAULT_SERVER})")
+    parser.add_argument("--status", action="store_true", help="Print the server's queue status")
+    parser.add_argument(
+        "--upload",
+        action="store_true",
+        help="Send the file's contents instead of its path",
+    )
+    parser.add_argument("--out", dest="out_path", help="Write the summary JSON here")
+    parser.add_argument("--chunksize", type=int)
+    parser.add_argument("--distinct", choices=("exact", "hll", "none"))
+    parser.add_argument("--hll-precision", type=int)
+    parser.add_argument(
+        "--columns",
+        type=lambda value: [col.strip() for col in value.split(",") if col.strip()],
+    )
+    parser.add_argument("--rules", dest="rules_path", help="YAML or JSON rules file")
+    parser.add_argument("--sample", dest="sample_size", type=int)
+    args = parser.parse_args()
+    if not args.status and args.csv_path is None:
+        parser.error("a csv_path is required unless --status is given")
+    return args
+
+
+def main() -> None:
+    """
+    Entry point for the client CLI.
+    """
+    args = parse_args()
+    try:
+        if args.status:
+            print(json.dumps(status(args.server), indent=2))
+            return
+        result = submit(
+            args.csv_path,
+            server=args.server,
+            upload=args.upload,
+            rules_path=args.rules_path,
+            chunksize=args.chunksize,
+            distinct=args.distinct,
+            hll_precision=args.hll_precision,
+            columns=args.columns,
+            sample_size=args.sample_size,
+        )
+    except (OSError, RuntimeError, ValueError) as e:
+        # URLError (server not running) is an OSError
+        print(f"ERROR: {e}", file=sys.stderr)
+        raise SystemExit(1)
+
+    timings = result["timings"]
+    print(
+        f"job {result['job_id']}: {result['path']} "
+        f"(queued {timings['queued_seconds'] * 1000:.0f} ms, "
+        f"ran {timings['run_seconds'] * 1000:.0f} ms)",
+        file=sys.stderr,
+    )
+    output = json.dumps(result["summary"], indent=2)
+    if args.out_path:
+        Path(args.out_path).write_text(output, encoding="utf-8")
+        if "offending_samples" in result:
+            samples_path = Path(args.out_path).with_suffix(".samples.json")
+            samples_path.write_text(json.dumps(result["offending_samples"], indent=2), encoding="utf-8")
+    else:
+        print(output)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,17 +1,254 @@
 from __future__ import annotations
 
+import json
 import logging
+import math
+import os
+from contextlib import closing
 from pathlib import Path
-from typing import Dict, Any, List, Tuple
+from typing import Dict, Any, Iterable, Iterator, List, Optional, Tuple
 
+import numpy as np
 import pandas as pd
 
+from .profiler import DatasetProfile
+from .rules import RuleSet, default_rule_set
+
 logger = logging.getLogger("dq_logger")
 
+# Files smaller than this are read whole in this process: for them,
+# worker pools and chunked reads cost more in startup than they save
+TINY_FILE_BYTES = 1 << 20
+
+# File suffix -> reader; anything else is read as CSV
+FORMATS: Dict[str, str] = {
+    ".parquet": "parquet",
+    ".pq": "parquet",
+    ".feather": "feather",
+    ".arrow": "arrow",
+    ".ipc": "arrow",
+}
+
+
+def dataset_format(path: str | Path) -> str:
+    """
+    Format of a dataset file from its suffix: parquet, feather, arrow or csv.
+    """
+    return FORMATS.get(Path(path).suffix.lower(), "csv")
+
+
+def _require_pyarrow() -> None:
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError as e:
+        raise ImportError(
+            "Reading Parquet, Feather or Arrow files requires pyarrow "
+            "(pip install pyarrow)"
+        ) from e
+
+
+def _arrow_table(path: str | Path, fmt: str, columns: Optional[List[str]]) -> Any:
+    """
+    Memory-mapped Arrow table of a Feather or Arrow IPC file. Columns that
+    aren't selected are never touched.
+    """
+    import pyarrow as pa
+    import pyarrow.feather as feather
+    import pyarrow.ipc as ipc
+
+    if fmt == "feather":
+        return feather.read_table(str(path), columns=columns, memory_map=True)
+
+    source = pa.memory_map(str(path), "r")
+    try:
+        table = ipc.open_file(source).read_all()
+    except pa.ArrowInvalid:
+        # Not the IPC file format; try the streaming format
+        source.seek(0)
+        table = ipc.open_stream(source).read_all()
+    return table if columns is None else table.select(columns)
+
+
+def dataset_columns(path: str | Path) -> List[str]:
+    """
+    Column names of a dataset, read from the header or schema only.
+    """
+    fmt = dataset_format(path)
+    if fmt == "csv":
+        return pd.read_csv(path, nrows=0).columns.tolist()
+    _require_pyarrow()
+    if fmt == "parquet":
+        import pyarrow.parquet as pq
+
+        schema = pq.read_schema(str(path))
+        # A stored pandas index becomes the index again, not a column
+        index_columns = (schema.pandas_metadata or {}).get("index_columns", [])
+        return [name for name in schema.names if name not in index_columns]
+    return _arrow_table(path, fmt, None).column_names
+
+
+def project_columns(
+    path: str | Path,
+    columns: Optional[List[str]],
+    rule_columns: Iterable[str],
+) -> Optional[List[str]]:
+    """
+    Columns to materialize: the requested ones plus those with a rule, in
+    file order. None (the default) means all columns.
+    """
+    if columns is None:
+        return None
+    available = dataset_columns(path)
+    unknown = [col for col in columns if col not in available]
+    if unknown:
+        raise ValueError(f"columns not found in {path}: {', '.join(unknown)}")
+    wanted = set(columns) | set(rule_columns)
+    return [col for col in available if col in wanted]
+
+
+def read_frames(
+    path: str | Path,
+    chunksize: Optional[int] = None,
+    columns: Optional[List[str]] = None,
+) -> Any:
+    """
+    Read a CSV, Parquet, Feather or Arrow IPC file without logging.
+
+    Returns one DataFrame, or with `chunksize` an iterator of DataFrames of
+    at most that many rows. Only `columns` are materialized if given.
+    Parquet and Arrow files are memory-mapped.
+    """
+    fmt = dataset_format(path)
+    if fmt == "csv":
+        return pd.read_csv(path, usecols=columns, chunksize=chunksize)
+
+    _require_pyarrow()
+    if fmt == "parquet":
+        import pyarrow.parquet as pq
+
+        if chunksize:
+            parquet_file = pq.ParquetFile(str(path), memory_map=True)
+            return (
+                batch.to_pandas()
+                for batch in parquet_file.iter_batches(batch_size=chunksize, columns=columns)
+            )
+        return pq.read_table(str(path), columns=columns, memory_map=True).to_pandas()
+
+    table = _arrow_table(path, fmt, columns)
+    if chunksize:
+        return (batch.to_pandas() for batch in table.to_batches(max_chunksize=chunksize))
+    return table.to_pandas()
+
+
+def parquet_statistics_profile(
+    path: str | Path,
+    columns: Optional[List[str]],
+    profile: DatasetProfile,
+) -> List[str]:
+    """
+    Profile Parquet columns from their row-group statistics alone.
+
+    A column qualifies if it is an integer column and, in every row group,
+    the statistics have null counts and min/max, all values fall on one
+    side of 0 and of each rule bound (so negatives and out-of-range counts
+    are 0 or all values), and the group is constant unless distinct
+    counting is off. Float columns are always read, since Parquet
+    statistics ignore NaN while pandas counts it as missing, and so are
+    columns used by non-range rules.
+
+    Qualifying columns are added to `profile` (whose `n_rows` is set to the
+    file's row count) without reading any data pages. Returns the columns
+    that still have to be read.
+    """
+    import pyarrow.parquet as pq
+    import pyarrow.types as pa_types
+
+    parquet_file = pq.ParquetFile(str(path), memory_map=True)
+    metadata = parquet_file.metadata
+    schema = parquet_file.schema_arrow
+    columns = dataset_columns(path) if columns is None else columns
+    leaf_index = {metadata.schema.column(i).path: i for i in range(metadata.num_columns)}
+
+    remaining: List[str] = []
+    answered: Dict[str, List[Tuple[Any, ...]]] = {}
+    for col in columns:
+        field_type = schema.field(col).type
+        if (
+            col not in leaf_index
+            or not pa_types.is_integer(field_type)
+            or col in profile.check_columns
+            # Sampling offending rows needs the rows themselves
+            or (profile.sample_size and col in profile.range_checks)
+        ):
+            remaining.append(col)
+            continue
+        dtype = np.dtype(field_type.to_pandas_dtype())
+        check = profile.range_checks.get(col)
+
+        groups: List[Tuple[Any, ...]] = []
+        for rg in range(metadata.num_row_groups):
+            row_group = metadata.row_group(rg)
+            stats = row_group.column(leaf_index[col]).statistics
+            if stats is None or not stats.has_null_count:
+                break
+            n_rows = row_group.num_rows
+            missing = stats.null_count
+            present = n_rows - missing
+            if present == 0:
+                groups.append((np.dtype(np.float64), n_rows, missing, None, None, 0, 0))
+                continue
+            if not stats.has_min_max:
+                break
+            lo, hi = float(stats.min), float(stats.max)
+            if profile.distinct != "none" and lo != hi:
+                break
+
+            if lo >= 0:
+                negatives = 0
+            elif hi < 0:
+                negatives = present
+            else:
+                break
+
+            out_of_range = 0
+            if check is not None:
+                if check.min_allowed <= lo and hi <= check.max_allowed:
+                    out_of_range = 0
+                elif hi < check.min_allowed or lo > check.max_allowed:
+                    out_of_range = present
+                else:
+                    break
+
+            # pandas turns integer columns with nulls into float64
+            group_dtype = np.dtype(np.float64) if missing else dtype
+            groups.append((group_dtype, n_rows, missing, lo, hi, negatives, out_of_range))
+        else:
+            answered[col] = groups
+            continue
+        remaining.append(col)
+
+    profile.n_rows = metadata.num_rows
+    for col, groups in answered.items():
+        for group in groups:
+            profile.update_statistics(col, *group)
+
+    if answered:
+        logger.info(
+            "Columns profiled from Parquet statistics",
+            extra={
+                "event": "parquet_statistics",
+                "path": str(path),
+                "columns": list(answered),
+                "n_read": len(remaining),
+            },
+        )
+    return remaining
+
 
-def load_dataset(path: str | Path) -> pd.DataFrame:
+def load_dataset(path: str | Path, columns: Optional[List[str]] = None) -> pd.DataFrame:
     """
-    Load a CSV file into a pandas DataFrame and log the result.
+    Load a CSV, Parquet, Feather or Arrow IPC file into a pandas DataFrame
+    and log the result. Only `columns` are read if given.
 
     Logs:
       - load_start: before reading
@@ -26,7 +263,7 @@ def load_dataset(path: str | Path) -> pd.DataFrame:
     )
 
     try:
-        df = pd.read_csv(path)
+        df = read_frames(path, columns=columns)
     except FileNotFoundError:
         logger.exception(
             "Dataset file not found",
@@ -53,6 +290,58 @@ def load_dataset(path: str | Path) -> pd.DataFrame:
     return df
 
 
+def iter_dataset_chunks(
+    path: str | Path, chunksize: int, columns: Optional[List[str]] = None
+) -> Iterator[pd.DataFrame]:
+    """
+    Read a dataset in chunks of `chunksize` rows and log the result.
+
+    Only one chunk is held in memory at a time. Logs the same
+    load_start / load_failed / load_done events as `load_dataset`;
+    load_done also reports the number of chunks read.
+    """
+    path = Path(path)
+
+    logger.info(
+        "Loading dataset in chunks",
+        extra={"event": "load_start", "path": str(path), "chunksize": chunksize},
+    )
+
+    n_rows = 0
+    n_cols = 0
+    n_chunks = 0
+    try:
+        with closing(read_frames(path, chunksize=chunksize, columns=columns)) as reader:
+            for chunk in reader:
+                n_rows += int(chunk.shape[0])
+                n_cols = int(chunk.shape[1])
+                n_chunks += 1
+                yield chunk
+    except FileNotFoundError:
+        logger.exception(
+            "Dataset file not found",
+            extra={"event": "load_failed", "path": str(path)},
+        )
+        raise
+    except Exception:
+        logger.exception(
+            "Unexpected error while loading dataset",
+            extra={"event": "load_failed", "path": str(path)},
+        )
+        raise
+
+    logger.info(
+        "Dataset loaded",
+        extra={
+            "event": "load_done",
+            "path": str(path),
+            "n_rows": n_rows,
+            "n_cols": n_cols,
+            "n_chunks": n_chunks,
+        },
+    )
+
+
 def analyze_missing_values(df: pd.DataFrame) -> Dict[str, int]:
     """
     Count missing values per column and log a warning for any column
@@ -239,21 +528,244 @@ def check_value_ranges(
     return issues
 
 
-def run_quality_checks(path: str | Path) -> Dict[str, Any]:
+def log_findings(summary: Dict[str, Any], threshold: int) -> None:
     """
-    Main entry point for the dataset quality checker.
+    Emit the same warnings and column summaries as the individual
+    analyze_* / check_* functions, from an already computed summary.
+    """
+    for col, count in summary["missing_values"].items():
+        if count > 0:
+            logger.warning(
+                "Missing values detected",
+                extra={
+                    "event": "missing_values",
+                    "column": col,
+                    "missing_count": int(count),
+                },
+            )
+
+    for col, stats in summary["numeric_ranges"].items():
+        if stats["negative_count"] > 0:
+            logger.warning(
+                "Negative values found in numeric column",
+                extra={
+                    "event": "negative_values",
+                    "column": col,
+                    "negative_count": stats["negative_count"],
+                },
+            )
+
+    for col, info in summary["schema"].items():
+        logger.info(
+            "Column summary",
+            extra={
+                "event": "column_summary",
+                "column": col,
+                "dtype": info["dtype"],
+                "unique_values": info["unique_values"],
+            },
+        )
+
+    for col in summary["constant_columns"]:
+        logger.warning(
+            "Constant column detected",
+            extra={
+                "event": "constant_column",
+                "column": col,
+            },
+        )
+
+    for col, unique_count in summary["high_cardinality_columns"].items():
+        logger.warning(
+            "High-cardinality categorical column detected",
+            extra={
+                "event": "high_cardinality",
+                "column": col,
+                "unique_values": unique_count,
+                "threshold": threshold,
+            },
+        )
+
+    for col, info in summary["range_issues"].items():
+        if info["out_of_range_count"] > 0:
+            logger.warning(
+                "Out-of-range values detected",
+                extra={
+                    "event": "out_of_range",
+                    "column": col,
+                    **info,
+                },
+            )
+
+    # Range rules are already reported as out_of_range above
+    for name, result in summary.get("rule_results", {}).items():
+        if result["type"] != "range" and result["violations"]:
+            logger.warning(
+                "Rule violations detected",
+                extra={
+                    "event": "rule_violation",
+                    "rule": name,
+                    "rule_type": result["type"],
+                    "columns": result["columns"],
+                    "violations": result["violations"],
+                },
+            )
+
+
+def profile_dataset(
+    path: str | Path,
+    chunksize: Optional[int] = None,
+    rules: Optional[Dict[str, Tuple[float, float]]] = None,
+    distinct: str = "exact",
+    hll_precision: int = 14,
+    workers: int = 1,
+    shard_by: str = "rows",
+    columns: Optional[List[str]] = None,
+    state_path: Optional[str | Path] = None,
+    rule_set: Optional[RuleSet] = None,
+    sample_size: int = 0,
+) -> DatasetProfile:
+    """
+    Profile a dataset file, either all at once or chunk by chunk.
+
+    Rules come from `rule_set` (see `rules.RuleSet`) and/or a plain
+    `rules` dict of column -> (min_allowed, max_allowed); with neither,
+    `rules.default_rule_set()` is used.
+
+    With `chunksize`, each chunk is profiled on its own and merged into
+    the running profile, so peak memory depends on the chunk size rather
+    than the file size (plus the distinct values kept per column, unless
+    `distinct="hll"` is used).
+
+    With `workers > 1` a CSV file is split into row or column shards
+    (`shard_by`) that are profiled in a process pool and merged
+    (see `parallel.profile_parallel`).
 
-    The returned dict is easy to print or save as JSON.
+    `columns` limits the run to those columns plus any with a rule. For
+    Parquet files, columns that row-group statistics fully describe are
+    profiled without reading their data (see `parquet_statistics_profile`).
+
+    With `state_path`, a CSV file is treated as append-only: the profile is
+    saved there and the next run only parses rows appended since
+    (see `incremental.profile_incremental`).
+
+    `sample_size` > 0 keeps a bounded random sample of offending rows per
+    rule (see `DatasetProfile.offending_samples`).
+
+    Files under TINY_FILE_BYTES ignore `workers` and `chunksize`.
+    """
+    if rules is None and rule_set is None:
+        rule_set = default_rule_set()
+    rules = rules or {}
+    fmt = dataset_format(path)
+    if (workers > 1 or chunksize) and os.path.getsize(path) < TINY_FILE_BYTES:
+        logger.debug(
+            "Tiny file, reading it whole in this process",
+            extra={"event": "tiny_file", "path": str(path)},
+        )
+        workers, chunksize = 1, None
+    rule_columns = set(rules) | (rule_set.columns if rule_set is not None else set())
+    projection = project_columns(path, columns, rule_columns)
+    options: Dict[str, Any] = {
+        "rules": rules,
+        "distinct": distinct,
+        "hll_precision": hll_precision,
+        "rule_set": rule_set,
+        "sample_size": sample_size,
+    }
+    if state_path is not None and fmt == "csv":
+        from .incremental import profile_incremental
+
+        profile, _ = profile_incremental(
+            path,
+            state_path,
+            chunksize=chunksize,
+            columns=projection,
+            workers=workers,
+            **options,
+        )
+        return profile
+    if workers > 1 and fmt == "csv":
+        from .parallel import profile_parallel
+
+        return profile_parallel(
+            path,
+            workers,
+            shard_by=shard_by,
+            chunksize=chunksize,
+            columns=projection,
+            **options,
+        )
+
+    def new_profile() -> DatasetProfile:
+        return DatasetProfile(**options)
+
+    stats_profile = None
+    order = projection
+    if fmt == "parquet":
+        _require_pyarrow()
+        stats_profile = new_profile()
+        order = projection or dataset_columns(path)
+        projection = parquet_statistics_profile(path, projection, stats_profile)
+        if not stats_profile.columns:
+            stats_profile = None
+        elif not projection:
+            return stats_profile
+
+    if not chunksize:
+        profile = new_profile().update(load_dataset(path, columns=projection))
+    else:
+        profile = new_profile()
+        for chunk in iter_dataset_chunks(path, chunksize, columns=projection):
+            profile.merge(new_profile().update(chunk))
+
+    if stats_profile is not None:
+        profile.join(stats_profile).reorder(order)
+    return profile
+
+
+def _json_value(value: Any) -> Any:
+    # NaN isn't valid JSON; numpy scalars are already Python values here
+    if isinstance(value, float) and math.isnan(value):
+        return None
+    return value
+
+
+def write_offending_samples(profile: DatasetProfile, out_path: str | Path) -> None:
+    """
+    Write the sampled offending rows of each rule to a JSON side file,
+    keeping them out of the summary itself.
     """
-    df = load_dataset(path)
+    samples = profile.offending_samples()
+    for info in samples.values():
+        for row in info["rows"]:
+            row["values"] = {col: _json_value(v) for col, v in row["values"].items()}
 
-    # Core checks
-    missing_summary = analyze_missing_values(df)
-    numeric_summary = analyze_numeric_ranges(df)
-    schema_summary = basic_schema_summary(df)
-    constant_cols = analyze_constant_columns(df)
-    high_card_cols = analyze_high_cardinality_categoricals(df, threshold=5)
-    range_issues = check_value_ranges(df, rules={"age": (0, 120)})
+    out_path = Path(out_path)
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(out_path, "w", encoding="utf-8") as f:
+        # default=str covers timestamps and other non-JSON types from Arrow files
+        json.dump(samples, f, indent=2, default=str)
+
+    logger.info(
+        "Offending row samples written",
+        extra={
+            "event": "samples_written",
+            "output_path": str(out_path),
+            "n_rules": len(samples),
+            "n_samples": sum(len(info["rows"]) for info in samples.values()),
+        },
+    )
+
+
+def summarize_profile(profile: DatasetProfile, path: str | Path) -> Dict[str, Any]:
+    """
+    Turn a finished profile into the summary dict and log its findings.
+    """
+    rule_set = profile.rule_set or default_rule_set()
+    threshold = rule_set.high_cardinality_threshold
+    summary = profile.summary(str(path), high_cardinality_threshold=threshold)
+    log_findings(summary, threshold)
 
     logger.info(
         "Quality checks completed",
@@ -263,14 +775,57 @@ def run_quality_checks(path: str | Path) -> Dict[str, Any]:
         },
     )
 
-    return {
-        "path": str(path),
-        "n_rows": int(df.shape[0]),
-        "n_cols": int(df.shape[1]),
-        "missing_values": missing_summary,
-        "numeric_ranges": numeric_summary,
-        "schema": schema_summary,
-        "constant_columns": constant_cols,
-        "high_cardinality_columns": high_card_cols,
-        "range_issues": range_issues,
-    }
+    return summary
+
+
+def run_quality_checks(
+    path: str | Path,
+    chunksize: Optional[int] = None,
+    distinct: str = "exact",
+    hll_precision: int = 14,
+    workers: int = 1,
+    shard_by: str = "rows",
+    columns: Optional[List[str]] = None,
+    state_path: Optional[str | Path] = None,
+    rule_set: Optional[RuleSet] = None,
+    sample_size: int = 0,
+    samples_path: Optional[str | Path] = None,
+) -> Dict[str, Any]:
+    """
+    Main entry point for the dataset quality checker.
+
+    Profiles the file in one fused pass (see `profiler.DatasetProfile`)
+    and returns the summary as a dict that is easy to print or save as
+    JSON. Streaming and parallel runs produce the same summary.
+
+    Args:
+      - path: CSV, Parquet, Feather or Arrow IPC file
+      - chunksize: stream the file in chunks of this many rows
+      - distinct: "exact" unique counts, "hll" HyperLogLog estimates (the
+        summary gains a "distinct_counting" entry with their error bound)
+        or "none" (skips the checks that need them)
+      - hll_precision: HyperLogLog precision, 2**p registers per column
+      - workers / shard_by: profile row or column shards in parallel
+      - columns: only check these columns (plus any with a rule)
+      - state_path: incremental state for append-only CSV files
+      - rule_set: rules replacing the default age range rule, e.g.
+        `RuleSet.from_file("rules.yaml")`; reported under "rule_results"
+      - sample_size / samples_path: sample up to this many offending rows
+        per rule during the scan and write them to `samples_path`
+    """
+    profile = profile_dataset(
+        path,
+        chunksize=chunksize,
+        distinct=distinct,
+        hll_precision=hll_precision,
+        workers=workers,
+        shard_by=shard_by,
+        columns=columns,
+        state_path=state_path,
+        rule_set=rule_set,
+        sample_size=sample_size,
+    )
+    summary = summarize_profile(profile, path)
+    if sample_size and samples_path is not None:
+        write_offending_samples(profile, samples_path)
+    return summary
@@ -0,0 +1,252 @@
+from __future__ import annotations
+
+import base64
+import hashlib
+import json
+import logging
+import os
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .parallel import profile_byte_range, profile_parallel
+from .profiler import DatasetProfile
+
+logger = logging.getLogger("dq_logger")
+
+STATE_VERSION = 2
+# Bytes hashed at the start and at the end of the already profiled prefix
+FINGERPRINT_WINDOW = 1 << 20
+
+
+def state_path_for(summary_path: str | Path) -> Path:
+    """
+    Where the incremental state for a summary file lives:
+    `data.quality_summary.json` -> `data.quality_summary.state.json`.
+    """
+    return Path(summary_path).with_suffix(".state.json")
+
+
+def _header_end(path: str | Path) -> int:
+    with open(path, "rb") as f:
+        f.readline()
+        return f.tell()
+
+
+def complete_lines_end(path: str | Path, start: int = 0) -> int:
+    """
+    Offset just past the last newline in the file (at least `start`).
+
+    A last line without a newline may still be being written, so it is
+    left for the next run.
+    """
+    size = os.path.getsize(path)
+    with open(path, "rb") as f:
+        pos = size
+        while pos > start:
+            step = min(1 << 16, pos - start)
+            f.seek(pos - step)
+            block = f.read(step)
+            i = block.rfind(b"\n")
+            if i >= 0:
+                return pos - step + i + 1
+            pos -= step
+    return start
+
+
+def fingerprint(path: str | Path, end: int) -> Dict[str, Any]:
+    """
+    Identify the first `end` bytes of a file by their length and the hashes
+    of their first and last FINGERPRINT_WINDOW bytes. Cheap to recompute,
+    and catches rewrites of the header, of the start of the file and of
+    the rows just before the tail.
+    """
+    with open(path, "rb") as f:
+        head = f.read(min(end, FINGERPRINT_WINDOW))
+        f.seek(max(0, end - FINGERPRINT_WINDOW))
+        tail = f.read(end - max(0, end - FINGERPRINT_WINDOW))
+    return {
+        "size": end,
+        "head_sha256": hashlib.sha256(head).hexdigest(),
+        "tail_sha256": hashlib.sha256(tail).hexdigest(),
+    }
+
+
+def _encode(value: Any) -> Any:
+    """
+    JSON fallback for numpy values. Numeric arrays are stored as base64 of
+    their raw bytes, so floats and HyperLogLog registers round-trip exactly.
+    """
+    if isinstance(value, np.ndarray):
+        if value.dtype == object:
+            return {"__ndarray__": "object", "items": value.tolist()}
+        return {
+            "__ndarray__": value.dtype.str,
+            "data": base64.b64encode(np.ascontiguousarray(value).tobytes()).decode("ascii"),
+        }
+    if isinstance(value, np.generic):
+        return value.item()
+    raise TypeError(f"cannot save {type(value).__name__} in incremental state")
+
+
+def _decode(obj: Dict[str, Any]) -> Any:
+    dtype = obj.get("__ndarray__")
+    if dtype is None:
+        return obj
+    if dtype == "object":
+        values = np.empty(len(obj["items"]), dtype=object)
+        values[:] = obj["items"]
+        return values
+    return np.frombuffer(base64.b64decode(obj["data"]), dtype=np.dtype(dtype)).copy()
+
+
+def _options_state(columns: Optional[List[str]], options: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    The profiling options as they are saved in (and compared with) the
+    state file: rule sets by their specs, tuples as lists.
+    """
+    options = dict(options)
+    rule_set = options.get("rule_set")
+    if rule_set is not None:
+        options["rule_set"] = {
+            "specs": rule_set.specs,
+            "high_cardinality_threshold": rule_set.high_cardinality_threshold,
+        }
+    return json.loads(json.dumps({"columns": columns, **options}))
+
+
+def load_state(state_path: str | Path) -> Optional[Dict[str, Any]]:
+    """
+    Read a state file written by `save_state`; None if missing or unreadable.
+    """
+    try:
+        with open(state_path, encoding="utf-8") as f:
+            state = json.load(f, object_hook=_decode)
+    except FileNotFoundError:
+        return None
+    except Exception:
+        logger.warning(
+            "Ignoring unreadable incremental state",
+            extra={"event": "incremental_state_invalid", "path": str(state_path)},
+        )
+        return None
+    if not isinstance(state, dict) or state.get("version") != STATE_VERSION:
+        return None
+    return state
+
+
+def save_state(state_path: str | Path, state: Dict[str, Any]) -> None:
+    """
+    Write the state via a temp file and an atomic rename.
+    """
+    state_path = Path(state_path)
+    state_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = state_path.with_name(state_path.name + ".tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(state, f, default=_encode)
+    os.replace(tmp, state_path)
+
+
+def _stale_reason(
+    state: Optional[Dict[str, Any]], path: str | Path, options: Dict[str, Any]
+) -> Optional[str]:
+    """
+    Why a saved state can't be extended, or None if it can.
+    """
+    if state is None:
+        return "no_state"
+    if state["options"] != options:
+        return "options_changed"
+    offset = state["fingerprint"]["size"]
+    if os.path.getsize(path) < offset:
+        return "file_shrank"
+    if fingerprint(path, offset) != state["fingerprint"]:
+        return "prefix_changed"
+    return None
+
+
+def profile_incremental(
+    path: str | Path,
+    state_path: str | Path,
+    chunksize: Optional[int] = None,
+    columns: Optional[List[str]] = None,
+    workers: int = 1,
+    **options: Any,
+) -> Tuple[DatasetProfile, Dict[str, Any]]:
+    """
+    Profile an append-only CSV file, reusing the state of the previous run.
+
+    If `state_path` holds a profile of a prefix of the file (same options,
+    same fingerprint), only the rows appended since are parsed and merged
+    into it. Otherwise the whole file is profiled. Either way the new
+    profile, byte offset and fingerprint are saved for the next run.
+
+    `columns` is the (already projected) list of columns to read and
+    `options` are passed to `DatasetProfile`. Like row shards, this splits
+    the file on raw newlines, so quoted fields containing newlines aren't
+    supported.
+
+    Returns the profile and a dict describing what was done.
+    """
+    path = str(path)
+    state_options = _options_state(columns, options)
+    state = load_state(state_path)
+    reason = _stale_reason(state, path, state_options)
+
+    header = pd.read_csv(path, nrows=0).columns.tolist()
+    usecols = None if columns is None or columns == header else columns
+    data_start = _header_end(path)
+
+    if reason is None:
+        start = state["fingerprint"]["size"]
+        profile = DatasetProfile(**options).load_state(state["profile"])
+    else:
+        start = data_start
+        profile = DatasetProfile(**options)
+    n_rows_before = profile.n_rows
+    end = complete_lines_end(path, start)
+
+    if end > start:
+        if workers > 1 and reason is not None:
+            # Row shards start after the header, so only a full recompute
+            # is split between workers; tails are read in this process
+            tail = profile_parallel(
+                path,
+                workers,
+                chunksize=chunksize,
+                columns=columns,
+                end=end,
+                **options,
+            )
+        else:
+            tail = profile_byte_range(path, start, end, header, usecols, chunksize, options)
+        profile.merge(tail)
+    if not profile.columns:
+        # Header-only file so far
+        profile.update(pd.read_csv(path, nrows=0, usecols=usecols))
+
+    info = {
+        "mode": "full" if reason else "incremental",
+        "reason": reason,
+        "offset": end,
+        "new_rows": profile.n_rows - n_rows_before,
+        "n_rows": profile.n_rows,
+    }
+    save_state(
+        state_path,
+        {
+            "version": STATE_VERSION,
+            "path": path,
+            "options": state_options,
+            "fingerprint": fingerprint(path, end),
+            "profile": profile.to_state(),
+        },
+    )
+
+    logger.info(
+        "Incremental profile updated",
+        extra={"event": "incremental_done", "path": path, **info},
+    )
+    return profile, info
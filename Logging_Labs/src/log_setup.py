@@ -1,16 +1,60 @@
 from __future__ import annotations
 
+import atexit
 import json
 import logging
+import math
 import os
+import queue
+import threading
+import time
 from datetime import datetime, timezone
-from logging.handlers import TimedRotatingFileHandler
+from logging.handlers import QueueHandler, QueueListener, TimedRotatingFileHandler
 from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
 
-# Directory where log files will be stored
+# Directory where log files will be stored (created by configure_logging)
 LOG_DIR = Path("logs")
-# create logs
-LOG_DIR.mkdir(exist_ok=True)  
+
+# JSON formatters for the log file, by LOG_JSON_FORMATTER name
+JSON_FORMATTERS = ("standard", "fast")
+
+# Async logging: what to do when the queue is full
+OVERFLOW_POLICIES = ("drop", "block")
+DEFAULT_QUEUE_SIZE = 10_000
+# Records written between two flushes of the console and log file
+DEFAULT_BATCH_SIZE = 256
+
+# The async pipeline, if configure_logging started one
+_queue_handler: Optional["BoundedQueueHandler"] = None
+_listener: Optional["BatchingQueueListener"] = None
+
+# LogRecord attributes JsonFormatter leaves out of the JSON object
+_BUILTIN_FIELDS = frozenset(
+    {
+        "name",
+        "msg",
+        "args",
+        "levelname",
+        "levelno",
+        "pathname",
+        "filename",
+        "module",
+        "exc_info",
+        "exc_text",
+        "stack_info",
+        "lineno",
+        "funcName",
+        "created",
+        "msecs",
+        "relativeCreated",
+        "thread",
+        "threadName",
+        "processName",
+        "process",
+    }
+)
+
 
 class JsonFormatter(logging.Formatter):
     """
@@ -31,33 +75,10 @@ class JsonFormatter(logging.Formatter):
             "message": record.getMessage(),
         }
 
-        builtin_fields = {
-            "name",
-            "msg",
-            "args",
-            "levelname",
-            "levelno",
-            "pathname",
-            "filename",
-            "module",
-            "exc_info",
-            "exc_text",
-            "stack_info",
-            "lineno",
-            "funcName",
-            "created",
-            "msecs",
-            "relativeCreated",
-            "thread",
-            "threadName",
-            "processName",
-            "process",
-        }
-
         for key, value in record.__dict__.items():
             if key.startswith("_"):
                 continue
-            if key in builtin_fields:
+            if key in _BUILTIN_FIELDS:
                 continue
             log_record[key] = value
 
@@ -68,21 +89,478 @@ class JsonFormatter(logging.Formatter):
         return json.dumps(log_record, ensure_ascii=False)
 
 
-def configure_logging() -> logging.Logger:
+_MAX_FIELD_CACHE = 1024
+
+
+class FastJsonFormatter(JsonFormatter):
+    """
+    High-throughput JsonFormatter with the same output schema.
+
+    The fields to copy are computed once per set of record attributes
+    (i.e. per logging call site), the timestamp's date-and-seconds part is
+    cached per second, and the JSON encoder is created once. With the
+    stdlib encoder the output is byte-identical to JsonFormatter's. With
+    `use_orjson` (the default when orjson is installed), lines are encoded
+    by orjson: same keys and values, without spaces after separators, and
+    NaN written as null. Records orjson can't encode fall back to the
+    stdlib encoder.
+    """
+
+    def __init__(self, use_orjson: Optional[bool] = None) -> None:
+        super().__init__()
+        self._orjson = None
+        if use_orjson is not False:
+            try:
+                import orjson
+
+                self._orjson = orjson
+            except ImportError:
+                if use_orjson:
+                    raise
+        self._encoder = json.JSONEncoder(ensure_ascii=False)
+        # (whole second, "YYYY-MM-DDTHH:MM:SS") of the last record
+        self._second_cache: tuple = (None, "")
+        # Attribute names of a record -> the ones that go in the JSON.
+        # Records from one logging call site share their attribute names,
+        # so this stays small; it is cleared if it ever grows past
+        # _MAX_FIELD_CACHE.
+        self._field_cache: Dict[tuple, tuple] = {}
+
+    def _timestamp(self, created: float) -> str:
+        # Same value as datetime.fromtimestamp(created, tz=timezone.utc)
+        # .isoformat(): microseconds rounded half-to-even, and no fraction
+        # at all when they are zero
+        second = int(created) if created >= 0 else math.floor(created)
+        micros = round((created - second) * 1e6)
+        if micros >= 1_000_000:
+            second += 1
+            micros -= 1_000_000
+        cached_second, prefix = self._second_cache
+        if cached_second != second:
+            prefix = datetime.fromtimestamp(second, tz=timezone.utc).strftime("%Y-%m-%dT%H:%M:%S")
+            self._second_cache = (second, prefix)
+        if micros:
+            return f"{prefix}.{micros:06d}Z"
+        return f"{prefix}Z"
+
+    def format(self, record: logging.LogRecord) -> str:
+        """
+        Convert a LogRecord into a JSON string.
+        """
+        log_record = {
+            "timestamp": self._timestamp(record.created),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        attributes = record.__dict__
+        names = tuple(attributes)
+        fields = self._field_cache.get(names)
+        if fields is None:
+            if len(self._field_cache) >= _MAX_FIELD_CACHE:
+                self._field_cache.clear()
+            fields = self._field_cache[names] = tuple(
+                key for key in names if key not in _BUILTIN_FIELDS and not key.startswith("_")
+            )
+        for key in fields:
+            log_record[key] = attributes[key]
+        if record.exc_info:
+            log_record["exception"] = self.formatException(record.exc_info)
+
+        if self._orjson is not None:
+            try:
+                return self._orjson.dumps(log_record).decode("utf-8")
+            except TypeError:
+                # orjson.JSONEncodeError subclasses TypeError
+                pass
+        return self._encoder.encode(log_record)
+
+
+class _BatchFlush:
+    """
+    Handler mixin whose `flush` is skipped while `deferred` is set, so a
+    listener can write a batch of records and flush once at the end
+    (`flush_batch`) instead of after every record.
+    """
+
+    deferred = False
+
+    def flush(self) -> None:
+        if not self.deferred:
+            super().flush()  # type: ignore[misc]
+
+    def flush_batch(self) -> None:
+        self.deferred = False
+        try:
+            self.flush()
+        finally:
+            self.deferred = True
+
+
+class BatchStreamHandler(_BatchFlush, logging.StreamHandler):
+    pass
+
+
+class BatchTimedRotatingFileHandler(_BatchFlush, TimedRotatingFileHandler):
+    pass
+
+
+class BoundedQueueHandler(QueueHandler):
+    """
+    Puts records on a bounded queue for a `BatchingQueueListener`.
+
+    With `overflow="drop"` a record that finds the queue full is dropped
+    (and counted) so the caller never waits; with `overflow="block"` the
+    caller waits for room. Records stay in this process, so only the
+    message is merged here; formatting and I/O happen on the listener's
+    thread.
+    """
+
+    def __init__(self, log_queue: queue.Queue, overflow: str = "drop") -> None:
+        if overflow not in OVERFLOW_POLICIES:
+            raise ValueError(
+                f"unknown overflow policy {overflow!r}; choose from {', '.join(OVERFLOW_POLICIES)}"
+            )
+        super().__init__(log_queue)
+        self.overflow = overflow
+        self.queued = 0
+        self.dropped = 0
+        self._count_lock = threading.Lock()
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Merge args now, since they may change before the listener runs.
+        # Unlike the base class, keep exc_info: the record is never pickled.
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            if self.overflow == "block":
+                self.queue.put(record)
+            else:
+                self.queue.put_nowait(record)
+        except queue.Full:
+            with self._count_lock:
+                self.dropped += 1
+            return
+        with self._count_lock:
+            self.queued += 1
+
+
+class BatchingQueueListener(QueueListener):
+    """
+    Background thread that drains the log queue in batches of up to
+    `batch_size` records and flushes its handlers once per batch.
+    """
+
+    def __init__(
+        self,
+        log_queue: queue.Queue,
+        *handlers: logging.Handler,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+    ) -> None:
+        super().__init__(log_queue, *handlers, respect_handler_level=True)
+        self.batch_size = batch_size
+        self.written = 0
+        self.batches = 0
+        for handler in handlers:
+            if isinstance(handler, _BatchFlush):
+                handler.deferred = True
+
+    def enqueue_sentinel(self) -> None:
+        # Block rather than fail when the queue is full at shutdown
+        self.queue.put(self._sentinel)
+
+    def _monitor(self) -> None:
+        q = self.queue
+        stop = False
+        while not stop:
+            # Wait for one record, then take whatever else is already queued
+            batch = [q.get()]
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(q.get_nowait())
+                except queue.Empty:
+                    break
+            for record in batch:
+                if record is self._sentinel:
+                    stop = True
+                else:
+                    self.handle(record)
+                    self.written += 1
+                q.task_done()
+            self.batches += 1
+            for handler in self.handlers:
+                if isinstance(handler, _BatchFlush):
+                    handler.flush_batch()
+                else:
+                    handler.flush()
+
+
+def parse_sample_rates(text: str) -> Dict[str, float]:
+    """
+    Parse "event=rate,..." (e.g. "column_summary=0,missing_values=0.1");
+    the event "*" sets the rate of events that aren't listed.
+    """
+    rates: Dict[str, float] = {}
+    for item in text.split(","):
+        if not item.strip():
+            continue
+        event, sep, rate = item.partition("=")
+        if not sep:
+            raise ValueError(f"expected event=rate, got {item.strip()!r}")
+        value = float(rate)
+        if not 0.0 <= value <= 1.0:
+            raise ValueError(f"sample rate for {event.strip()!r} must be between 0 and 1")
+        rates[event.strip()] = value
+    return rates
+
+
+class AggregatingFilter(logging.Filter):
+    """
+    Rate-limits repeated events and replaces what it drops with periodic
+    summary records.
+
+    Records are grouped by their `event` attribute. In each `interval`
+    (seconds) the first `burst` records of an event pass unchanged; after
+    that only a `sample_rates[event]` fraction of them pass (every
+    1/rate-th record, so it is deterministic; `sample_rates["*"]` for
+    unlisted events, 0 by default). For every event with dropped records,
+    a "log_summary" record is emitted when its interval ends (checked as
+    records arrive) and on `flush`. It carries the drop count, the number
+    passed and the first `max_columns` column names of the dropped
+    records. Records at ERROR and above, and records without an `event`,
+    always pass.
+
+    The per-column details stay complete in the JSON summary; this only
+    thins out the log.
+    """
+
+    def __init__(
+        self,
+        interval: float = 10.0,
+        burst: int = 10,
+        sample_rates: Optional[Dict[str, float]] = None,
+        max_columns: int = 10,
+    ) -> None:
+        super().__init__()
+        self.interval = interval
+        self.burst = burst
+        self.sample_rates = dict(sample_rates or {})
+        self.default_rate = self.sample_rates.pop("*", 0.0)
+        self.max_columns = max_columns
+        self._lock = threading.Lock()
+        # event -> counters of its current interval
+        self._windows: Dict[str, Dict[str, Any]] = {}
+        self._logger: Optional[logging.Logger] = None
+
+    @classmethod
+    def from_env(cls) -> "AggregatingFilter":
+        """
+        Build from LOG_AGGREGATE_INTERVAL, LOG_AGGREGATE_BURST and
+        LOG_SAMPLE_RATES (see `parse_sample_rates`).
+        """
+        return cls(
+            interval=float(os.getenv("LOG_AGGREGATE_INTERVAL", 10.0)),
+            burst=int(os.getenv("LOG_AGGREGATE_BURST", 10)),
+            sample_rates=parse_sample_rates(os.getenv("LOG_SAMPLE_RATES", "")),
+        )
+
+    def attach(self, logger: logging.Logger) -> None:
+        """
+        Filter `logger`'s records and emit summaries through it.
+        """
+        self._logger = logger
+        logger.addFilter(self)
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        event = getattr(record, "event", None)
+        if event is None or event == "log_summary" or record.levelno >= logging.ERROR:
+            return True
+        now = time.monotonic()
+        with self._lock:
+            expired = self._expired(now)
+            window = self._windows.get(event)
+            if window is None:
+                window = self._windows[event] = self._new_window(now)
+            window["seen"] += 1
+            if window["seen"] <= self.burst:
+                passed = True
+            else:
+                # Pass every 1/rate-th record past the burst
+                window["credit"] += self.sample_rates.get(event, self.default_rate)
+                passed = window["credit"] >= 1.0
+                if passed:
+                    window["credit"] -= 1.0
+            if passed:
+                window["passed"] += 1
+            else:
+                window["dropped"] += 1
+                window["levelno"] = max(window["levelno"], record.levelno)
+                column = getattr(record, "column", None)
+                if column is not None and len(window["columns"]) < self.max_columns:
+                    window["columns"].append(column)
+        self._emit(expired)
+        return passed
+
+    def flush(self) -> None:
+        """
+        Emit summaries for all events with dropped records (also run at
+        interpreter exit).
+        """
+        with self._lock:
+            expired = self._expired(None)
+        self._emit(expired)
+
+    def _new_window(self, now: float) -> Dict[str, Any]:
+        return {
+            "start": now,
+            "seen": 0,
+            "passed": 0,
+            "dropped": 0,
+            "credit": 0.0,
+            "levelno": logging.INFO,
+            "columns": [],
+        }
+
+    def _expired(self, now: Optional[float]) -> List[Tuple[str, Dict[str, Any], float]]:
+        """
+        Remove and return the windows that ended by `now` (all if None).
+        Called with the lock held.
+        """
+        expired = []
+        for event, window in list(self._windows.items()):
+            if now is None or now - window["start"] >= self.interval:
+                del self._windows[event]
+                end = time.monotonic() if now is None else now
+                expired.append((event, window, end - window["start"]))
+        return expired
+
+    def _emit(self, expired: List[Tuple[str, Dict[str, Any], float]]) -> None:
+        # Outside the lock: the summary record runs through this filter too
+        logger = self._logger
+        if logger is None:
+            return
+        for event, window, seconds in expired:
+            if not window["dropped"]:
+                continue
+            logger.log(
+                window["levelno"],
+                "Suppressed %d '%s' log records",
+                window["dropped"],
+                event,
+                extra={
+                    "event": "log_summary",
+                    "summarized_event": event,
+                    "dropped": window["dropped"],
+                    "passed": window["passed"],
+                    "columns_sample": window["columns"],
+                    "interval_seconds": round(seconds, 3),
+                },
+            )
+
+
+def logging_stats() -> Dict[str, Any]:
+    """
+    Counters of the async logging pipeline: records queued, dropped,
+    written, flush batches and current queue depth. Empty when logging
+    is synchronous.
+    """
+    if _listener is None or _queue_handler is None:
+        return {}
+    return {
+        "overflow": _queue_handler.overflow,
+        "queue_size": _listener.queue.maxsize,
+        "queue_depth": _listener.queue.qsize(),
+        "queued": _queue_handler.queued,
+        "dropped": _queue_handler.dropped,
+        "written": _listener.written,
+        "batches": _listener.batches,
+    }
+
+
+def stop_logging() -> None:
+    """
+    Drain the async logging queue, stop its listener thread and attach the
+    console and file handlers directly again (also run at interpreter
+    exit). Logs the pipeline's final counters.
+    """
+    global _queue_handler, _listener
+    if _listener is None or _queue_handler is None:
+        return
+    logger = logging.getLogger("dq_logger")
+    logger.removeHandler(_queue_handler)
+    _listener.stop()
+    stats = logging_stats()
+    del stats["queue_depth"]
+    for handler in _listener.handlers:
+        if isinstance(handler, _BatchFlush):
+            handler.deferred = False
+        logger.addHandler(handler)
+    _queue_handler = _listener = None
+    logger.log(
+        logging.WARNING if stats["dropped"] else logging.INFO,
+        "Async logging stopped",
+        extra={"event": "logging_stopped", **stats},
+    )
+
+
+def configure_logging(
+    async_logging: Optional[bool] = None,
+    queue_size: Optional[int] = None,
+    overflow: Optional[str] = None,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    json_formatter: Optional[str] = None,
+    log_filter: Optional[AggregatingFilter] = None,
+) -> logging.Logger:
     """
     Configure and return the main logger for the dataset quality checker.
+
+    With `async_logging` (or LOG_ASYNC=1), the logger only puts records on
+    a bounded queue of `queue_size` (LOG_QUEUE_SIZE) records; a background
+    thread formats and writes them, flushing once per batch of up to
+    `batch_size`. `overflow` (LOG_QUEUE_OVERFLOW) is "drop" or "block"
+    for a full queue. See `logging_stats` and `stop_logging`.
+
+    `json_formatter` (LOG_JSON_FORMATTER) picks the log file's formatter:
+    "standard" (JsonFormatter) or "fast" (FastJsonFormatter).
+
+    `log_filter` (or LOG_AGGREGATE=1, configured by `AggregatingFilter.from_env`)
+    rate-limits repeated per-column events into periodic summaries.
     """
+    global _queue_handler, _listener
     logger = logging.getLogger("dq_logger")
 
     if logger.handlers:
         return logger
 
+    if async_logging is None:
+        async_logging = os.getenv("LOG_ASYNC", "0").lower() in ("1", "true", "yes")
+    if queue_size is None:
+        queue_size = int(os.getenv("LOG_QUEUE_SIZE", DEFAULT_QUEUE_SIZE))
+    if overflow is None:
+        overflow = os.getenv("LOG_QUEUE_OVERFLOW", "drop").lower()
+    if json_formatter is None:
+        json_formatter = os.getenv("LOG_JSON_FORMATTER", "standard").lower()
+    if json_formatter not in JSON_FORMATTERS:
+        raise ValueError(
+            f"unknown JSON formatter {json_formatter!r}; choose from {', '.join(JSON_FORMATTERS)}"
+        )
+
+    if log_filter is None and os.getenv("LOG_AGGREGATE", "0").lower() in ("1", "true", "yes"):
+        log_filter = AggregatingFilter.from_env()
+
     log_level_name = os.getenv("LOG_LEVEL", "INFO").upper()
     log_level = getattr(logging, log_level_name, logging.INFO)
 
     logger.setLevel(log_level)
     logger.propagate = False
-    console_handler = logging.StreamHandler()
+    stream_handler_class = BatchStreamHandler if async_logging else logging.StreamHandler
+    file_handler_class = (
+        BatchTimedRotatingFileHandler if async_logging else TimedRotatingFileHandler
+    )
+    console_handler = stream_handler_class()
     console_handler.setLevel(log_level)
     console_formatter = logging.Formatter(
         "%(asctime)s - %(name)s - %(levelname)s - %(message)s",
@@ -90,17 +568,38 @@ def configure_logging() -> logging.Logger:
     )
     console_handler.setFormatter(console_formatter)
 
-    file_handler = TimedRotatingFileHandler(
+    LOG_DIR.mkdir(exist_ok=True)
+    file_handler = file_handler_class(
         LOG_DIR / "data_quality.log",
         when="midnight",
         backupCount=7,
         encoding="utf-8",
     )
     file_handler.setLevel(logging.INFO)
-    file_handler.setFormatter(JsonFormatter())
+    file_handler.setFormatter(
+        FastJsonFormatter() if json_formatter == "fast" else JsonFormatter()
+    )
 
-    logger.addHandler(console_handler)
-    logger.addHandler(file_handler)
-    logger.info("Logging configured", extra={"component": "logging_setup"})
+    if async_logging:
+        log_queue: queue.Queue = queue.Queue(maxsize=queue_size)
+        _queue_handler = BoundedQueueHandler(log_queue, overflow=overflow)
+        _listener = BatchingQueueListener(
+            log_queue, console_handler, file_handler, batch_size=batch_size
+        )
+        _listener.start()
+        atexit.register(stop_logging)
+        logger.addHandler(_queue_handler)
+    else:
+        logger.addHandler(console_handler)
+        logger.addHandler(file_handler)
+    if log_filter is not None:
+        log_filter.attach(logger)
+        # Registered after stop_logging, so it runs first and its
+        # summaries still go through the queue
+        atexit.register(log_filter.flush)
+    logger.info(
+        "Logging configured",
+        extra={"component": "logging_setup", "async_logging": async_logging},
+    )
 
     return logger
@@ -0,0 +1,348 @@
+from __future__ import annotations
+
+import argparse
+import gzip
+import hashlib
+import json
+import re
+import sqlite3
+import sys
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from .log_setup import LOG_DIR
+
+LOG_PATTERN = "data_quality.log*"
+INDEX_NAME = "data_quality.index.sqlite"
+GROUP_FIELDS = ("event", "level", "column", "day", "file")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL,
+    first_line_sha256 TEXT NOT NULL UNIQUE,
+    compressed INTEGER NOT NULL,
+    indexed_bytes INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS records (
+    file_id INTEGER NOT NULL REFERENCES files(id),
+    offset INTEGER NOT NULL,
+    ts REAL,
+    level TEXT,
+    event TEXT,
+    column_name TEXT
+);
+CREATE INDEX IF NOT EXISTS records_event_ts ON records (event, ts);
+CREATE INDEX IF NOT EXISTS records_column_ts ON records (column_name, ts);
+CREATE INDEX IF NOT EXISTS records_ts ON records (ts);
+"""
+
+# Rows inserted per executemany call while indexing
+_BATCH_ROWS = 5000
+
+
+def _open(path: Path) -> Any:
+    return gzip.open(path, "rb") if path.suffix == ".gz" else open(path, "rb")
+
+
+def _first_line(path: Path) -> Optional[bytes]:
+    """
+    The file's first complete line, or None if it has none yet.
+    """
+    with _open(path) as f:
+        line = f.readline()
+    return line if line.endswith(b"\n") else None
+
+
+def _parse_timestamp(value: Any) -> Optional[float]:
+    if not isinstance(value, str):
+        return None
+    try:
+        return datetime.fromisoformat(value.replace("Z", "+00:00")).timestamp()
+    except ValueError:
+        return None
+
+
+def _index_fields(line: bytes) -> Optional[Tuple[Optional[float], Any, Any, Any]]:
+    """
+    (timestamp, level, event, column) of one JSON log line, or None if the
+    line isn't a JSON object. A `columns` list with one entry (rule
+    violations) counts as its column.
+    """
+    try:
+        record = json.loads(line)
+    except ValueError:
+        return None
+    if not isinstance(record, dict):
+        return None
+    column = record.get("column")
+    columns = record.get("columns")
+    if column is None and isinstance(columns, list) and len(columns) == 1:
+        column = columns[0]
+    return (
+        _parse_timestamp(record.get("timestamp")),
+        record.get("level"),
+        record.get("event"),
+        None if column is None else str(column),
+    )
+
+
+class LogIndex:
+    """
+    SQLite index of the JSON log files in a directory, rotated and gzipped
+    ones included.
+
+    Each indexed line keeps its timestamp, level, event, column and byte
+    offset (in the decompressed stream for .gz files), so filters and
+    counts run on the index and only matching lines are read back.
+
+    `update` is incremental. Files are identified by the hash of their
+    first line rather than their name, so a rename by rotation or a later
+    gzip doesn't trigger a re-index. For a file seen before, only the
+    bytes after the last indexed line are read. Entries of files that no
+    longer exist (pruned backups) are deleted.
+    """
+
+    def __init__(self, log_dir: str | Path = LOG_DIR, index_path: Optional[str | Path] = None) -> None:
+        self.log_dir = Path(log_dir)
+        self.index_path = Path(index_path) if index_path else self.log_dir / INDEX_NAME
+        self.conn = sqlite3.connect(self.index_path)
+        self.conn.executescript(_SCHEMA)
+
+    def close(self) -> None:
+        self.conn.close()
+
+    def log_files(self) -> List[Path]:
+        return sorted(path for path in self.log_dir.glob(LOG_PATTERN) if path.is_file())
+
+    def update(self) -> Dict[str, int]:
+        """
+        Bring the index up to date with the log directory. Returns the
+        number of files scanned, lines added and files dropped.
+        """
+        stats = {"files": 0, "lines_added": 0, "files_dropped": 0}
+        seen_ids = set()
+        with self.conn:
+            for path in self.log_files():
+                first = _first_line(path)
+                if first is None:
+                    # Empty or still being written: nothing to index yet
+                    continue
+                stats["files"] += 1
+                file_id, start = self._file_entry(path, hashlib.sha256(first).hexdigest())
+                seen_ids.add(file_id)
+                stats["lines_added"] += self._index_file(path, file_id, start)
+
+            for (file_id,) in self.conn.execute("SELECT id FROM files").fetchall():
+                if file_id not in seen_ids:
+                    self.conn.execute("DELETE FROM records WHERE file_id = ?", (file_id,))
+                    self.conn.execute("DELETE FROM files WHERE id = ?", (file_id,))
+                    stats["files_dropped"] += 1
+        return stats
+
+    def _file_entry(self, path: Path, first_hash: str) -> Tuple[int, int]:
+        """
+        The file's id and the offset to resume indexing from, creating or
+        renaming its entry as needed.
+        """
+        compressed = int(path.suffix == ".gz")
+        row = self.conn.execute(
+            "SELECT id, indexed_bytes FROM files WHERE first_line_sha256 = ?", (first_hash,)
+        ).fetchone()
+        if row is None:
+            cursor = self.conn.execute(
+                "INSERT INTO files (name, first_line_sha256, compressed, indexed_bytes) "
+                "VALUES (?, ?, ?, 0)",
+                (path.name, first_hash, compressed),
+            )
+            return cursor.lastrowid, 0
+        file_id, indexed = row
+        if not compressed and path.stat().st_size < indexed:
+            # Same first line but shorter: rewritten, so start over
+            self.conn.execute("DELETE FROM records WHERE file_id = ?", (file_id,))
+            indexed = 0
+        self.conn.execute(
+            "UPDATE files SET name = ?, compressed = ?, indexed_bytes = ? WHERE id = ?",
+            (path.name, compressed, indexed, file_id),
+        )
+        return file_id, indexed
+
+    def _index_file(self, path: Path, file_id: int, start: int) -> int:
+        """
+        Index the complete lines after byte `start`; returns how many.
+        """
+        added = 0
+        offset = start
+        rows = []
+        with _open(path) as f:
+            # gzip streams seek forward by decompressing, which is still
+            # cheaper than parsing the lines again
+            f.seek(start)
+            for line in f:
+                if not line.endswith(b"\n"):
+                    # Partial last line: left for the next update
+                    break
+                fields = _index_fields(line)
+                if fields is not None:
+                    rows.append((file_id, offset, *fields))
+                    added += 1
+                offset += len(line)
+                if len(rows) >= _BATCH_ROWS:
+                    self._insert(rows)
+                    rows = []
+        self._insert(rows)
+        self.conn.execute("UPDATE files SET indexed_bytes = ? WHERE id = ?", (offset, file_id))
+        return added
+
+    def _insert(self, rows: List[Tuple[Any, ...]]) -> None:
+        if rows:
+            self.conn.executemany(
+                "INSERT INTO records (file_id, offset, ts, level, event, column_name) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                rows,
+            )
+
+    def _where(self, filters: Dict[str, Any]) -> Tuple[str, List[Any]]:
+        clauses, params = [], []
+        for field, column in (("event", "event"), ("level", "level"), ("column", "column_name")):
+            if filters.get(field):
+                values = filters[field]
+                clauses.append(f"r.{column} IN ({', '.join('?' * len(values))})")
+                params.extend(values)
+        if filters.get("since") is not None:
+            clauses.append("r.ts >= ?")
+            params.append(filters["since"])
+        if filters.get("until") is not None:
+            clauses.append("r.ts < ?")
+            params.append(filters["until"])
+        return (" WHERE " + " AND ".join(clauses) if clauses else ""), params
+
+    def count(self, group_by: str, **filters: Any) -> List[Tuple[Any, int]]:
+        """
+        Number of matching lines per `group_by` value (one of GROUP_FIELDS),
+        largest first.
+        """
+        key = {
+            "event": "r.event",
+            "level": "r.level",
+            "column": "r.column_name",
+            "day": "date(r.ts, 'unixepoch')",
+            "file": "f.name",
+        }[group_by]
+        where, params = self._where(filters)
+        sql = (
+            f"SELECT {key} AS k, COUNT(*) AS n FROM records r JOIN files f ON f.id = r.file_id"
+            f"{where} GROUP BY k ORDER BY n DESC, k"
+        )
+        return self.conn.execute(sql, params).fetchall()
+
+    def lines(self, limit: Optional[int] = None, **filters: Any) -> Iterator[str]:
+        """
+        The matching log lines, oldest first, read back from the files.
+        """
+        where, params = self._where(filters)
+        sql = (
+            "SELECT f.name, r.offset FROM records r JOIN files f ON f.id = r.file_id"
+            f"{where} ORDER BY r.ts, f.name, r.offset"
+        )
+        if limit is not None:
+            sql += f" LIMIT {int(limit)}"
+        handles: Dict[str, Any] = {}
+        try:
+            for name, offset in self.conn.execute(sql, params):
+                f = handles.get(name)
+                if f is None:
+                    f = handles[name] = _open(self.log_dir / name)
+                f.seek(offset)
+                yield f.readline().decode("utf-8").rstrip("\n")
+        finally:
+            for f in handles.values():
+                f.close()
+
+
+def parse_time(value: str) -> float:
+    """
+    An ISO date/time (UTC unless it has an offset) or a relative age such
+    as "7d", "24h" or "30m" as a Unix timestamp.
+    """
+    match = re.fullmatch(r"(\d+(?:\.\d+)?)([dhm])", value.strip())
+    if match:
+        unit = {"d": "days", "h": "hours", "m": "minutes"}[match.group(2)]
+        moment = datetime.now(timezone.utc) - timedelta(**{unit: float(match.group(1))})
+        return moment.timestamp()
+    moment = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=timezone.utc)
+    return moment.timestamp()
+
+
+def parse_args() -> argparse.Namespace:
+    """
+    Define and parse command-line arguments.
+    """
+    parser = argparse.ArgumentParser(
+        description="Query the JSON data quality logs through an incremental index"
+    )
+    split = lambda value: [item.strip() for item in value.split(",") if item.strip()]  # noqa: E731
+    parser.add_argument("--log-dir", default=str(LOG_DIR), help="Directory of data_quality.log* files")
+    parser.add_argument("--index", dest="index_path", help=f"Index file (default: <log-dir>/{INDEX_NAME})")
+    parser.add_argument("--event", type=split, help="Comma-separated events, e.g. out_of_range")
+    parser.add_argument("--level", type=lambda v: [x.upper() for x in split(v)], help="Comma-separated levels")
+    parser.add_argument("--column", type=split, help="Comma-separated column names")
+    parser.add_argument("--since", type=parse_time, help="ISO date/time or age like 7d, 24h")
+    parser.add_argument("--until", type=parse_time, help="ISO date/time or age like 1d")
+    parser.add_argument(
+        "--count-by",
+        choices=GROUP_FIELDS,
+        help="Print counts per value instead of the matching lines",
+    )
+    parser.add_argument("--limit", type=int, help="Print at most this many lines")
+    parser.add_argument(
+        "--no-update",
+        action="store_true",
+        help="Query the index as it is, without scanning the logs first",
+    )
+    return parser.parse_args()
+
+
+def main() -> None:
+    """
+    Entry point: update the index, then print matching lines or counts.
+    """
+    args = parse_args()
+    if not Path(args.log_dir).is_dir():
+        print(f"ERROR: log directory not found: {args.log_dir}", file=sys.stderr)
+        raise SystemExit(1)
+
+    index = LogIndex(args.log_dir, args.index_path)
+    try:
+        if not args.no_update:
+            stats = index.update()
+            print(
+                f"index: {stats['files']} files, {stats['lines_added']} new lines, "
+                f"{stats['files_dropped']} dropped files",
+                file=sys.stderr,
+            )
+        filters = {
+            "event": args.event,
+            "level": args.level,
+            "column": args.column,
+            "since": args.since,
+            "until": args.until,
+        }
+        if args.count_by:
+            for value, n in index.count(args.count_by, **filters):
+                print(f"{n:>8}  {value}")
+        else:
+            for line in index.lines(limit=args.limit, **filters):
+                print(line)
+    except BrokenPipeError:
+        # e.g. piped into head
+        pass
+    finally:
+        index.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,306 @@
+from __future__ import annotations
+
+import io
+import logging
+import os
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import pandas as pd
+
+from .profiler import DatasetProfile
+
+logger = logging.getLogger("dq_logger")
+
+SHARD_MODES = ("rows", "columns")
+
+
+class _ByteRange(io.RawIOBase):
+    """
+    Read-only view of bytes [start, end) of an open binary file.
+    """
+
+    def __init__(self, f: Any, start: int, end: int) -> None:
+        self._f = f
+        self._remaining = end - start
+        f.seek(start)
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer: Any) -> int:
+        if self._remaining <= 0:
+            return 0
+        view = memoryview(buffer)[: self._remaining]
+        n = self._f.readinto(view)
+        self._remaining -= n
+        return n
+
+
+def _profile_frames(frames: Any, options: Dict[str, Any]) -> DatasetProfile:
+    """
+    Profile a DataFrame or an iterator of chunks into one DatasetProfile.
+    """
+    profile = DatasetProfile(**options)
+    if isinstance(frames, pd.DataFrame):
+        return profile.update(frames)
+    for chunk in frames:
+        profile.merge(DatasetProfile(**options).update(chunk))
+    return profile
+
+
+def profile_byte_range(
+    path: str,
+    start: int,
+    end: int,
+    columns: List[str],
+    usecols: Optional[List[str]],
+    chunksize: Optional[int],
+    options: Dict[str, Any],
+) -> DatasetProfile:
+    """
+    Profile the rows stored in bytes [start, end) of a CSV file, which must
+    start and end on line boundaries after the header. `columns` are the
+    header's names and `usecols` the ones to read (None for all).
+    """
+    with open(path, "rb") as f:
+        shard = io.BufferedReader(_ByteRange(f, start, end))
+        frames = pd.read_csv(
+            shard, header=None, names=columns, usecols=usecols, chunksize=chunksize
+        )
+        return _profile_frames(frames, options)
+
+
+def _profile_columns(
+    path: str, columns: List[str], chunksize: Optional[int], options: Dict[str, Any]
+) -> DatasetProfile:
+    """
+    Worker: profile one group of columns of a CSV file.
+    """
+    frames = pd.read_csv(path, usecols=columns, chunksize=chunksize)
+    return _profile_frames(frames, options)
+
+
+def _quiet_worker() -> None:
+    # The parent logs per-file events; workers would only duplicate them
+    logging.getLogger("dq_logger").disabled = True
+
+
+def _profile_file(
+    path: str,
+    chunksize: Optional[int],
+    columns: Optional[List[str]],
+    state_path: Optional[str],
+    options: Dict[str, Any],
+) -> DatasetProfile:
+    """
+    Worker: profile a whole dataset file of any supported format.
+    """
+    from .data_quality import profile_dataset
+
+    return profile_dataset(
+        path, chunksize=chunksize, columns=columns, state_path=state_path, **options
+    )
+
+
+def row_shards(
+    path: str | Path, n_shards: int, end: Optional[int] = None
+) -> Tuple[List[str], List[Tuple[int, int]]]:
+    """
+    Split a CSV file (up to byte `end`, by default all of it) into up to
+    `n_shards` byte ranges that start and end on line boundaries.
+
+    Returns the header's column names and the (start, end) offsets of the
+    data rows. Lines are split on raw newlines, so quoted fields that
+    contain newlines aren't supported; use column groups for such files.
+    """
+    columns = pd.read_csv(path, nrows=0).columns.tolist()
+    size = os.path.getsize(path) if end is None else end
+    with open(path, "rb") as f:
+        f.readline()
+        data_start = f.tell()
+        bounds = [data_start]
+        for k in range(1, n_shards):
+            target = data_start + (size - data_start) * k // n_shards
+            if target <= bounds[-1]:
+                continue
+            # Continue to the end of the line containing target - 1, so a
+            # target that is already a line start stays where it is
+            f.seek(target - 1)
+            f.readline()
+            if f.tell() >= size:
+                break
+            if f.tell() > bounds[-1]:
+                bounds.append(f.tell())
+    bounds.append(size)
+    shards = [(a, b) for a, b in zip(bounds, bounds[1:]) if b > a]
+    return columns, shards
+
+
+def column_groups(
+    columns: List[str], workers: int, linked: Optional[List[List[str]]] = None
+) -> List[List[str]]:
+    """
+    Split `columns` into up to `workers` groups, round robin, keeping each
+    list of `linked` columns (e.g. the columns of one expression rule) in
+    the same group. Groups keep the columns in their original order.
+    """
+    # Union-find over the linked columns
+    parent = {col: col for col in columns}
+
+    def find(col: str) -> str:
+        while parent[col] != col:
+            parent[col] = parent[parent[col]]
+            col = parent[col]
+        return col
+
+    for cols in linked or []:
+        cols = [col for col in cols if col in parent]
+        for col in cols[1:]:
+            parent[find(col)] = find(cols[0])
+
+    components: Dict[str, List[str]] = {}
+    for col in columns:
+        components.setdefault(find(col), []).append(col)
+    units = list(components.values())
+    n_groups = min(workers, len(units))
+    groups: List[List[str]] = [[] for _ in range(n_groups)]
+    for i, unit in enumerate(units):
+        groups[i % n_groups].extend(unit)
+    order = {col: i for i, col in enumerate(columns)}
+    return [sorted(group, key=order.__getitem__) for group in groups]
+
+
+def profile_parallel(
+    path: str | Path,
+    workers: int,
+    shard_by: str = "rows",
+    chunksize: Optional[int] = None,
+    columns: Optional[List[str]] = None,
+    end: Optional[int] = None,
+    **options: Any,
+) -> DatasetProfile:
+    """
+    Profile one CSV file with a pool of `workers` processes.
+
+    `shard_by="rows"` gives each worker a byte range of the file;
+    `shard_by="columns"` gives each worker a group of columns, read with
+    `usecols`; the columns of a multi-column rule share a group. The
+    partial profiles are merged into the same profile a single pass would
+    produce. `chunksize` bounds the rows each worker holds at once,
+    `columns` limits the columns read (all by default), `end` stops row
+    shards at that byte offset and `options` are passed to
+    `DatasetProfile`.
+    """
+    if shard_by not in SHARD_MODES:
+        raise ValueError(f"unknown shard mode {shard_by!r}; choose from {', '.join(SHARD_MODES)}")
+    path = str(path)
+
+    if shard_by == "rows":
+        header, shards = row_shards(path, workers, end=end)
+        columns = header if columns is None else columns
+        usecols = None if columns == header else columns
+        tasks = [
+            (profile_byte_range, (path, a, b, header, usecols, chunksize, options))
+            for a, b in shards
+        ]
+    else:
+        if end is not None:
+            raise ValueError("column shards read whole files; use shard_by='rows' with end")
+        if columns is None:
+            columns = pd.read_csv(path, nrows=0).columns.tolist()
+        rule_set = options.get("rule_set")
+        linked = [check.columns for check in rule_set.new_checks()] if rule_set else []
+        groups = column_groups(columns, workers, linked)
+        tasks = [(_profile_columns, (path, group, chunksize, options)) for group in groups]
+
+    logger.info(
+        "Profiling dataset in parallel",
+        extra={
+            "event": "parallel_start",
+            "path": path,
+            "shard_by": shard_by,
+            "workers": workers,
+            "n_tasks": len(tasks),
+        },
+    )
+
+    profile = DatasetProfile(**options)
+    if tasks:
+        with ProcessPoolExecutor(max_workers=min(workers, len(tasks))) as pool:
+            futures = [pool.submit(fn, *args) for fn, args in tasks]
+            for future in futures:
+                part = future.result()
+                if shard_by == "rows":
+                    profile.merge(part)
+                else:
+                    profile.join(part)
+    profile.reorder(columns)
+    if not profile.columns:
+        # Header-only file: no shard saw the columns
+        profile.update(pd.read_csv(path, nrows=0, usecols=columns))
+
+    logger.info(
+        "Dataset loaded",
+        extra={
+            "event": "load_done",
+            "path": path,
+            "n_rows": profile.n_rows,
+            "n_cols": len(profile.columns),
+        },
+    )
+    return profile
+
+
+def profile_files(
+    paths: List[str | Path],
+    workers: int,
+    chunksize: Optional[int] = None,
+    columns: Optional[List[str]] = None,
+    state_paths: Optional[List[Optional[str | Path]]] = None,
+    **options: Any,
+) -> List[DatasetProfile]:
+    """
+    Profile several dataset files, one file per worker process.
+
+    `state_paths` (one per file) enables incremental runs and `options`
+    are passed to `data_quality.profile_dataset`. Returns the profiles in
+    the order of `paths`.
+    """
+    state_paths = state_paths or [None] * len(paths)
+    profiles = []
+    with ProcessPoolExecutor(
+        max_workers=max(1, min(workers, len(paths))), initializer=_quiet_worker
+    ) as pool:
+        futures = [
+            pool.submit(
+                _profile_file,
+                str(path),
+                chunksize,
+                columns,
+                None if state is None else str(state),
+                options,
+            )
+            for path, state in zip(paths, state_paths)
+        ]
+        for path, future in zip(paths, futures):
+            try:
+                profile = future.result()
+            except Exception:
+                logger.exception(
+                    "Unexpected error while loading dataset",
+                    extra={"event": "load_failed", "path": str(path)},
+                )
+                raise
+            logger.info(
+                "Dataset loaded",
+                extra={
+                    "event": "load_done",
+                    "path": str(path),
+                    "n_rows": profile.n_rows,
+                    "n_cols": len(profile.columns),
+                },
+            )
+            profiles.append(profile)
+    return profiles
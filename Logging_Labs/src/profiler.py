@@ -0,0 +1,720 @@
+from __future__ import annotations
+
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .rules import ColumnView, RuleSet
+from .sketch import HyperLogLog, Reservoir
+
+DISTINCT_METHODS = ("exact", "hll", "none")
+
+
+class ExactDistinct:
+    """
+    Exact distinct-value counter for one column.
+
+    Keeps the unique non-null values seen so far, so two counters built on
+    different chunks of the same column can be merged.
+    """
+
+    def __init__(self) -> None:
+        self._values: Optional[np.ndarray] = None
+
+    def add(self, values: np.ndarray) -> None:
+        """
+        Add an array of non-null values.
+        """
+        uniques = pd.unique(values)
+        if self._values is None:
+            self._values = uniques
+        else:
+            self._values = pd.unique(np.concatenate([self._values, uniques]))
+
+    def merge(self, other: "ExactDistinct") -> None:
+        if other._values is not None:
+            self.add(other._values)
+
+    def count(self) -> int:
+        return 0 if self._values is None else int(len(self._values))
+
+    def values(self) -> np.ndarray:
+        return np.empty(0, dtype=object) if self._values is None else self._values
+
+    def to_state(self) -> Dict[str, Any]:
+        return {"values": self._values}
+
+    def load_state(self, state: Dict[str, Any]) -> None:
+        self._values = state["values"]
+
+
+class NoDistinct:
+    """
+    Counter for runs that skip distinct counting altogether.
+    """
+
+    def add(self, values: Any) -> None:
+        pass
+
+    def merge(self, other: "NoDistinct") -> None:
+        pass
+
+    def count(self) -> int:
+        return 0
+
+    def to_state(self) -> Dict[str, Any]:
+        return {}
+
+    def load_state(self, state: Dict[str, Any]) -> None:
+        pass
+
+
+def make_distinct_counter(method: str = "exact", precision: int = 14) -> Any:
+    """
+    Build an empty distinct counter: "exact" keeps the values, "hll" a
+    fixed-size HyperLogLog sketch of the given precision, and "none"
+    counts nothing.
+    """
+    if method == "exact":
+        return ExactDistinct()
+    if method == "hll":
+        return HyperLogLog(precision)
+    if method == "none":
+        return NoDistinct()
+    raise ValueError(f"unknown distinct method {method!r}; choose from {', '.join(DISTINCT_METHODS)}")
+
+
+def _merge_min(a: Optional[float], b: Optional[float]) -> Optional[float]:
+    if a is None:
+        return b
+    if b is None:
+        return a
+    return min(a, b)
+
+
+def _merge_max(a: Optional[float], b: Optional[float]) -> Optional[float]:
+    if a is None:
+        return b
+    if b is None:
+        return a
+    return max(a, b)
+
+
+def _merge_dtypes(a: Any, a_has_values: bool, b: Any, b_has_values: bool) -> Any:
+    """
+    Combine dtypes seen in different chunks the way a single read would:
+    numeric types widen, an all-missing chunk defers to the other side, a
+    numeric chunk mixed with a text chunk gives the text dtype, and anything
+    else becomes object.
+    """
+    if a is None or a == b:
+        return b
+    # An all-missing chunk only matters when both sides are numeric (NaN
+    # turns ints into floats); otherwise the side with values decides. With
+    # values on neither side (e.g. a header-only read, which gives object),
+    # the all-NaN float column wins, as in a single read.
+    if not a_has_values and not b_has_values and _is_numeric(a) != _is_numeric(b):
+        return a if _is_numeric(a) else b
+    if not b_has_values and not (_is_numeric(a) and _is_numeric(b)):
+        return a
+    if not a_has_values and not (_is_numeric(a) and _is_numeric(b)):
+        return b
+    if _is_numeric(a) and _is_numeric(b):
+        try:
+            return np.result_type(a, b)
+        except TypeError:
+            pass
+    elif _is_numeric(a) and not pd.api.types.is_bool_dtype(b):
+        return b
+    elif _is_numeric(b) and not pd.api.types.is_bool_dtype(a):
+        return a
+    return np.dtype(object)
+
+
+def _as_text(value: Any) -> str:
+    """
+    How `read_csv` would have spelled a number parsed from a text column.
+    """
+    value = float(value)
+    return str(int(value)) if value.is_integer() else repr(value)
+
+
+def _is_numeric(dtype: Any) -> bool:
+    """
+    Same notion of "numeric" as `DataFrame.select_dtypes(include="number")`.
+    """
+    return pd.api.types.is_numeric_dtype(dtype) and not pd.api.types.is_bool_dtype(dtype)
+
+
+def _numeric_stats(values: np.ndarray) -> Tuple[Optional[float], Optional[float], int]:
+    """
+    min, max and negative count of a float array, ignoring NaN.
+    """
+    valid = values[~np.isnan(values)]
+    if valid.size == 0:
+        return None, None, 0
+    return float(valid.min()), float(valid.max()), int(np.count_nonzero(valid < 0))
+
+
+class ColumnProfile:
+    """
+    Mergeable per-column statistics: dtype, missing count, numeric range,
+    negative count and distinct values.
+    """
+
+    def __init__(self, name: str, distinct: str = "exact", precision: int = 14) -> None:
+        self.name = name
+        self.dtype: Optional[np.dtype] = None
+        self.n_rows = 0
+        self.missing = 0
+        self.min: Optional[float] = None
+        self.max: Optional[float] = None
+        self.negative_count = 0
+        self.distinct = make_distinct_counter(distinct, precision)
+        # Values from chunks that parsed as numbers; kept apart so they can be
+        # compared as text if another chunk turns the column into strings
+        self.numeric_distinct = make_distinct_counter(distinct, precision)
+
+    @property
+    def has_values(self) -> bool:
+        return self.n_rows > self.missing
+
+    @property
+    def numeric(self) -> bool:
+        return self.dtype is not None and _is_numeric(self.dtype)
+
+    def distinct_count(self) -> Optional[int]:
+        """
+        Number of distinct non-null values, or None if not counted.
+
+        When chunks disagree on whether the column is numeric, numeric
+        values are converted back to text before counting. This matches a
+        whole-file read for the usual spellings ("1", "2.5") but not for
+        ones like "1.0" or "01". Sketches can't be converted, so with "hll"
+        a value seen both as a number and as text may be counted twice.
+        """
+        if isinstance(self.distinct, NoDistinct):
+            return None
+        if self.numeric_distinct.count() == 0:
+            return self.distinct.count()
+        if self.distinct.count() == 0:
+            return self.numeric_distinct.count()
+        if isinstance(self.distinct, HyperLogLog):
+            union = self.distinct.copy()
+            union.merge(self.numeric_distinct)
+            return union.count()
+        texts = {_as_text(v) for v in self.numeric_distinct.values()}
+        return len(texts | {str(v) for v in self.distinct.values()})
+
+    def update(self, series: pd.Series, missing: int) -> Optional[np.ndarray]:
+        """
+        Fold one chunk of the column into the profile.
+
+        Returns the column as a float array if it is numeric (NaN for
+        missing values) so callers can reuse it instead of converting again.
+        """
+        self.dtype = _merge_dtypes(
+            self.dtype, self.has_values, series.dtype, missing < len(series)
+        )
+        self.n_rows += len(series)
+        self.missing += missing
+
+        values = None
+        if _is_numeric(series.dtype):
+            values = series.to_numpy(dtype=np.float64, na_value=np.nan)
+            col_min, col_max, negatives = _numeric_stats(values)
+            self.min = _merge_min(self.min, col_min)
+            self.max = _merge_max(self.max, col_max)
+            self.negative_count += negatives
+
+        distinct = self.numeric_distinct if values is not None else self.distinct
+        if isinstance(distinct, HyperLogLog):
+            if missing < len(series):
+                distinct.add(series if missing == 0 else series.dropna())
+        elif missing == 0:
+            distinct.add(series.to_numpy())
+        elif missing < len(series):
+            distinct.add(series.dropna().to_numpy())
+        return values
+
+    def update_statistics(
+        self,
+        dtype: np.dtype,
+        n_rows: int,
+        missing: int,
+        col_min: Optional[float],
+        col_max: Optional[float],
+        negatives: int,
+    ) -> None:
+        """
+        Fold in precomputed statistics of a numeric column chunk (e.g. a
+        Parquet row group) instead of its values. Distinct values can only
+        be derived when the chunk is constant (min == max).
+        """
+        has_values = missing < n_rows
+        self.dtype = _merge_dtypes(self.dtype, self.has_values, dtype, has_values)
+        self.n_rows += n_rows
+        self.missing += missing
+        self.min = _merge_min(self.min, col_min)
+        self.max = _merge_max(self.max, col_max)
+        self.negative_count += negatives
+        if has_values and col_min == col_max:
+            self.numeric_distinct.add(np.array([col_min], dtype=np.float64))
+
+    def merge(self, other: "ColumnProfile") -> None:
+        if other.dtype is not None:
+            self.dtype = _merge_dtypes(
+                self.dtype, self.has_values, other.dtype, other.has_values
+            )
+        self.n_rows += other.n_rows
+        self.missing += other.missing
+        self.min = _merge_min(self.min, other.min)
+        self.max = _merge_max(self.max, other.max)
+        self.negative_count += other.negative_count
+        self.distinct.merge(other.distinct)
+        self.numeric_distinct.merge(other.numeric_distinct)
+
+    def to_state(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "dtype": None if self.dtype is None else str(self.dtype),
+            "n_rows": self.n_rows,
+            "missing": self.missing,
+            "min": self.min,
+            "max": self.max,
+            "negative_count": self.negative_count,
+            "distinct": self.distinct.to_state(),
+            "numeric_distinct": self.numeric_distinct.to_state(),
+        }
+
+    def load_state(self, state: Dict[str, Any]) -> None:
+        dtype = state["dtype"]
+        self.dtype = None if dtype is None else pd.api.types.pandas_dtype(dtype)
+        self.n_rows = state["n_rows"]
+        self.missing = state["missing"]
+        self.min = state["min"]
+        self.max = state["max"]
+        self.negative_count = state["negative_count"]
+        self.distinct.load_state(state["distinct"])
+        self.numeric_distinct.load_state(state["numeric_distinct"])
+
+
+class RangeCheck:
+    """
+    Mergeable state for one `column in [min_allowed, max_allowed]` rule.
+    """
+
+    def __init__(self, column: str, min_allowed: float, max_allowed: float) -> None:
+        self.column = column
+        self.min_allowed = float(min_allowed)
+        self.max_allowed = float(max_allowed)
+        self.n_rows = 0
+        self.min: Optional[float] = None
+        self.max: Optional[float] = None
+        self.out_of_range = 0
+        self.seconds = 0.0
+
+    def update(self, values: np.ndarray) -> np.ndarray:
+        """
+        Fold one chunk of already-coerced float values (NaN for non-numbers).
+        Returns the mask of out-of-range rows.
+        """
+        start = time.perf_counter()
+        self.n_rows += len(values)
+        col_min, col_max, _ = _numeric_stats(values)
+        self.min = _merge_min(self.min, col_min)
+        self.max = _merge_max(self.max, col_max)
+        mask = (values < self.min_allowed) | (values > self.max_allowed)
+        self.out_of_range += int(np.count_nonzero(mask))
+        self.seconds += time.perf_counter() - start
+        return mask
+
+    def update_statistics(
+        self, n_rows: int, col_min: Optional[float], col_max: Optional[float], out_of_range: int
+    ) -> None:
+        """
+        Fold in precomputed statistics of a chunk instead of its values.
+        """
+        self.n_rows += n_rows
+        self.min = _merge_min(self.min, col_min)
+        self.max = _merge_max(self.max, col_max)
+        self.out_of_range += out_of_range
+
+    def merge(self, other: "RangeCheck") -> None:
+        self.n_rows += other.n_rows
+        self.min = _merge_min(self.min, other.min)
+        self.max = _merge_max(self.max, other.max)
+        self.out_of_range += other.out_of_range
+        self.seconds += other.seconds
+
+    def to_state(self) -> Dict[str, Any]:
+        return {
+            "n_rows": self.n_rows,
+            "min": self.min,
+            "max": self.max,
+            "out_of_range": self.out_of_range,
+            "seconds": self.seconds,
+        }
+
+    def load_state(self, state: Dict[str, Any]) -> None:
+        self.n_rows = state["n_rows"]
+        self.min = state["min"]
+        self.max = state["max"]
+        self.out_of_range = state["out_of_range"]
+        self.seconds = state["seconds"]
+
+
+def _or_nan(value: Optional[float]) -> float:
+    return float("nan") if value is None else value
+
+
+class DatasetProfile:
+    """
+    Fused profiling engine behind `run_quality_checks`.
+
+    `update` makes one pass per column of a DataFrame (or chunk of one) and
+    computes everything the individual checks need: missing counts, numeric
+    min/max/negatives, one distinct count and the range-rule violations,
+    converting each column to numbers at most once. Profiles of different
+    chunks can be combined with `merge`.
+
+    `distinct="hll"` counts distinct values with a HyperLogLog sketch of
+    `hll_precision` instead of keeping every value, trading exactness for
+    fixed memory per column.
+
+    `rule_set` adds the range rules of a `rules.RuleSet` to `rules` and
+    evaluates its other rules (regex, set membership, not-null, unique,
+    expressions) in the same pass, sharing one coerced view per column.
+
+    `sample_size` > 0 keeps a uniform random sample of up to that many
+    offending rows per rule (row number and the values of the rule's
+    columns), bounded in memory however many rows are scanned; see
+    `offending_samples`.
+    """
+
+    def __init__(
+        self,
+        rules: Optional[Dict[str, Tuple[float, float]]] = None,
+        distinct: str = "exact",
+        hll_precision: int = 14,
+        rule_set: Optional[RuleSet] = None,
+        sample_size: int = 0,
+    ) -> None:
+        make_distinct_counter(distinct, hll_precision)  # validate early
+        self.distinct = distinct
+        self.hll_precision = hll_precision
+        self.rule_set = rule_set
+        self.n_rows = 0
+        self.columns: Dict[str, ColumnProfile] = {}
+        ranges = dict(rules or {})
+        if rule_set is not None:
+            ranges.update(rule_set.ranges)
+        self.range_checks: Dict[str, RangeCheck] = {
+            col: RangeCheck(col, lo, hi) for col, (lo, hi) in ranges.items()
+        }
+        self.checks = rule_set.new_checks() if rule_set is not None else []
+        self.check_columns = {col for check in self.checks for col in check.columns}
+        self.coerce_seconds = 0.0
+        self._seen_rule_columns: set = set()
+        # Rule names of the range checks, as in the rules file
+        self.range_names = {
+            col: rule_set.range_names[col]
+            if rule_set is not None and col in rule_set.range_names
+            else f"{col}_range"
+            for col in self.range_checks
+        }
+        self.sample_size = sample_size
+        self.samples: Dict[str, Reservoir] = {}
+        if sample_size:
+            names = list(self.range_names.values()) + [check.name for check in self.checks]
+            self.samples = {name: Reservoir(sample_size) for name in names}
+
+    def update(self, df: pd.DataFrame) -> "DatasetProfile":
+        """
+        Profile one DataFrame (or chunk) and fold it into this profile.
+        """
+        n_rows = int(df.shape[0])
+        self.n_rows += n_rows
+        missing = df.isna().sum()
+        views: Dict[str, ColumnView] = {}
+
+        for col in df.columns:
+            profile = self.column(col)
+            series = df[col]
+            values = profile.update(series, int(missing[col]))
+
+            check = self.range_checks.get(col)
+            if check is None and col not in self.check_columns:
+                continue
+            # Coerced at most once per column, whichever rules need it
+            view = views[col] = ColumnView(series, numeric=values)
+            if check is not None:
+                self._seen_rule_columns.add(col)
+                mask = check.update(view.numeric)
+                if self.samples:
+                    self.samples[self.range_names[col]].add(mask, [series])
+
+        for rule_check in self.checks:
+            mask = rule_check.update(views, n_rows)
+            if self.samples and mask is not None:
+                self.samples[rule_check.name].add(
+                    mask, [views[col].series for col in rule_check.columns]
+                )
+        self.coerce_seconds += sum(view.coerce_seconds for view in views.values())
+        return self
+
+    def column(self, name: str) -> ColumnProfile:
+        """
+        The profile of a column, created empty on first use.
+        """
+        profile = self.columns.get(name)
+        if profile is None:
+            profile = self.columns[name] = ColumnProfile(
+                name, self.distinct, self.hll_precision
+            )
+        return profile
+
+    def update_statistics(
+        self,
+        col: str,
+        dtype: np.dtype,
+        n_rows: int,
+        missing: int,
+        col_min: Optional[float],
+        col_max: Optional[float],
+        negatives: int,
+        out_of_range: int = 0,
+    ) -> "DatasetProfile":
+        """
+        Fold precomputed statistics of one numeric column chunk into the
+        profile. `out_of_range` is only used if the column has a range rule.
+        Row counts of the dataset itself are left to the caller.
+        """
+        self.column(col).update_statistics(dtype, n_rows, missing, col_min, col_max, negatives)
+        check = self.range_checks.get(col)
+        if check is not None:
+            self._seen_rule_columns.add(col)
+            check.update_statistics(n_rows, col_min, col_max, out_of_range)
+        return self
+
+    def merge(self, other: "DatasetProfile") -> "DatasetProfile":
+        """
+        Combine with the profile of another chunk of the same dataset.
+        """
+        if (other.distinct, other.hll_precision) != (self.distinct, self.hll_precision):
+            raise ValueError("cannot merge profiles with different distinct counters")
+        # Other's rows come after ours
+        self._merge_samples(other, offset=self.n_rows)
+        self.n_rows += other.n_rows
+        for col, profile in other.columns.items():
+            if col in self.columns:
+                self.columns[col].merge(profile)
+            else:
+                self.columns[col] = profile
+        for col, check in other.range_checks.items():
+            if col in self.range_checks:
+                self.range_checks[col].merge(check)
+            else:
+                self.range_checks[col] = check
+        self._seen_rule_columns |= other._seen_rule_columns
+        self._merge_checks(other)
+        return self
+
+    def _merge_checks(self, other: "DatasetProfile") -> None:
+        if other.rule_set != self.rule_set:
+            raise ValueError("cannot combine profiles built with different rules")
+        for check, other_check in zip(self.checks, other.checks):
+            check.merge(other_check)
+        self.coerce_seconds += other.coerce_seconds
+
+    def _merge_samples(self, other: "DatasetProfile", offset: int) -> None:
+        if other.sample_size != self.sample_size:
+            raise ValueError("cannot combine profiles with different sample sizes")
+        for name, sample in other.samples.items():
+            self.samples[name].merge(sample, offset)
+
+    def join(self, other: "DatasetProfile") -> "DatasetProfile":
+        """
+        Combine with the profile of other columns of the same rows, e.g.
+        from a worker that profiled a different column group.
+        """
+        if (other.distinct, other.hll_precision) != (self.distinct, self.hll_precision):
+            raise ValueError("cannot join profiles with different distinct counters")
+        self.n_rows = max(self.n_rows, other.n_rows)
+        self.columns.update(other.columns)
+        for col in other._seen_rule_columns:
+            self.range_checks[col] = other.range_checks[col]
+        self._seen_rule_columns |= other._seen_rule_columns
+        # Each rule only ran where all of its columns were, so counts and
+        # samples add up
+        self._merge_checks(other)
+        self._merge_samples(other, offset=0)
+        return self
+
+    def to_state(self) -> Dict[str, Any]:
+        """
+        The profile's counts, sketches and samples as plain values and
+        numpy arrays, e.g. to save it between incremental runs without
+        pickling. The options it was built with are not included.
+        """
+        return {
+            "n_rows": self.n_rows,
+            "columns": [profile.to_state() for profile in self.columns.values()],
+            "range_checks": {col: check.to_state() for col, check in self.range_checks.items()},
+            "seen_rule_columns": sorted(self._seen_rule_columns),
+            "checks": {check.name: check.to_state() for check in self.checks},
+            "coerce_seconds": self.coerce_seconds,
+            "samples": {name: sample.to_state() for name, sample in self.samples.items()},
+        }
+
+    def load_state(self, state: Dict[str, Any]) -> "DatasetProfile":
+        """
+        Restore what `to_state` saved into this (empty) profile, which must
+        have been built with the same options.
+        """
+        self.n_rows = state["n_rows"]
+        for column_state in state["columns"]:
+            self.column(column_state["name"]).load_state(column_state)
+        for col, check_state in state["range_checks"].items():
+            self.range_checks[col].load_state(check_state)
+        self._seen_rule_columns = set(state["seen_rule_columns"])
+        for check in self.checks:
+            check.load_state(state["checks"][check.name])
+        self.coerce_seconds = state["coerce_seconds"]
+        for name, sample_state in state["samples"].items():
+            self.samples[name].load_state(sample_state)
+        return self
+
+    def reorder(self, columns: List[str]) -> "DatasetProfile":
+        """
+        Put the column profiles in the given order (e.g. the file header).
+        """
+        self.columns = {col: self.columns[col] for col in columns if col in self.columns}
+        return self
+
+    def rule_results(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Per-rule type, columns, rows checked, violations and time spent,
+        in rules-file order. Counts are None for rules whose columns
+        weren't in the data.
+        """
+        results: Dict[str, Dict[str, Any]] = {}
+        checks = {check.name: check for check in self.checks}
+        for spec in self.rule_set.specs if self.rule_set is not None else []:
+            name = spec["name"]
+            if spec["type"] != "range":
+                results[name] = checks[name].result()
+                continue
+            col = spec["column"]
+            check = self.range_checks[col]
+            seen = col in self._seen_rule_columns
+            results[name] = {
+                "type": "range",
+                "columns": [col],
+                "checked": check.n_rows if seen else None,
+                "violations": check.out_of_range if seen else None,
+                "seconds": check.seconds,
+            }
+        return results
+
+    def offending_samples(self) -> Dict[str, Dict[str, Any]]:
+        """
+        The sampled offending rows of each rule, in rule order: row number
+        (0-based, header excluded) and the values of the rule's columns.
+        Empty unless the profile was built with `sample_size`.
+        """
+        results = self.rule_results() if self.rule_set is not None else {}
+        for col, check in self.range_checks.items():
+            name = self.range_names[col]
+            if name not in results:
+                results[name] = {
+                    "type": "range",
+                    "columns": [col],
+                    "violations": check.out_of_range
+                    if col in self._seen_rule_columns
+                    else None,
+                }
+        samples: Dict[str, Dict[str, Any]] = {}
+        for name, result in results.items():
+            if name not in self.samples:
+                continue
+            samples[name] = {
+                "type": result["type"],
+                "columns": result["columns"],
+                "violations": result["violations"],
+                "sample_size": self.sample_size,
+                "rows": [
+                    {"row": row, "values": dict(zip(result["columns"], values))}
+                    for row, values in self.samples[name].items()
+                ],
+            }
+        return samples
+
+    def summary(self, path: str, high_cardinality_threshold: int) -> Dict[str, Any]:
+        """
+        Build the same summary dict that the individual checks produce.
+        """
+        missing_values: Dict[str, int] = {}
+        numeric_ranges: Dict[str, Dict[str, Any]] = {}
+        schema: Dict[str, Dict[str, Any]] = {}
+        constant_columns: List[str] = []
+        high_cardinality: Dict[str, int] = {}
+
+        for col, profile in self.columns.items():
+            unique_count = profile.distinct_count()
+            missing_values[col] = profile.missing
+            schema[col] = {"dtype": str(profile.dtype), "unique_values": unique_count}
+
+            if profile.numeric:
+                if profile.n_rows == 0:
+                    numeric_ranges[col] = {"min": None, "max": None, "negative_count": 0}
+                else:
+                    numeric_ranges[col] = {
+                        "min": _or_nan(profile.min),
+                        "max": _or_nan(profile.max),
+                        "negative_count": profile.negative_count,
+                    }
+            elif unique_count is not None and unique_count > high_cardinality_threshold:
+                high_cardinality[col] = unique_count
+
+            if unique_count is not None and unique_count <= 1:
+                constant_columns.append(col)
+
+        range_issues: Dict[str, Dict[str, Any]] = {}
+        for col, check in self.range_checks.items():
+            if col not in self._seen_rule_columns or check.n_rows == 0:
+                continue
+            range_issues[col] = {
+                "min_allowed": check.min_allowed,
+                "max_allowed": check.max_allowed,
+                "actual_min": _or_nan(check.min),
+                "actual_max": _or_nan(check.max),
+                "out_of_range_count": check.out_of_range,
+            }
+
+        summary = {
+            "path": path,
+            "n_rows": self.n_rows,
+            "n_cols": len(self.columns),
+            "missing_values": missing_values,
+            "numeric_ranges": numeric_ranges,
+            "schema": schema,
+            "constant_columns": constant_columns,
+            "high_cardinality_columns": high_cardinality,
+            "range_issues": range_issues,
+        }
+        if self.rule_set is not None:
+            summary["rule_results"] = self.rule_results()
+            summary["rule_coerce_seconds"] = self.coerce_seconds
+        if self.distinct == "hll":
+            registers = 1 << self.hll_precision
+            summary["distinct_counting"] = {
+                "method": "hyperloglog",
+                "precision": self.hll_precision,
+                "registers": registers,
+                # Standard error of each unique_values estimate
+                "relative_error": 1.04 / registers ** 0.5,
+            }
+        return summary
@@ -0,0 +1,537 @@
+from __future__ import annotations
+
+import ast
+import json
+import re
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+import numpy as np
+import pandas as pd
+
+RULE_TYPES = ("range", "regex", "in_set", "not_null", "unique", "expression")
+
+
+class RuleError(ValueError):
+    """
+    Raised for an invalid rules file or rule definition.
+    """
+
+
+class ColumnView:
+    """
+    One column of one chunk, with the coerced forms rules need computed at
+    most once and shared by every rule on the column.
+    """
+
+    def __init__(self, series: pd.Series, numeric: Optional[np.ndarray] = None) -> None:
+        self.series = series
+        self._numeric = numeric
+        self._text: Optional[np.ndarray] = None
+        self._notnull: Optional[np.ndarray] = None
+        self.coerce_seconds = 0.0
+
+    @property
+    def is_numeric(self) -> bool:
+        return pd.api.types.is_numeric_dtype(self.series.dtype) and not pd.api.types.is_bool_dtype(
+            self.series.dtype
+        )
+
+    @property
+    def notnull(self) -> np.ndarray:
+        if self._notnull is None:
+            self._notnull = self.series.notna().to_numpy()
+        return self._notnull
+
+    @property
+    def numeric(self) -> np.ndarray:
+        """
+        Float values, NaN for missing values and non-numbers.
+        """
+        if self._numeric is None:
+            start = time.perf_counter()
+            self._numeric = pd.to_numeric(self.series, errors="coerce").to_numpy(
+                dtype=np.float64, na_value=np.nan
+            )
+            self.coerce_seconds += time.perf_counter() - start
+        return self._numeric
+
+    @property
+    def text(self) -> np.ndarray:
+        """
+        Values as str (object array), "" for missing values.
+        """
+        if self._text is None:
+            start = time.perf_counter()
+            self._text = self.series.astype(str).to_numpy(dtype=object)
+            self._text[~self.notnull] = ""
+            self.coerce_seconds += time.perf_counter() - start
+        return self._text
+
+    @property
+    def values(self) -> np.ndarray:
+        """
+        Numbers for numeric columns, the raw values otherwise.
+        """
+        return self.numeric if self.is_numeric else self.series.to_numpy(dtype=object)
+
+
+class Check:
+    """
+    Base class for a compiled rule and its mergeable violation counts.
+
+    Subclasses implement `_violations(views)`, returning a boolean mask of
+    the offending rows of one chunk; `update` only calls it when all of the
+    rule's columns are in the chunk.
+    """
+
+    type = ""
+
+    def __init__(self, name: str, columns: List[str]) -> None:
+        self.name = name
+        self.columns = columns
+        self.evaluated = False
+        self.checked = 0
+        self.violations = 0
+        self.seconds = 0.0
+
+    def update(self, views: Dict[str, ColumnView], n_rows: int) -> Optional[np.ndarray]:
+        """
+        Evaluate the rule on one chunk. Returns the violation mask.
+        """
+        if not all(col in views for col in self.columns):
+            return None
+        start = time.perf_counter()
+        mask = self._violations(views)
+        self.evaluated = True
+        self.checked += n_rows
+        self.violations += int(np.count_nonzero(mask))
+        self.seconds += time.perf_counter() - start
+        return mask
+
+    def _violations(self, views: Dict[str, ColumnView]) -> np.ndarray:
+        raise NotImplementedError
+
+    def merge(self, other: "Check") -> None:
+        self.evaluated = self.evaluated or other.evaluated
+        self.checked += other.checked
+        self.violations += other.violations
+        self.seconds += other.seconds
+
+    def to_state(self) -> Dict[str, Any]:
+        """
+        The counts as plain values, for saving alongside a profile.
+        """
+        return {
+            "evaluated": self.evaluated,
+            "checked": self.checked,
+            "violations": self.violations,
+            "seconds": self.seconds,
+        }
+
+    def load_state(self, state: Dict[str, Any]) -> None:
+        self.evaluated = state["evaluated"]
+        self.checked = state["checked"]
+        self.violations = state["violations"]
+        self.seconds = state["seconds"]
+
+    def result(self) -> Dict[str, Any]:
+        return {
+            "type": self.type,
+            "columns": self.columns,
+            "checked": self.checked if self.evaluated else None,
+            "violations": self.violations if self.evaluated else None,
+            "seconds": self.seconds,
+        }
+
+
+class RegexCheck(Check):
+    """
+    Non-null values must fully match a regular expression.
+    """
+
+    type = "regex"
+
+    def __init__(self, name: str, column: str, pattern: str) -> None:
+        super().__init__(name, [column])
+        try:
+            re.compile(pattern)
+        except re.error as e:
+            raise RuleError(f"rule {name!r}: invalid pattern {pattern!r}: {e}") from e
+        self.pattern = pattern
+
+    def _violations(self, views: Dict[str, ColumnView]) -> np.ndarray:
+        view = views[self.columns[0]]
+        matches = pd.Series(view.text).str.fullmatch(self.pattern).to_numpy(dtype=bool)
+        return view.notnull & ~matches
+
+
+class InSetCheck(Check):
+    """
+    Non-null values must be one of a fixed set.
+    """
+
+    type = "in_set"
+
+    def __init__(self, name: str, column: str, values: List[Any]) -> None:
+        super().__init__(name, [column])
+        if not values:
+            raise RuleError(f"rule {name!r}: 'values' must not be empty")
+        self.numeric_values = all(
+            isinstance(v, (int, float)) and not isinstance(v, bool) for v in values
+        )
+        if self.numeric_values:
+            self.allowed = np.asarray(values, dtype=np.float64)
+        else:
+            self.allowed = np.asarray([str(v) for v in values], dtype=object)
+
+    def _violations(self, views: Dict[str, ColumnView]) -> np.ndarray:
+        view = views[self.columns[0]]
+        values = view.numeric if self.numeric_values else view.text
+        return view.notnull & ~np.isin(values, self.allowed)
+
+
+class NotNullCheck(Check):
+    """
+    No value may be missing.
+    """
+
+    type = "not_null"
+
+    def __init__(self, name: str, column: str) -> None:
+        super().__init__(name, [column])
+
+    def _violations(self, views: Dict[str, ColumnView]) -> np.ndarray:
+        return ~views[self.columns[0]].notnull
+
+
+class UniqueCheck(Check):
+    """
+    Non-null values must not repeat. Keeps the distinct values seen so far,
+    so duplicates across chunks are found too; violations are the number of
+    non-null values beyond the first occurrence of each.
+    """
+
+    type = "unique"
+
+    def __init__(self, name: str, column: str) -> None:
+        super().__init__(name, [column])
+        self._values: Optional[np.ndarray] = None
+        self._non_null = 0
+
+    def update(self, views: Dict[str, ColumnView], n_rows: int) -> Optional[np.ndarray]:
+        if self.columns[0] not in views:
+            return None
+        start = time.perf_counter()
+        view = views[self.columns[0]]
+        notnull = view.notnull
+        values = (view.numeric if view.is_numeric else view.text)[notnull]
+        # A row repeats a value if an earlier row of this chunk or any row
+        # of a previous chunk has it
+        mask = np.zeros(len(notnull), dtype=bool)
+        repeated = pd.Series(values).duplicated().to_numpy()
+        if self._values is not None and len(self._values):
+            repeated |= pd.Series(values).isin(self._values).to_numpy()
+        mask[np.flatnonzero(notnull)[repeated]] = True
+        self._add(values, len(values))
+        self.evaluated = True
+        self.checked += n_rows
+        self.seconds += time.perf_counter() - start
+        return mask
+
+    def _add(self, values: np.ndarray, non_null: int) -> None:
+        self._non_null += non_null
+        uniques = pd.unique(values)
+        if self._values is None:
+            self._values = uniques
+        else:
+            self._values = pd.unique(np.concatenate([self._values, uniques]))
+        self.violations = self._non_null - len(self._values)
+
+    def merge(self, other: "Check") -> None:
+        assert isinstance(other, UniqueCheck)
+        self.evaluated = self.evaluated or other.evaluated
+        self.checked += other.checked
+        self.seconds += other.seconds
+        if other._values is not None:
+            self._add(other._values, other._non_null)
+
+    def to_state(self) -> Dict[str, Any]:
+        return {**super().to_state(), "values": self._values, "non_null": self._non_null}
+
+    def load_state(self, state: Dict[str, Any]) -> None:
+        super().load_state(state)
+        self._values = state["values"]
+        self._non_null = state["non_null"]
+
+
+_ALLOWED_NODES = (
+    ast.Expression, ast.BinOp, ast.UnaryOp, ast.Compare, ast.Name, ast.Load,
+    ast.Constant, ast.Call, ast.BoolOp,
+    ast.Add, ast.Sub, ast.Mult, ast.Div, ast.Mod, ast.Pow, ast.FloorDiv,
+    ast.BitAnd, ast.BitOr, ast.USub, ast.UAdd, ast.Invert, ast.Not, ast.And, ast.Or,
+    ast.Eq, ast.NotEq, ast.Lt, ast.LtE, ast.Gt, ast.GtE,
+)
+_FUNCTIONS = {"abs": np.abs, "sqrt": np.sqrt, "log": np.log}
+# Numeric constants are wrapped in a call to this name, which no column can
+# shadow because it isn't a valid identifier
+_FLOAT = "<float64>"
+_ARITHMETIC = (
+    ast.Add, ast.Sub, ast.Mult, ast.Div, ast.Mod, ast.Pow, ast.FloorDiv, ast.USub, ast.UAdd,
+)
+
+
+class _Vectorize(ast.NodeTransformer):
+    """
+    Rewrite `and`/`or`/`not` and chained comparisons into the elementwise
+    `&`, `|` and `~` operators, so expressions read like Python but run on
+    whole columns. Numeric constants become float64, so `2 ** 200000`
+    overflows to inf instead of building a huge Python int.
+    """
+
+    def visit_Constant(self, node: ast.Constant) -> ast.AST:
+        if isinstance(node.value, (int, float)) and not isinstance(node.value, bool):
+            return ast.Call(func=ast.Name(id=_FLOAT, ctx=ast.Load()), args=[node], keywords=[])
+        return node
+
+    def visit_BoolOp(self, node: ast.BoolOp) -> ast.AST:
+        self.generic_visit(node)
+        op = ast.BitAnd() if isinstance(node.op, ast.And) else ast.BitOr()
+        result = node.values[0]
+        for value in node.values[1:]:
+            result = ast.BinOp(left=result, op=op, right=value)
+        return result
+
+    def visit_UnaryOp(self, node: ast.UnaryOp) -> ast.AST:
+        self.generic_visit(node)
+        if isinstance(node.op, ast.Not):
+            return ast.UnaryOp(op=ast.Invert(), operand=node.operand)
+        return node
+
+    def visit_Compare(self, node: ast.Compare) -> ast.AST:
+        self.generic_visit(node)
+        if len(node.ops) == 1:
+            return node
+        parts = []
+        left = node.left
+        for op, right in zip(node.ops, node.comparators):
+            parts.append(ast.Compare(left=left, ops=[op], comparators=[right]))
+            left = right
+        result = parts[0]
+        for part in parts[1:]:
+            result = ast.BinOp(left=result, op=ast.BitAnd(), right=part)
+        return result
+
+
+class ExpressionCheck(Check):
+    """
+    A boolean expression over one or more columns must hold, e.g.
+    `signup_days_ago >= 0 and num_logins <= signup_days_ago * 50`.
+
+    Rows where a referenced column is missing are not checked. The
+    expression is parsed and compiled once; only arithmetic, comparisons,
+    boolean operators, constants, column names and abs/sqrt/log are
+    allowed. Numbers are float64, and columns used in arithmetic or as a
+    function argument must be numeric.
+    """
+
+    type = "expression"
+
+    def __init__(self, name: str, expr: str) -> None:
+        try:
+            tree = ast.parse(expr, mode="eval")
+        except SyntaxError as e:
+            raise RuleError(f"rule {name!r}: invalid expression {expr!r}: {e.msg}") from e
+        functions = set()
+        for node in ast.walk(tree):
+            if not isinstance(node, _ALLOWED_NODES):
+                raise RuleError(
+                    f"rule {name!r}: {type(node).__name__} is not allowed in expressions"
+                )
+            if isinstance(node, ast.Call):
+                if not isinstance(node.func, ast.Name) or node.func.id not in _FUNCTIONS or node.keywords:
+                    raise RuleError(
+                        f"rule {name!r}: only {', '.join(_FUNCTIONS)} can be called"
+                    )
+                functions.add(node.func.id)
+        names = [
+            node.id for node in ast.walk(tree)
+            if isinstance(node, ast.Name) and node.id not in functions
+        ]
+        super().__init__(name, list(dict.fromkeys(names)))
+        if not self.columns:
+            raise RuleError(f"rule {name!r}: expression uses no columns")
+        # Columns that are direct operands of arithmetic or function calls
+        operands: List[ast.AST] = []
+        for node in ast.walk(tree):
+            if isinstance(node, ast.BinOp) and isinstance(node.op, _ARITHMETIC):
+                operands += [node.left, node.right]
+            elif isinstance(node, ast.UnaryOp) and isinstance(node.op, _ARITHMETIC):
+                operands.append(node.operand)
+            elif isinstance(node, ast.Call):
+                operands += node.args
+        self.numeric_columns = list(dict.fromkeys(
+            node.id for node in operands if isinstance(node, ast.Name)
+        ))
+        self.expr = expr
+        self._compile()
+
+    def _compile(self) -> None:
+        tree = ast.fix_missing_locations(_Vectorize().visit(ast.parse(self.expr, mode="eval")))
+        self._code = compile(tree, f"<rule {self.name}>", "eval")
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # Code objects don't pickle; recompiled on load
+        state = self.__dict__.copy()
+        del state["_code"]
+        return state
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.__dict__.update(state)
+        self._compile()
+
+    def _violations(self, views: Dict[str, ColumnView]) -> np.ndarray:
+        for col in self.numeric_columns:
+            if not views[col].is_numeric:
+                # Arithmetic on text would repeat or concatenate strings
+                raise RuleError(
+                    f"rule {self.name!r}: column {col!r} is not numeric and can't be "
+                    "used in arithmetic"
+                )
+        env = {col: views[col].values for col in self.columns}
+        valid = np.logical_and.reduce([views[col].notnull for col in self.columns])
+        try:
+            with np.errstate(all="ignore"):
+                holds = eval(
+                    self._code, {"__builtins__": {}, **_FUNCTIONS, _FLOAT: np.float64}, env
+                )
+            holds = np.broadcast_to(np.asarray(holds, dtype=bool), valid.shape)
+        except (TypeError, ArithmeticError, ValueError) as e:
+            # e.g. a text column compared with a number
+            raise RuleError(f"rule {self.name!r}: cannot evaluate {self.expr!r}: {e}") from e
+        return valid & ~holds
+
+
+def _require(spec: Dict[str, Any], key: str, name: str) -> Any:
+    if key not in spec:
+        raise RuleError(f"rule {name!r}: missing {key!r}")
+    return spec[key]
+
+
+class RuleSet:
+    """
+    Rules loaded from a YAML/JSON file (or built in code).
+
+    Range rules feed the profiler's existing range checks (and the
+    `range_issues` summary); all other rules are compiled once into
+    `Check` objects, and `new_checks` hands each profile a fresh set of
+    them to evaluate chunk by chunk.
+    """
+
+    def __init__(self, specs: List[Dict[str, Any]], high_cardinality_threshold: int = 5) -> None:
+        self.specs = [dict(spec) for spec in specs]
+        self.high_cardinality_threshold = int(high_cardinality_threshold)
+        self.ranges: Dict[str, Tuple[float, float]] = {}
+        self.range_names: Dict[str, str] = {}
+        names = set()
+        for spec in self.specs:
+            rule_type = spec.get("type")
+            if rule_type not in RULE_TYPES:
+                raise RuleError(
+                    f"unknown rule type {rule_type!r}; choose from {', '.join(RULE_TYPES)}"
+                )
+            if "name" not in spec:
+                target = spec.get("column") or spec.get("expr", "")
+                spec["name"] = f"{target}_{rule_type}"
+            if spec["name"] in names:
+                raise RuleError(f"duplicate rule name {spec['name']!r}")
+            names.add(spec["name"])
+            if rule_type == "range":
+                column = _require(spec, "column", spec["name"])
+                if column in self.ranges:
+                    raise RuleError(f"more than one range rule for column {column!r}")
+                self.ranges[column] = (
+                    float(spec.get("min", -np.inf)),
+                    float(spec.get("max", np.inf)),
+                )
+                self.range_names[column] = spec["name"]
+        # Compile once up front so errors surface before any data is read
+        self.columns: Set[str] = set(self.ranges)
+        for check in self.new_checks():
+            self.columns.update(check.columns)
+
+    @classmethod
+    def from_file(cls, path: str | Path) -> "RuleSet":
+        """
+        Load rules from a .json, .yaml or .yml file (YAML needs PyYAML):
+
+            high_cardinality_threshold: 5
+            rules:
+              - {name: age_range, type: range, column: age, min: 0, max: 120}
+              - {type: regex, column: user_id, pattern: "u_\\d{3}"}
+        """
+        path = Path(path)
+        text = path.read_text(encoding="utf-8")
+        if path.suffix.lower() in (".yaml", ".yml"):
+            try:
+                import yaml
+            except ImportError as e:
+                raise ImportError("YAML rules files require PyYAML (pip install pyyaml)") from e
+            try:
+                data = yaml.safe_load(text)
+            except yaml.YAMLError as e:
+                raise RuleError(f"{path}: invalid YAML: {e}") from e
+        else:
+            try:
+                data = json.loads(text)
+            except json.JSONDecodeError as e:
+                raise RuleError(f"{path}: invalid JSON: {e}") from e
+        if not isinstance(data, dict) or not isinstance(data.get("rules", []), list):
+            raise RuleError(f"{path}: expected a mapping with a 'rules' list")
+        return cls(
+            data.get("rules", []),
+            high_cardinality_threshold=data.get("high_cardinality_threshold", 5),
+        )
+
+    def new_checks(self) -> List[Check]:
+        """
+        Fresh, zero-count checks for every non-range rule.
+        """
+        checks: List[Check] = []
+        for spec in self.specs:
+            name = spec["name"]
+            rule_type = spec["type"]
+            if rule_type == "range":
+                continue
+            if rule_type == "expression":
+                checks.append(ExpressionCheck(name, _require(spec, "expr", name)))
+                continue
+            column = _require(spec, "column", name)
+            if rule_type == "regex":
+                checks.append(RegexCheck(name, column, _require(spec, "pattern", name)))
+            elif rule_type == "in_set":
+                checks.append(InSetCheck(name, column, list(_require(spec, "values", name))))
+            elif rule_type == "not_null":
+                checks.append(NotNullCheck(name, column))
+            else:
+                checks.append(UniqueCheck(name, column))
+        return checks
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, RuleSet):
+            return NotImplemented
+        return (self.specs, self.high_cardinality_threshold) == (
+            other.specs,
+            other.high_cardinality_threshold,
+        )
+
+
+def default_rule_set() -> RuleSet:
+    """
+    The rules used when no rules file is given.
+    """
+    return RuleSet(
+        [{"name": "age_range", "type": "range", "column": "age", "min": 0, "max": 120}],
+        high_cardinality_threshold=5,
+    )
@@ -0,0 +1,576 @@
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+import multiprocessing
+import os
+import signal
+import tempfile
+import threading
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FutureTimeout
+from concurrent.futures.process import BrokenProcessPool
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+from urllib.parse import parse_qs, urlparse
+
+from .log_setup import configure_logging
+
+logger = logging.getLogger("dq_logger")
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+DEFAULT_JOB_TIMEOUT = 300.0
+DEFAULT_MAX_UPLOAD_BYTES = 1 << 30
+# Timings of the last RECENT_JOBS jobs are kept for /status
+RECENT_JOBS = 50
+# Options a job may pass through to run_quality_checks. Parallelism comes
+# from the server's pool, so `workers` isn't one of them.
+JOB_OPTIONS = ("chunksize", "distinct", "hll_precision", "columns", "sample_size")
+# Bounds of the integer job options, as the CLI's argparse types enforce
+INT_OPTIONS = {"chunksize": (1, None), "hll_precision": (4, 18), "sample_size": (0, None)}
+DISTINCT_METHODS = ("exact", "hll", "none")
+
+
+class QueueFull(Exception):
+    """
+    Raised when the job queue already has `max_queue` jobs pending.
+    """
+
+
+class JobTimeout(Exception):
+    """
+    Raised when a job runs longer than the queue's `job_timeout`.
+    """
+
+
+class PayloadTooLarge(Exception):
+    """
+    Raised when a request body is larger than the server accepts.
+    """
+
+
+def _init_worker() -> None:
+    # Pay for pandas and the profiler once per worker, not once per job
+    from . import data_quality  # noqa: F401
+
+    # The server logs one event per job; workers would only duplicate them
+    logging.getLogger("dq_logger").disabled = True
+
+
+def _run_job(
+    path: str, options: Dict[str, Any], rules: Optional[Dict[str, Any]]
+) -> Dict[str, Any]:
+    """
+    Worker: check one file. Returns the summary, the offending row samples
+    (if `sample_size` is set), the wall-clock start time and the run time.
+    """
+    from .data_quality import run_quality_checks
+    from .rules import RuleSet
+
+    started = time.time()
+    start = time.perf_counter()
+    rule_set = None
+    if rules is not None:
+        rule_set = RuleSet(
+            rules.get("rules", []),
+            high_cardinality_threshold=rules.get("high_cardinality_threshold", 5),
+        )
+    samples = None
+    with tempfile.TemporaryDirectory() as tmp:
+        samples_path = Path(tmp) / "samples.json"
+        summary = run_quality_checks(
+            path, rule_set=rule_set, samples_path=samples_path, **options
+        )
+        if samples_path.exists():
+            samples = json.loads(samples_path.read_text(encoding="utf-8"))
+    return {
+        "summary": summary,
+        "offending_samples": samples,
+        "started": started,
+        "run_seconds": time.perf_counter() - start,
+    }
+
+
+class JobQueue:
+    """
+    Bounded pool of worker processes that run quality checks.
+
+    Workers import pandas and the profiler once at startup and then serve
+    jobs for the life of the server. At most `max_queue` jobs may be
+    pending (running or waiting) at once; further submissions fail fast
+    with `QueueFull`. Counters and recent per-job timings feed `/status`.
+
+    If a worker dies (OOM kill, segfault, SIGKILL) the pool is broken for
+    good, so it is replaced by a fresh, warmed-up one: the jobs that were
+    on the broken pool fail, later jobs run normally. A job still waiting
+    for its result after `job_timeout` seconds (0 waits forever) fails
+    with `JobTimeout`; if it was already handed to a worker, the pool's
+    workers are killed and replaced the same way, since a
+    ProcessPoolExecutor can't replace a single worker.
+    """
+
+    def __init__(
+        self, workers: int = 2, max_queue: int = 16, job_timeout: float = DEFAULT_JOB_TIMEOUT
+    ) -> None:
+        self.workers = workers
+        self.max_queue = max_queue
+        self.job_timeout = job_timeout
+        self._executor: Optional[ProcessPoolExecutor] = None
+        # Held while the pool is replaced, so only one thread rebuilds it
+        self._pool_lock = threading.Lock()
+        self._closed = False
+        self._restarts = 0
+        # Request handler threads share these
+        self._lock = threading.Lock()
+        self._next_id = 0
+        self._pending = 0
+        self._completed = 0
+        self._failed = 0
+        self._timed_out = 0
+        self._rejected = 0
+        self._recent: deque = deque(maxlen=RECENT_JOBS)
+        self._started = time.time()
+
+    def _new_pool(self) -> ProcessPoolExecutor:
+        executor = ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+        )
+        # Submitting one no-op per worker makes all of them start (and
+        # import) now rather than on the first jobs
+        warm = [executor.submit(time.sleep, 0.1) for _ in range(self.workers)]
+        try:
+            for future in warm:
+                future.result()
+        except BaseException:
+            executor.shutdown(wait=False, cancel_futures=True)
+            raise
+        return executor
+
+    def start(self) -> None:
+        """
+        Create the worker pool and warm up every worker.
+        """
+        with self._pool_lock:
+            self._executor = self._new_pool()
+
+    def shutdown(self) -> None:
+        """
+        Shut the pool down, cancelling jobs that have not started.
+        """
+        with self._pool_lock:
+            self._closed = True
+            if self._executor is not None:
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = None
+
+    def pool_healthy(self) -> bool:
+        """
+        Whether the pool exists and none of its workers has died.
+        """
+        executor = self._executor
+        # ProcessPoolExecutor has no public flag; `_broken` is set as soon
+        # as a worker exits unexpectedly, even between jobs
+        return executor is not None and not getattr(executor, "_broken", False)
+
+    def _pool(self, broken: Optional[ProcessPoolExecutor] = None) -> ProcessPoolExecutor:
+        """
+        The current pool, replaced first if it is broken (or is `broken`,
+        a pool a job just failed on).
+        """
+        with self._pool_lock:
+            if self._closed:
+                raise RuntimeError("job queue is shut down")
+            executor = self._executor
+            if executor is not None and executor is not broken and self.pool_healthy():
+                return executor
+            if executor is not None:
+                executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = None
+            self._executor = self._new_pool()
+            self._restarts += 1
+            logger.warning(
+                "Worker pool replaced",
+                extra={"event": "pool_restart", "restarts": self._restarts},
+            )
+            return self._executor
+
+    def _kill_pool(self, executor: ProcessPoolExecutor) -> None:
+        """
+        Kill the workers of `executor` and replace it with a fresh pool.
+        """
+        # No public API lists the workers; `_processes` maps pid -> Process
+        for process in list(getattr(executor, "_processes", {}).values()):
+            process.kill()
+        try:
+            self._pool(broken=executor)
+        except Exception:
+            logger.exception(
+                "Could not replace the worker pool", extra={"event": "pool_restart_failed"}
+            )
+
+    def run(
+        self, path: str, options: Dict[str, Any], rules: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        """
+        Check one file on the pool and wait for the result.
+        Returns the job id, path, timings, summary and (with
+        `sample_size`) offending row samples.
+        Raises:
+            QueueFull: If `max_queue` jobs are already pending.
+            JobTimeout: If the job takes longer than `job_timeout`.
+        """
+        with self._lock:
+            if self._pending >= self.max_queue:
+                self._rejected += 1
+                raise QueueFull(f"job queue is full ({self._pending} pending jobs)")
+            self._pending += 1
+            self._next_id += 1
+            job_id = self._next_id
+        submitted = time.time()
+        try:
+            executor = self._pool()
+            future = executor.submit(_run_job, path, options, rules)
+            try:
+                result = future.result(timeout=self.job_timeout or None)
+            except FutureTimeout:
+                if not future.cancel():
+                    # Running (or handed to a worker): killing the workers
+                    # is the only way to stop it
+                    self._kill_pool(executor)
+                with self._lock:
+                    self._timed_out += 1
+                logger.warning(
+                    "Quality job timed out",
+                    extra={"event": "job_timeout", "job_id": job_id, "path": path},
+                )
+                raise JobTimeout(f"job {job_id} exceeded the {self.job_timeout:g}s timeout")
+            except BrokenProcessPool:
+                # A worker died under this or another job; rebuild now so
+                # the next job doesn't find the pool broken
+                try:
+                    self._pool(broken=executor)
+                except Exception:
+                    logger.exception(
+                        "Could not replace the worker pool", extra={"event": "pool_restart_failed"}
+                    )
+                raise
+        except Exception:
+            with self._lock:
+                self._pending -= 1
+                self._failed += 1
+                self._recent.append(
+                    {
+                        "job_id": job_id,
+                        "path": path,
+                        "failed": True,
+                        "total_seconds": time.time() - submitted,
+                    }
+                )
+            raise
+
+        timings = {
+            "queued_seconds": max(0.0, result["started"] - submitted),
+            "run_seconds": result["run_seconds"],
+            "total_seconds": time.time() - submitted,
+        }
+        with self._lock:
+            self._pending -= 1
+            self._completed += 1
+            self._recent.append({"job_id": job_id, "path": path, "failed": False, **timings})
+        logger.info(
+            "Quality job done",
+            extra={"event": "job_done", "job_id": job_id, "path": path, **timings},
+        )
+        response = {"job_id": job_id, "path": path, "timings": timings, "summary": result["summary"]}
+        if result["offending_samples"] is not None:
+            response["offending_samples"] = result["offending_samples"]
+        return response
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Report pool configuration, current load and recent job timings.
+        """
+        with self._lock:
+            return {
+                "workers": self.workers,
+                "max_queue": self.max_queue,
+                "pending": self._pending,
+                "queue_depth": max(0, self._pending - self.workers),
+                "completed": self._completed,
+                "failed": self._failed,
+                "timed_out": self._timed_out,
+                "rejected": self._rejected,
+                "job_timeout_seconds": self.job_timeout,
+                "pool_healthy": self.pool_healthy(),
+                "pool_restarts": self._restarts,
+                "uptime_seconds": time.time() - self._started,
+                "recent_jobs": list(self._recent),
+            }
+
+
+def parse_job(body: Dict[str, Any]) -> Tuple[Dict[str, Any], Optional[Dict[str, Any]]]:
+    """
+    Validate the options and inline rules of a job request.
+    """
+    unknown = set(body) - set(JOB_OPTIONS) - {"path", "rules"}
+    if unknown:
+        raise ValueError(f"unknown job options: {', '.join(sorted(unknown))}")
+    options = {key: body[key] for key in JOB_OPTIONS if body.get(key) is not None}
+    if "distinct" in options and options["distinct"] not in DISTINCT_METHODS:
+        raise ValueError(
+            f"'distinct' must be one of {', '.join(DISTINCT_METHODS)}, got {options['distinct']!r}"
+        )
+    if "columns" in options:
+        columns = options["columns"]
+        if not isinstance(columns, list) or not all(isinstance(col, str) for col in columns):
+            raise ValueError(f"'columns' must be a list of column names, got {columns!r}")
+    for key, (low, high) in INT_OPTIONS.items():
+        if key not in options:
+            continue
+        value = options[key]
+        if not isinstance(value, int) or isinstance(value, bool):
+            raise ValueError(f"{key!r} must be an integer, got {value!r}")
+        if value < low or (high is not None and value > high):
+            bounds = f"between {low} and {high}" if high is not None else f"at least {low}"
+            raise ValueError(f"{key!r} must be {bounds}, got {value}")
+    rules = body.get("rules")
+    if rules is not None and not isinstance(rules, dict):
+        raise ValueError("'rules' must be a rules-file mapping with a 'rules' list")
+    return options, rules
+
+
+class QualityRequestHandler(BaseHTTPRequestHandler):
+    """
+    HTTP API of the quality server:
+
+    - `POST /check` with a JSON body `{"path": ..., <options>}` checks a
+      file the server can read.
+    - `POST /check?filename=data.csv` with the file itself as the body
+      checks an upload (the suffix picks the format); job options go in
+      the query string, e.g. `&chunksize=100000`. Bodies over the
+      server's `max_upload_bytes` get `413`, jobs over the queue's
+      `job_timeout` get `504`.
+    - `GET /status` reports queue depth, counters, pool health and recent
+      job timings.
+    - `GET /health` returns `{"status": "ok"}`, or `503` with
+      `{"status": "degraded"}` while the worker pool is broken.
+    """
+
+    server: "QualityServer"
+
+    def do_GET(self) -> None:
+        route = urlparse(self.path).path
+        if route == "/health":
+            if self.server.jobs.pool_healthy():
+                self._send_json(200, {"status": "ok"})
+            else:
+                self._send_json(503, {"status": "degraded", "error": "worker pool is broken"})
+        elif route == "/status":
+            self._send_json(200, self.server.jobs.stats())
+        else:
+            self._send_json(404, {"error": f"unknown route {route}"})
+
+    def do_POST(self) -> None:
+        url = urlparse(self.path)
+        if url.path != "/check":
+            self._send_json(404, {"error": f"unknown route {url.path}"})
+            return
+        upload: Optional[str] = None
+        try:
+            length = self._content_length()
+            query = {key: values[-1] for key, values in parse_qs(url.query).items()}
+            filename = query.pop("filename", None)
+            if filename is not None:
+                upload = self._save_upload(filename, length)
+                body: Dict[str, Any] = {key: _query_value(key, v) for key, v in query.items()}
+                path = upload
+            else:
+                body = json.loads(self.rfile.read(length) or b"{}")
+                if not isinstance(body, dict) or "path" not in body:
+                    raise ValueError("expected a JSON object with a 'path'")
+                path = str(body["path"])
+                if not os.path.isfile(path):
+                    self._send_json(404, {"error": f"file not found: {path}"})
+                    return
+            options, rules = parse_job(body)
+            result = self.server.jobs.run(path, options, rules)
+            if upload is not None:
+                # Report the upload's name rather than the temp file
+                result["path"] = result["summary"]["path"] = filename
+            self._send_json(200, result)
+        except QueueFull as e:
+            logger.warning("Quality job rejected", extra={"event": "job_rejected", "error": str(e)})
+            self._send_json(503, {"error": str(e)}, headers={"Retry-After": "1"})
+        except PayloadTooLarge as e:
+            # The body is left unread, so the connection can't be reused
+            self.close_connection = True
+            self._send_json(413, {"error": str(e)}, headers={"Connection": "close"})
+        except JobTimeout as e:
+            self._send_json(504, {"error": str(e)})
+        except ValueError as e:
+            self._send_json(400, {"error": str(e)})
+        except Exception as e:
+            logger.exception("Quality job failed", extra={"event": "job_failed"})
+            self._send_json(500, {"error": f"{type(e).__name__}: {e}"})
+        finally:
+            if upload is not None:
+                os.unlink(upload)
+
+    def _content_length(self) -> int:
+        """
+        The request's Content-Length, checked against `max_upload_bytes`.
+        """
+        try:
+            length = int(self.headers.get("Content-Length", 0))
+        except ValueError:
+            raise ValueError("invalid Content-Length")
+        if length < 0:
+            raise ValueError(f"invalid Content-Length: {length}")
+        limit = self.server.max_upload_bytes
+        if limit and length > limit:
+            raise PayloadTooLarge(f"request body of {length} bytes exceeds the {limit}-byte limit")
+        return length
+
+    def _save_upload(self, filename: str, length: int) -> str:
+        """
+        Stream the request body to a temp file with the upload's suffix.
+        """
+        fd, tmp = tempfile.mkstemp(suffix=Path(filename).suffix or ".csv")
+        with os.fdopen(fd, "wb") as f:
+            remaining = length
+            while remaining > 0:
+                block = self.rfile.read(min(remaining, 1 << 20))
+                if not block:
+                    break
+                f.write(block)
+                remaining -= len(block)
+        return tmp
+
+    def _send_json(self, status: int, payload: Any, headers: Optional[Dict[str, str]] = None) -> None:
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args: Any) -> None:
+        # Requests are logged as job events instead of stderr access lines
+        pass
+
+
+def _query_value(key: str, value: str) -> Any:
+    """
+    Convert a job option given in a query string to its JSON type.
+    """
+    if key in ("chunksize", "hll_precision", "sample_size"):
+        return int(value)
+    if key == "columns":
+        return [col.strip() for col in value.split(",") if col.strip()]
+    if key == "rules":
+        return json.loads(value)
+    return value
+
+
+class QualityServer(ThreadingHTTPServer):
+    """
+    Threading HTTP server whose request threads hand jobs to a `JobQueue`.
+    """
+
+    daemon_threads = True
+
+    def __init__(
+        self,
+        address: Tuple[str, int],
+        jobs: JobQueue,
+        max_upload_bytes: int = DEFAULT_MAX_UPLOAD_BYTES,
+    ) -> None:
+        super().__init__(address, QualityRequestHandler)
+        self.jobs = jobs
+        self.max_upload_bytes = max_upload_bytes
+
+
+def parse_args() -> argparse.Namespace:
+    """
+    Define and parse command-line arguments.
+    """
+    parser = argparse.ArgumentParser(
+        description="Long-running dataset quality checker service"
+    )
+    parser.add_argument("--host", default=DEFAULT_HOST, help="Address to bind (default: localhost only)")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--workers", type=int, default=2, help="Worker processes running checks")
+    parser.add_argument(
+        "--max-queue",
+        type=int,
+        default=16,
+        help="Jobs that may be pending at once; more are rejected with 503",
+    )
+    parser.add_argument(
+        "--job-timeout",
+        type=float,
+        default=DEFAULT_JOB_TIMEOUT,
+        help=(
+            "Seconds a job may take before it fails with 504 and the "
+            "workers are replaced (0: no limit)"
+        ),
+    )
+    parser.add_argument(
+        "--max-upload-bytes",
+        type=int,
+        default=DEFAULT_MAX_UPLOAD_BYTES,
+        help="Largest request body accepted; larger ones get 413 (0: no limit)",
+    )
+    return parser.parse_args()
+
+
+def main() -> None:
+    """
+    Entry point: serve until interrupted or terminated.
+    """
+    args = parse_args()
+    configure_logging()
+
+    def terminate(signum: int, frame: Any) -> None:
+        # Leave through the same cleanup as Ctrl-C, so the spawn workers
+        # don't outlive the server
+        raise SystemExit(0)
+
+    signal.signal(signal.SIGTERM, terminate)
+    jobs = JobQueue(workers=args.workers, max_queue=args.max_queue, job_timeout=args.job_timeout)
+    server: Optional[QualityServer] = None
+    try:
+        jobs.start()
+        server = QualityServer((args.host, args.port), jobs, args.max_upload_bytes)
+        logger.info(
+            "Quality server started",
+            extra={
+                "event": "server_start",
+                "host": args.host,
+                "port": server.server_address[1],
+                "workers": args.workers,
+                "max_queue": args.max_queue,
+                "job_timeout": args.job_timeout,
+                "max_upload_bytes": args.max_upload_bytes,
+            },
+        )
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        if server is not None:
+            server.server_close()
+        jobs.shutdown()
+        logger.info("Quality server stopped", extra={"event": "server_stop"})
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,182 @@
+from __future__ import annotations
+
+import math
+from typing import Any, Dict, List, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+MIN_PRECISION = 4
+MAX_PRECISION = 18
+
+_HASH_BITS = 64
+
+
+def _bit_length(x: np.ndarray) -> np.ndarray:
+    """
+    Exact bit length of each uint64 value (0 for 0).
+
+    Binary search over shifts instead of log2/frexp, which round large
+    values through float64 and can be off by one.
+    """
+    x = x.copy()
+    n = np.zeros(x.shape, dtype=np.uint8)
+    for shift in (32, 16, 8, 4, 2, 1):
+        high = x >= np.uint64(1 << shift)
+        n[high] += shift
+        x[high] >>= np.uint64(shift)
+    n += (x > 0).astype(np.uint8)
+    return n
+
+
+class HyperLogLog:
+    """
+    HyperLogLog distinct-value sketch.
+
+    Uses 2**precision one-byte registers regardless of the column's
+    cardinality, and two sketches with the same precision can be merged
+    (register-wise max), so partial sketches from chunks or worker
+    processes combine into the sketch of the whole column. The typical
+    relative error of `count` is 1.04 / sqrt(2**precision).
+
+    Values are hashed with `pd.util.hash_pandas_object`. Numeric values are
+    hashed as float64, so 1 and 1.0 count once, as they do in `nunique`.
+    """
+
+    def __init__(self, precision: int = 14) -> None:
+        if not MIN_PRECISION <= precision <= MAX_PRECISION:
+            raise ValueError(
+                f"precision must be between {MIN_PRECISION} and {MAX_PRECISION}, got {precision}"
+            )
+        self.precision = precision
+        self.registers = np.zeros(1 << precision, dtype=np.uint8)
+
+    @property
+    def relative_error(self) -> float:
+        return 1.04 / math.sqrt(len(self.registers))
+
+    def add(self, values: Any) -> None:
+        """
+        Add an array or Series of non-null values.
+        """
+        series = values if isinstance(values, pd.Series) else pd.Series(values)
+        if len(series) == 0:
+            return
+        if pd.api.types.is_numeric_dtype(series.dtype) and not pd.api.types.is_bool_dtype(series.dtype):
+            # + 0.0 folds -0.0 into 0.0 so both hash the same
+            series = pd.Series(series.to_numpy(dtype=np.float64) + 0.0)
+        hashes = pd.util.hash_pandas_object(series, index=False).to_numpy()
+
+        p = self.precision
+        index = (hashes >> np.uint64(_HASH_BITS - p)).astype(np.intp)
+        rest = hashes & np.uint64((1 << (_HASH_BITS - p)) - 1)
+        # Position of the first 1-bit in the remaining 64 - p bits
+        rank = (_HASH_BITS - p + 1) - _bit_length(rest).astype(np.int16)
+        np.maximum.at(self.registers, index, rank.astype(np.uint8))
+
+    def merge(self, other: "HyperLogLog") -> None:
+        if other.precision != self.precision:
+            raise ValueError(
+                f"cannot merge sketches with precision {self.precision} and {other.precision}"
+            )
+        np.maximum(self.registers, other.registers, out=self.registers)
+
+    def to_state(self) -> Dict[str, Any]:
+        return {"registers": self.registers}
+
+    def load_state(self, state: Dict[str, Any]) -> None:
+        self.registers[:] = state["registers"]
+
+    def copy(self) -> "HyperLogLog":
+        sketch = HyperLogLog(self.precision)
+        sketch.registers[:] = self.registers
+        return sketch
+
+    def count(self) -> int:
+        """
+        Estimated number of distinct values added.
+        """
+        m = len(self.registers)
+        zeros = int(np.count_nonzero(self.registers == 0))
+        if zeros == m:
+            return 0
+        alpha = 0.7213 / (1.0 + 1.079 / m)
+        estimate = alpha * m * m / float(np.sum(np.ldexp(1.0, -self.registers.astype(np.int32))))
+        if estimate <= 2.5 * m and zeros:
+            # Small-range correction (linear counting)
+            estimate = m * math.log(m / zeros)
+        return int(round(estimate))
+
+
+class Reservoir:
+    """
+    Uniform random sample of at most `size` rows, e.g. offending rows of a
+    rule, with the values of some of their columns.
+
+    Every added row gets a random key and the rows with the `size`
+    smallest keys are kept (bottom-k sampling, the mergeable form of
+    reservoir sampling). Memory stays bounded however many rows are added,
+    and merging the samples of two chunks keeps the smallest keys of both,
+    which is a uniform sample of their union.
+    """
+
+    def __init__(self, size: int) -> None:
+        if size < 0:
+            raise ValueError(f"sample size must be non-negative, got {size}")
+        self.size = size
+        self.keys = np.empty(0, dtype=np.float64)
+        self.rows = np.empty(0, dtype=np.int64)
+        self.values: List[Tuple[Any, ...]] = []
+        self._rng = np.random.default_rng()
+
+    def add(self, mask: np.ndarray, columns: Sequence[pd.Series]) -> None:
+        """
+        Offer the rows of one chunk where `mask` is set. `columns` are the
+        chunk's columns whose values are kept; row numbers are positions
+        within the chunk (see `merge` for combining chunks).
+        """
+        rows = np.flatnonzero(mask)
+        if len(rows) == 0 or self.size == 0:
+            return
+        keys = self._rng.random(len(rows))
+        if len(self.keys) == self.size:
+            # Full: only rows that beat the current largest key can get in
+            beats = keys < self.keys.max()
+            rows, keys = rows[beats], keys[beats]
+        if len(rows) > self.size:
+            keep = np.argpartition(keys, self.size)[: self.size]
+            rows, keys = rows[keep], keys[keep]
+        # Values are only materialized for the (at most `size`) candidates
+        values = list(zip(*(column.iloc[rows].tolist() for column in columns)))
+        self._combine(keys, rows.astype(np.int64), values)
+
+    def _combine(self, keys: np.ndarray, rows: np.ndarray, values: List[Tuple[Any, ...]]) -> None:
+        keys = np.concatenate([self.keys, keys])
+        rows = np.concatenate([self.rows, rows])
+        values = self.values + values
+        if len(keys) > self.size:
+            keep = np.argpartition(keys, self.size)[: self.size]
+            keys, rows, values = keys[keep], rows[keep], [values[i] for i in keep]
+        self.keys, self.rows, self.values = keys, rows, values
+
+    def merge(self, other: "Reservoir", offset: int = 0) -> None:
+        """
+        Fold in another sample, adding `offset` to its row numbers (the
+        number of rows before the other sample's chunk).
+        """
+        self._combine(other.keys, other.rows + offset, other.values)
+
+    def to_state(self) -> Dict[str, Any]:
+        return {"keys": self.keys, "rows": self.rows, "values": self.values}
+
+    def load_state(self, state: Dict[str, Any]) -> None:
+        self.keys = np.asarray(state["keys"], dtype=np.float64)
+        self.rows = np.asarray(state["rows"], dtype=np.int64)
+        self.values = [tuple(values) for values in state["values"]]
+
+    def items(self) -> List[Tuple[int, Tuple[Any, ...]]]:
+        """
+        The sampled (row, values) pairs in row order.
+        """
+        order = np.argsort(self.rows, kind="stable")
+        return [(int(self.rows[i]), self.values[i]) for i in order]